@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from moa.loadgen import COMPONENTS, format_load_curve, load_curve, load_trace
+from moa.models import LatencyModel, MockModel
+
+
+def _float_list(value: str) -> List[float]:
+    try:
+        return [float(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated numbers, got {value!r}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Open-loop MoA latency-vs-load sweep")
+    parser.add_argument(
+        "--prompts",
+        type=Path,
+        default=Path("examples/prompts.jsonl"),
+        help="Prompts replayed round-robin by the arrivals.",
+    )
+    parser.add_argument(
+        "--rates",
+        type=_float_list,
+        default=[5.0, 10.0, 20.0, 40.0, 80.0],
+        help="Comma-separated offered loads in prompts per second.",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=200,
+        help="Arrivals per offered rate.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        help="Replay arrival timestamps from this file (rescaled to each rate) instead of Poisson.",
+    )
+    parser.add_argument("--samples", type=int, default=5, help="Self-MoA samples per prompt.")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=16,
+        help="Proposer calls in flight across all prompts.",
+    )
+    parser.add_argument(
+        "--median-latency-ms",
+        type=float,
+        default=50.0,
+        help="Median simulated proposer latency.",
+    )
+    parser.add_argument(
+        "--straggler-rate",
+        type=float,
+        default=0.01,
+        help="Fraction of calls that stall for --straggler-ms.",
+    )
+    parser.add_argument("--straggler-ms", type=float, default=500.0)
+    parser.add_argument(
+        "--slo-ms",
+        type=float,
+        default=None,
+        help="End-to-end latency objective; reports attainment and flags saturation.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for Poisson arrivals.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/load_results.json"),
+        help="Where to write per-rate latency quantiles and per-prompt timings.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    with args.prompts.open("r", encoding="utf-8") as handle:
+        prompts = [json.loads(line) for line in handle if line.strip()]
+    model = MockModel(
+        "Load-Strong",
+        strength=0.8,
+        latency=LatencyModel(
+            median_s=args.median_latency_ms / 1000,
+            straggler_rate=args.straggler_rate,
+            straggler_s=args.straggler_ms / 1000,
+        ),
+    )
+    slo_s = args.slo_ms / 1000 if args.slo_ms is not None else None
+    reports = load_curve(
+        prompts,
+        [model],
+        args.rates,
+        count=args.count,
+        trace=load_trace(args.trace) if args.trace is not None else None,
+        seed=args.seed,
+        samples=args.samples,
+        max_concurrency=args.max_concurrency,
+    )
+    print("\n".join(format_load_curve(reports, slo_s=slo_s)))
+
+    payload = {
+        "slo_ms": args.slo_ms,
+        "curve": [
+            {
+                "offered_rate": report.offered_rate,
+                "arrival_rate": report.arrival_rate,
+                "achieved_rate": report.achieved_rate,
+                "saturated": report.saturated(slo_s=slo_s),
+                "quantiles_ms": {
+                    component: {
+                        f"p{int(q * 100)}": report.latency_quantile(q, component) * 1000
+                        for q in (0.5, 0.9, 0.99)
+                    }
+                    for component in COMPONENTS
+                },
+                "timings": [asdict(timing) for timing in report.timings],
+            }
+            for report in reports
+        ],
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"\nWrote load curve to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from moa.aggregation import AggregationSpec, aggregate_flat, aggregate_many, aggregate_sequential
+from moa.models import Candidate, MockModel
+from moa.runner import RunConfig, build_report, evaluate_prompts
+
+
+@dataclass
+class BenchCase:
+    group: str
+    params: Dict[str, int]
+    setup: Callable[[], Callable[[], object]]
+    items_per_call: int = 1
+
+    @property
+    def case_id(self) -> str:
+        args = ",".join(f"{key}={value}" for key, value in sorted(self.params.items()))
+        return f"{self.group}[{args}]"
+
+
+@dataclass
+class BenchModels:
+    strong: MockModel
+    medium: MockModel
+    weak: MockModel = field(default_factory=lambda: MockModel("Bench-Weak", strength=0.3))
+
+    def mixed(self) -> List[MockModel]:
+        return [self.strong, self.medium, self.weak]
+
+
+def synthetic_prompts(count: int, *, cardinality: int) -> List[Dict[str, str]]:
+    return [
+        {
+            "id": f"bench-{i}",
+            "question": f"What is {i} plus {cardinality}?",
+            "answer": str(i + cardinality),
+            "distractors": [str(i + cardinality + k) for k in range(1, cardinality)],
+        }
+        for i in range(count)
+    ]
+
+
+def synthetic_candidates(samples: int, *, cardinality: int) -> List[Candidate]:
+    model = MockModel("Bench-Strong", strength=0.6)
+    (prompt,) = synthetic_prompts(1, cardinality=cardinality)
+    return [model.generate(prompt=prompt, sample_index=i) for i in range(samples)]
+
+
+def build_cases(quick: bool) -> List[BenchCase]:
+    sample_grid = [8, 64] if quick else [8, 64, 512, 4096]
+    prompt_grid = [10] if quick else [10, 100, 1000]
+    window_grid = [2, 8] if quick else [2, 8, 32]
+    cardinality_grid = [2, 8] if quick else [2, 8, 64]
+    cases: List[BenchCase] = []
+
+    def generate_case(cardinality: int) -> BenchCase:
+        def setup() -> Callable[[], object]:
+            model = MockModel("Bench-Strong", strength=0.6)
+            (prompt,) = synthetic_prompts(1, cardinality=cardinality)
+            counter = iter(range(10**12))
+            return lambda: model.generate(prompt=prompt, sample_index=next(counter))
+
+        return BenchCase("generate", {"cardinality": cardinality}, setup)
+
+    def generate_counter_case(cardinality: int) -> BenchCase:
+        def setup() -> Callable[[], object]:
+            model = MockModel("Bench-Strong", strength=0.6, rng_mode="counter")
+            (prompt,) = synthetic_prompts(1, cardinality=cardinality)
+            counter = iter(range(10**12))
+            return lambda: model.generate(prompt=prompt, sample_index=next(counter))
+
+        return BenchCase("generate_counter", {"cardinality": cardinality}, setup)
+
+    def flat_case(samples: int, cardinality: int) -> BenchCase:
+        def setup() -> Callable[[], object]:
+            cands = synthetic_candidates(samples, cardinality=cardinality)
+            return lambda: aggregate_flat(cands, strategy_name="bench")
+
+        return BenchCase(
+            "aggregate_flat", {"samples": samples, "cardinality": cardinality}, setup, samples
+        )
+
+    def sequential_case(samples: int, window: int) -> BenchCase:
+        def setup() -> Callable[[], object]:
+            cands = synthetic_candidates(samples, cardinality=8)
+            return lambda: aggregate_sequential(cands, window_size=window, strategy_name="bench")
+
+        return BenchCase(
+            "aggregate_sequential", {"samples": samples, "window": window}, setup, samples
+        )
+
+    def many_case(samples: int) -> BenchCase:
+        specs = [AggregationSpec("flat"), AggregationSpec("weighted", weighted=True)]
+        specs.extend(AggregationSpec(f"seq{w}", window_size=w) for w in window_grid)
+
+        def setup() -> Callable[[], object]:
+            cands = synthetic_candidates(samples, cardinality=8)
+            return lambda: aggregate_many(cands, specs)
+
+        return BenchCase("aggregate_many", {"samples": samples, "specs": len(specs)}, setup, samples)
+
+    def pipeline_case(prompts: int, samples: int) -> BenchCase:
+        def setup() -> Callable[[], object]:
+            data = synthetic_prompts(prompts, cardinality=3)
+            models = BenchModels(
+                strong=MockModel("Bench-Strong", strength=0.8),
+                medium=MockModel("Bench-Medium", strength=0.55),
+            )
+            config = RunConfig(self_samples=samples, sequential_window=2)
+            return lambda: build_report(evaluate_prompts(data, models, config))
+
+        return BenchCase("pipeline", {"prompts": prompts, "samples": samples}, setup, prompts)
+
+    cases.extend(generate_case(cardinality) for cardinality in cardinality_grid)
+    cases.extend(generate_counter_case(cardinality) for cardinality in cardinality_grid)
+    cases.extend(
+        flat_case(samples, cardinality) for samples in sample_grid for cardinality in cardinality_grid
+    )
+    cases.extend(sequential_case(samples, window) for samples in sample_grid for window in window_grid)
+    cases.extend(many_case(samples) for samples in sample_grid)
+    cases.extend(
+        pipeline_case(prompts, samples) for prompts in prompt_grid for samples in sample_grid[:2]
+    )
+    return cases
+
+
+def measure(case: BenchCase, *, min_time: float, max_calls: int) -> Dict[str, float]:
+    fn = case.setup()
+    fn()  # warm-up
+    latencies: List[float] = []
+    started = time.perf_counter()
+    while len(latencies) < max_calls and time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    elapsed = sum(latencies)
+    return {
+        "calls": len(latencies),
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "items_per_sec": len(latencies) * case.items_per_call / elapsed if elapsed else 0.0,
+        "p50_us": _percentile(latencies, 0.50) * 1e6,
+        "p90_us": _percentile(latencies, 0.90) * 1e6,
+        "p99_us": _percentile(latencies, 0.99) * 1e6,
+        "peak_kib": peak / 1024,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    *,
+    tolerance: float,
+) -> Tuple[List[str], List[str]]:
+    """Regressions beyond ``tolerance``, and the cases the baseline does not cover."""
+    regressions = []
+    unchecked = []
+    for case_id, metrics in results.items():
+        reference = baseline.get(case_id)
+        if reference is None:
+            unchecked.append(case_id)
+            continue
+        floor = reference["ops_per_sec"] * (1.0 - tolerance)
+        if metrics["ops_per_sec"] < floor:
+            change = metrics["ops_per_sec"] / reference["ops_per_sec"] - 1.0
+            regressions.append(
+                f"{case_id}: {metrics['ops_per_sec']:.1f} ops/s vs baseline"
+                f" {reference['ops_per_sec']:.1f} ({change:+.0%})"
+            )
+    return regressions, unchecked
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="MoA throughput benchmarks")
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Run a reduced sweep suitable for CI smoke checks.",
+    )
+    parser.add_argument(
+        "--filter",
+        default="",
+        help="Only run cases whose id contains this substring.",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum measured seconds per case.",
+    )
+    parser.add_argument(
+        "--max-calls",
+        type=int,
+        default=10_000,
+        help="Maximum measured calls per case.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results.json"),
+        help="Where to write machine-readable results.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=Path("benchmarks/baseline.json"),
+        help="Baseline results to compare against.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed fractional ops/sec drop before a case is flagged as a regression.",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Also fail when a case has no baseline entry.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Overwrite the baseline with this run's results.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'case':<52} {'ops/s':>12} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10}")
+    for case in build_cases(args.quick):
+        if args.filter not in case.case_id:
+            continue
+        metrics = measure(case, min_time=args.min_time, max_calls=args.max_calls)
+        results[case.case_id] = metrics
+        print(
+            f"{case.case_id:<52} {metrics['ops_per_sec']:>12.1f} {metrics['p50_us']:>10.1f}"
+            f" {metrics['p99_us']:>10.1f} {metrics['peak_kib']:>10.1f}"
+        )
+
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    print(f"\nWrote results to {args.output}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"Updated baseline at {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print("No baseline found; skipping regression check.")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+    regressions, unchecked = compare(results, baseline, tolerance=args.tolerance)
+    if unchecked:
+        print(f"\nNot in baseline ({len(unchecked)} cases, unchecked):")
+        for case_id in unchecked:
+            print(f"  {case_id}")
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    if unchecked and args.strict:
+        return 1
+    print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,39 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence
+from typing import Dict, Iterable, List
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from moa.aggregation import AggregationResult, aggregate_flat, aggregate_sequential
+from moa import tracing
+from moa.aggregation import AggregationResult
+from moa.archive import ArchiveWriter, RunStore, flipped_prompts
+from moa.cache import CachedProposer, CandidateCache
+from moa.cascade import CascadeTier, run_cascade
 from moa.eval import evaluate, exact_match
+from moa.journal import RunJournal
 from moa.models import Candidate, MockModel
+from moa.runner import (
+    BASELINE,
+    MIXED_MOA,
+    SELF_MOA,
+    SELF_MOA_SEQ,
+    STRATEGIES,
+    PromptRecord,
+    RunConfig,
+    iter_evaluated,
+    iter_prompts,
+    iter_sharded,
+)
+from moa.sampling import SamplingReport
+from moa.sweep import format_sweep_table, sweep_self_moa
+from moa.stats import ConfidenceInterval, bootstrap_accuracy, paired_bootstrap, pairs_correctness
+from moa.tracing import JsonTraceRecorder, MetricsCollector
 
 
 @dataclass
@@ -22,15 +42,12 @@ class ShowcaseModels:
     medium: MockModel
     weak: MockModel
 
+    def mixed(self) -> List[MockModel]:
+        return [self.strong, self.medium, self.weak]
+
 
 def load_prompts(path: Path) -> List[Dict[str, str]]:
-    prompts: List[Dict[str, str]] = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            if not line.strip():
-                continue
-            prompts.append(json.loads(line))
-    return prompts
+    return list(iter_prompts(path))
 
 
 def build_models() -> ShowcaseModels:
@@ -64,22 +81,12 @@ def build_models() -> ShowcaseModels:
     return ShowcaseModels(strong=strong, medium=medium, weak=weak)
 
 
-def collect_self_moa_candidates(
-    model: MockModel, *, prompt: Dict[str, str], samples: int, temperature: float
-) -> List[Candidate]:
-    return [
-        model.generate(prompt=prompt, sample_index=i, temperature=temperature)
-        for i in range(samples)
-    ]
-
-
-def collect_mixed_candidates(
-    models: Sequence[MockModel], *, prompt: Dict[str, str], temperature: float
-) -> List[Candidate]:
-    candidates: List[Candidate] = []
-    for model in models:
-        candidates.append(model.generate(prompt=prompt, sample_index=0, temperature=temperature))
-    return candidates
+def with_cache(models: ShowcaseModels, cache: CandidateCache) -> ShowcaseModels:
+    return ShowcaseModels(
+        strong=CachedProposer(models.strong, cache),
+        medium=CachedProposer(models.medium, cache),
+        weak=CachedProposer(models.weak, cache),
+    )
 
 
 def format_candidate_block(candidates: Iterable[Candidate]) -> str:
@@ -96,7 +103,10 @@ def format_candidate_block(candidates: Iterable[Candidate]) -> str:
 
 def render_result_heading(result: AggregationResult, *, reference: str) -> str:
     outcome = "✅" if exact_match(result.final_answer, reference) else "❌"
-    return f"{outcome} **{result.strategy}** → **{result.final_answer}**\n\n{result.rationale}\n"
+    rationale = result.rationale
+    if result.partial:
+        rationale += " Partial result: some samples missed the prompt deadline."
+    return f"{outcome} **{result.strategy}** → **{result.final_answer}**\n\n{rationale}\n"
 
 
 def run_showcase(
@@ -106,79 +116,253 @@ def run_showcase(
     sequential_window: int,
     temperature: float,
     save_path: Path | None,
+    max_concurrency: int = 8,
+    adaptive: bool = False,
+    adaptive_confidence: float | None = None,
+    cache_dir: Path | None = None,
+    workers: int = 1,
+    bootstrap_resamples: int = 0,
+    trace_path: Path | None = None,
+    metrics_path: Path | None = None,
+    journal_path: Path | None = None,
+    resume: bool = False,
+    dedup: bool = False,
+    archive_dir: Path | None = None,
 ) -> None:
-    prompts = load_prompts(prompts_path)
-    models = build_models()
-    transcript: List[str] = []
-
-    base_preds = []
-    mixed_preds = []
-    self_preds = []
-    seq_preds = []
-
-    for prompt in prompts:
-        prompt_id = prompt["id"]
-        question = prompt["question"]
-        answer = prompt["answer"]
-
-        base_candidate = models.strong.generate(
-            prompt=prompt, sample_index=0, temperature=temperature
-        )
-        mixed_candidates = collect_mixed_candidates(
-            [models.strong, models.medium, models.weak],
-            prompt=prompt,
+    recorder = JsonTraceRecorder() if trace_path is not None else None
+    collector = MetricsCollector() if metrics_path is not None else None
+    for hook in (recorder, collector):
+        if hook is not None:
+            tracing.register_hook(hook)
+    try:
+        _run_showcase(
+            prompts_path=prompts_path,
+            self_samples=self_samples,
+            sequential_window=sequential_window,
             temperature=temperature,
+            save_path=save_path,
+            max_concurrency=max_concurrency,
+            adaptive=adaptive,
+            adaptive_confidence=adaptive_confidence,
+            cache_dir=cache_dir,
+            workers=workers,
+            bootstrap_resamples=bootstrap_resamples,
+            journal_path=journal_path,
+            resume=resume,
+            dedup=dedup,
+            archive_dir=archive_dir,
         )
-        self_candidates = collect_self_moa_candidates(
-            models.strong,
-            prompt=prompt,
-            samples=self_samples,
-            temperature=temperature,
+    finally:
+        for hook in (recorder, collector):
+            if hook is not None:
+                tracing.unregister_hook(hook)
+    if recorder is not None and trace_path is not None:
+        recorder.write(trace_path)
+        print(f"Wrote trace to {trace_path}")
+    if collector is not None and metrics_path is not None:
+        collector.write_prometheus(metrics_path)
+        print(f"Wrote metrics to {metrics_path}")
+
+
+def _run_showcase(
+    *,
+    prompts_path: Path,
+    self_samples: int,
+    sequential_window: int,
+    temperature: float,
+    save_path: Path | None,
+    max_concurrency: int,
+    adaptive: bool,
+    adaptive_confidence: float | None,
+    cache_dir: Path | None,
+    workers: int,
+    bootstrap_resamples: int,
+    journal_path: Path | None,
+    resume: bool,
+    dedup: bool,
+    archive_dir: Path | None,
+) -> None:
+    config = RunConfig(
+        self_samples=self_samples,
+        sequential_window=sequential_window,
+        temperature=temperature,
+        max_concurrency=max_concurrency,
+        adaptive=adaptive,
+        adaptive_confidence=adaptive_confidence,
+        dedup=dedup,
+    )
+    models = build_models()
+    cache = None
+    journal = None
+    prompts: Iterable[Dict[str, str]] = iter_prompts(prompts_path)
+    if journal_path is not None:
+        journal = RunJournal(journal_path, config=config, resume=resume)
+        if len(journal):
+            print(f"Resuming: {len(journal)} prompts already in {journal_path}")
+        prompts = (prompt for prompt in prompts if prompt["id"] not in journal.completed)
+    records: Iterable[PromptRecord]
+    if workers > 1:
+        records = (
+            record
+            for shard in iter_sharded(prompts, build_models, config, workers=workers)
+            for record in shard.records
         )
-
-        mixed_result = aggregate_flat(mixed_candidates, strategy_name="Mixed-MoA (majority)")
-        self_result = aggregate_flat(self_candidates, strategy_name="Self-MoA (majority)")
-        seq_result = aggregate_sequential(
-            self_candidates,
-            window_size=sequential_window,
-            strategy_name=f"Self-MoA-Seq (window={sequential_window})",
+    else:
+        if cache_dir is not None:
+            cache = CandidateCache(cache_dir / "candidates.sqlite")
+            models = with_cache(models, cache)
+        records = iter_evaluated(prompts, models, config)
+    if journal is not None:
+        for record in records:
+            journal.append(record)
+        records = journal.records()
+
+    archive = None
+    if archive_dir is not None:
+        metadata = {"config": asdict(config), "strong_name": models.strong.name}
+        archive = RunStore(archive_dir).writer(metadata=metadata)
+    try:
+        render_report(
+            records,
+            save_path=save_path,
+            strong_name=models.strong.name,
+            bootstrap_resamples=bootstrap_resamples,
+            dedup=dedup,
+            archive=archive,
         )
-
-        transcript.append(f"## Prompt {prompt_id}\n")
-        transcript.append(f"**Question:** {question}\n")
-
-        base_header = "✅" if exact_match(base_candidate.final_answer, answer) else "❌"
-        transcript.append("### Single Model Baseline\n")
-        transcript.append(
-            f"{base_header} **{models.strong.name} sample** → **{base_candidate.final_answer}**\n"
+    except BaseException:
+        if archive is not None:
+            archive.abort()
+        raise
+    if journal is not None:
+        journal.close()
+    if save_path is not None:
+        print(f"\nSaved showcase to {save_path}")
+    if archive is not None:
+        archive.close()
+        print(f"Archived run {archive.run_id} to {archive.path}")
+    if cache is not None:
+        stats = cache.stats
+        print(
+            f"Candidate cache: {stats.hits} hits ({stats.disk_hits} from disk),"
+            f" {stats.misses} misses, {stats.evictions} evictions"
         )
-        transcript.append("```\n" + base_candidate.text + "\n```\n")
-
-        transcript.append("### Mixed-MoA Aggregation\n")
-        transcript.append(render_result_heading(mixed_result, reference=answer))
-        transcript.append(format_candidate_block(mixed_candidates) + "\n")
+        cache.close()
 
-        transcript.append("### Self-MoA Aggregation\n")
-        transcript.append(render_result_heading(self_result, reference=answer))
-        transcript.append(format_candidate_block(self_candidates) + "\n")
 
-        transcript.append("### Self-MoA-Seq Aggregation\n")
-        transcript.append(render_result_heading(seq_result, reference=answer))
-
-        base_preds.append((base_candidate.final_answer, answer))
-        mixed_preds.append((mixed_result.final_answer, answer))
-        self_preds.append((self_result.final_answer, answer))
-        seq_preds.append((seq_result.final_answer, answer))
-
-    transcript.append("---\n")
-    transcript.extend(build_summary_section(base_preds, mixed_preds, self_preds, seq_preds))
+def render_report(
+    records: Iterable[PromptRecord],
+    *,
+    save_path: Path | None,
+    strong_name: str,
+    bootstrap_resamples: int = 0,
+    dedup: bool = False,
+    archive: ArchiveWriter | None = None,
+) -> None:
+    predictions: Dict[str, List[tuple[str, str]]] = {name: [] for name in STRATEGIES}
+    sampling_reports: List[SamplingReport] = []
+    prompt_count = duplicate_count = calls_saved = 0
+    writer = ReportWriter(save_path)
+    for record in records:
+        if archive is not None:
+            archive.append(record)
+        prompt_count += 1
+        if record.duplicate_of is not None:
+            duplicate_count += 1
+            calls_saved += record.generation_calls
+        with tracing.span("prompt.render", prompt_id=record.prompt_id):
+            writer.write(render_prompt_section(record, strong_name=strong_name))
+        for name, prediction in record.predictions().items():
+            predictions[name].append((prediction, record.reference))
+        if record.sampling is not None:
+            sampling_reports.append(record.sampling)
+
+    writer.write(["---\n"])
+    writer.write(
+        build_summary_section(
+            predictions[BASELINE],
+            predictions[MIXED_MOA],
+            predictions[SELF_MOA],
+            predictions[SELF_MOA_SEQ],
+            bootstrap_resamples=bootstrap_resamples,
+        )
+    )
+    if sampling_reports:
+        drawn = sum(sampling.samples_drawn for sampling in sampling_reports)
+        budget = sum(sampling.budget for sampling in sampling_reports)
+        writer.write(
+            [
+                f"\nAdaptive sampling drew {drawn} of {budget} Self-MoA samples"
+                f" ({budget - drawn} saved)."
+            ]
+        )
+    if dedup:
+        ratio = duplicate_count / prompt_count if prompt_count else 0.0
+        writer.write(
+            [
+                f"\nDeduplication reused {duplicate_count} of {prompt_count} prompts"
+                f" (dedup ratio {ratio:.2f}), saving {calls_saved} proposer calls."
+            ]
+        )
+    writer.close()
+
+
+class ReportWriter:
+    """Streams markdown lines to stdout and an optional file as they are rendered."""
+
+    def __init__(self, save_path: Path | None) -> None:
+        self._handle = None
+        if save_path is not None:
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = save_path.open("w", encoding="utf-8")
+        self._started = False
+
+    def write(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            chunk = "\n" + line if self._started else line
+            self._started = True
+            sys.stdout.write(chunk)
+            if self._handle is not None:
+                self._handle.write(chunk)
+        sys.stdout.flush()
+        if self._handle is not None:
+            self._handle.flush()
+
+    def close(self) -> None:
+        sys.stdout.write("\n")
+        if self._handle is not None:
+            self._handle.close()
+
+
+def render_prompt_section(record: PromptRecord, *, strong_name: str) -> List[str]:
+    answer = record.reference
+    base_candidate = record.base
+    lines = [f"## Prompt {record.prompt_id}\n", f"**Question:** {record.prompt['question']}\n"]
+
+    base_header = "✅" if exact_match(base_candidate.final_answer, answer) else "❌"
+    lines.append("### Single Model Baseline\n")
+    lines.append(f"{base_header} **{strong_name} sample** → **{base_candidate.final_answer}**\n")
+    lines.append("```\n" + base_candidate.text + "\n```\n")
+
+    lines.append("### Mixed-MoA Aggregation\n")
+    lines.append(render_result_heading(record.mixed_result, reference=answer))
+    lines.append(format_candidate_block(record.mixed) + "\n")
+
+    lines.append("### Self-MoA Aggregation\n")
+    lines.append(render_result_heading(record.self_result, reference=answer))
+    lines.append(format_candidate_block(record.self_moa) + "\n")
+    if record.sampling is not None:
+        sampling = record.sampling
+        lines.append(
+            f"Adaptive sampling drew {sampling.samples_drawn} / {sampling.budget} samples"
+            f" (saved {sampling.samples_saved}, stop reason: {sampling.stop_reason}).\n"
+        )
+    if record.duplicate_of is not None:
+        lines.append(f"Reused the candidates of duplicate prompt {record.duplicate_of}.\n")
 
-    output_text = "\n".join(transcript)
-    print(output_text)
-    if save_path is not None:
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        save_path.write_text(output_text, encoding="utf-8")
-        print(f"\nSaved showcase to {save_path}")
+    lines.append("### Self-MoA-Seq Aggregation\n")
+    lines.append(render_result_heading(record.seq_result, reference=answer))
+    return lines
 
 
 def build_summary_section(
@@ -186,31 +370,186 @@ def build_summary_section(
     mixed_preds: Sequence[tuple[str, str]],
     self_preds: Sequence[tuple[str, str]],
     seq_preds: Sequence[tuple[str, str]],
+    *,
+    bootstrap_resamples: int = 0,
 ) -> List[str]:
-    base_eval = evaluate(base_preds)
-    mixed_eval = evaluate(mixed_preds)
-    self_eval = evaluate(self_preds)
-    seq_eval = evaluate(seq_preds)
+    rows = [
+        (BASELINE, base_preds),
+        (MIXED_MOA, mixed_preds),
+        (SELF_MOA, self_preds),
+        (SELF_MOA_SEQ, seq_preds),
+    ]
+    intervals: Dict[str, ConfidenceInterval] = {}
+    if bootstrap_resamples:
+        for name, preds in rows:
+            intervals[name] = bootstrap_accuracy(
+                pairs_correctness(preds), resamples=bootstrap_resamples
+            )
 
     summary_lines = ["## Aggregate Accuracy\n"]
-    summary_lines.append("| Strategy | Accuracy | Correct / Total |")
-    summary_lines.append("| --- | --- | --- |")
+    if intervals:
+        summary_lines.append("| Strategy | Accuracy | 95% CI | Correct / Total |")
+        summary_lines.append("| --- | --- | --- | --- |")
+    else:
+        summary_lines.append("| Strategy | Accuracy | Correct / Total |")
+        summary_lines.append("| --- | --- | --- |")
+    for name, preds in rows:
+        result = evaluate(preds)
+        interval = f" {intervals[name].format()} |" if intervals else ""
+        summary_lines.append(
+            f"| {name} | {result.accuracy:.2f} |{interval} {result.correct} / {result.total} |"
+        )
     summary_lines.append(
-        f"| Single Strong Sample | {base_eval.accuracy:.2f} | {base_eval.correct} / {base_eval.total} |"
+        "\nSelf-MoA variants clearly outperform the mixed ensemble despite using the same proposer model."
     )
-    summary_lines.append(
-        f"| Mixed-MoA (majority) | {mixed_eval.accuracy:.2f} | {mixed_eval.correct} / {mixed_eval.total} |"
+    if bootstrap_resamples:
+        summary_lines.append("\n### Paired Comparisons\n")
+        summary_lines.append("| Comparison | Accuracy Δ | 95% CI | p-value |")
+        summary_lines.append("| --- | --- | --- | --- |")
+        for challenger, preds in ((SELF_MOA, self_preds), (SELF_MOA_SEQ, seq_preds)):
+            comparison = paired_bootstrap(
+                pairs_correctness(mixed_preds),
+                pairs_correctness(preds),
+                strategy_a=MIXED_MOA,
+                strategy_b=challenger,
+                resamples=bootstrap_resamples,
+            )
+            summary_lines.append(
+                f"| {challenger} vs {MIXED_MOA} | {comparison.difference:+.2f}"
+                f" | {comparison.interval.format()} | {comparison.p_value:.3f} |"
+            )
+    return summary_lines
+
+
+def run_sweep(
+    *,
+    prompts_path: Path,
+    sample_grid: Sequence[int],
+    window_grid: Sequence[int],
+    temperature: float,
+    max_concurrency: int = 8,
+) -> None:
+    models = build_models()
+    result = sweep_self_moa(
+        load_prompts(prompts_path),
+        models.strong,
+        sample_grid=sample_grid,
+        window_grid=window_grid,
+        temperature=temperature,
+        max_concurrency=max_concurrency,
     )
-    summary_lines.append(
-        f"| Self-MoA (majority) | {self_eval.accuracy:.2f} | {self_eval.correct} / {self_eval.total} |"
+    print("## Self-MoA Sweep\n")
+    print("\n".join(format_sweep_table(result)))
+
+
+def run_cascade_demo(
+    *,
+    prompts_path: Path,
+    self_samples: int,
+    agreement: float,
+    min_confidence: float,
+    temperature: float,
+    max_concurrency: int = 8,
+) -> None:
+    models = build_models()
+    prompts = load_prompts(prompts_path)
+    tiers = [
+        CascadeTier("cheap", [models.medium, models.weak]),
+        CascadeTier("strong", [models.strong], samples=self_samples),
+    ]
+    report = run_cascade(
+        prompts,
+        tiers,
+        agreement=agreement,
+        min_confidence=min_confidence,
+        temperature=temperature,
+        max_concurrency=max_concurrency,
     )
-    summary_lines.append(
-        f"| Self-MoA-Seq | {seq_eval.accuracy:.2f} | {seq_eval.correct} / {seq_eval.total} |"
+    lines = [
+        "## Cascade Routing\n",
+        "| Prompt | Settled By | Answer | Votes |",
+        "| --- | --- | --- | --- |",
+    ]
+    for outcome in report.outcomes:
+        result = outcome.result
+        outcome_mark = "✅" if exact_match(result.final_answer, outcome.prompt["answer"]) else "❌"
+        votes = ", ".join(f"{answer}: {count}" for answer, count in result.vote_counts.items())
+        lines.append(
+            f"| {outcome.prompt_id} | {outcome.tier} | {outcome_mark} {result.final_answer}"
+            f" | {votes} |"
+        )
+    accuracy = evaluate(
+        (outcome.result.final_answer, outcome.prompt["answer"]) for outcome in report.outcomes
     )
-    summary_lines.append(
-        "\nSelf-MoA variants clearly outperform the mixed ensemble despite using the same proposer model."
+    full_calls = len(prompts) * (1 + len(models.mixed()) + self_samples)
+    lines.append(f"\nAccuracy: {accuracy.accuracy:.2f} ({accuracy.correct} / {accuracy.total})")
+    for tier in tiers:
+        lines.append(
+            f"- {tier.name}: {report.tier_calls.get(tier.name, 0)} calls,"
+            f" settled {report.resolved.get(tier.name, 0)} prompts"
+        )
+    lines.append(
+        f"\nCascade made {report.total_calls} proposer calls; the full showcase makes {full_calls}."
     )
-    return summary_lines
+    print("\n".join(lines))
+
+
+def render_from_archive(
+    *, archive_dir: Path, run_id: str, save_path: Path | None, bootstrap_resamples: int = 0
+) -> None:
+    with RunStore(archive_dir).get(run_id) as run:
+        render_report(
+            run.records(),
+            save_path=save_path,
+            strong_name=run.metadata["strong_name"],
+            bootstrap_resamples=bootstrap_resamples,
+            dedup=run.metadata["config"].get("dedup", False),
+        )
+    if save_path is not None:
+        print(f"\nRendered run {run.run_id} to {save_path}")
+
+
+def print_archive_history(*, archive_dir: Path, last: int) -> None:
+    store = RunStore(archive_dir)
+    history = store.accuracy_history(last=last)
+    lines = [
+        f"## Accuracy over the last {len(history)} runs\n",
+        "| Run | " + " | ".join(STRATEGIES) + " |",
+        "| --- " * (len(STRATEGIES) + 1) + "|",
+    ]
+    for run_id, accuracy in history:
+        cells = " | ".join(
+            f"{accuracy[name].accuracy:.2f}" if name in accuracy else "-" for name in STRATEGIES
+        )
+        lines.append(f"| {run_id} | {cells} |")
+    runs = store.runs(last=2)
+    try:
+        if len(runs) == 2:
+            before, after = runs
+            lines.append(f"\n### Flipped prompts ({before.run_id} → {after.run_id})\n")
+            flips = [
+                (name, flip)
+                for name in STRATEGIES
+                for flip in flipped_prompts(before, after, name)
+            ]
+            for name, flip in flips:
+                outcome = "fixed" if flip.fixed else "broke"
+                lines.append(
+                    f"- {name}: {flip.prompt_id} {outcome} ({flip.before} → {flip.after})"
+                )
+            if not flips:
+                lines.append("No prompt changed correctness.")
+    finally:
+        for run in runs:
+            run.close()
+    print("\n".join(lines))
+
+
+def _int_list(value: str) -> List[int]:
+    try:
+        return [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got {value!r}")
 
 
 def parse_args() -> argparse.Namespace:
@@ -239,6 +578,124 @@ def parse_args() -> argparse.Namespace:
         default=0.7,
         help="Sampling temperature (for demonstration purposes only).",
     )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of proposer calls in flight at once.",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Stop drawing Self-MoA samples once the majority answer is decided.",
+    )
+    parser.add_argument(
+        "--adaptive-confidence",
+        type=float,
+        default=None,
+        help="Also stop early when a sign test is this confident in the leader (implies --adaptive).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Reuse generated candidates across runs via an on-disk cache in this directory.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Shard prompts across this many worker processes.",
+    )
+    parser.add_argument(
+        "--bootstrap-resamples",
+        type=int,
+        default=0,
+        help="Add bootstrap confidence intervals and paired comparisons with this many resamples.",
+    )
+    parser.add_argument(
+        "--trace-json",
+        type=Path,
+        default=None,
+        help="Write per-stage spans as a Chrome trace-event JSON file.",
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        type=Path,
+        default=None,
+        help="Write latency histograms and counters in Prometheus text format.",
+    )
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        default=None,
+        help="Append each finished prompt to this JSONL journal and render the report from it.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip prompts already recorded in --journal instead of starting afresh.",
+    )
+    parser.add_argument(
+        "--sweep-samples",
+        type=_int_list,
+        default=None,
+        metavar="N,N,...",
+        help="Instead of the report, sweep these Self-MoA sample counts from one generation pass.",
+    )
+    parser.add_argument(
+        "--sweep-windows",
+        type=_int_list,
+        default=None,
+        metavar="W,W,...",
+        help="Sequential window sizes to include in the sweep (defaults to --sequential-window).",
+    )
+    parser.add_argument(
+        "--cascade",
+        action="store_true",
+        help="Instead of the report, answer with the cheap models and escalate to Self-MoA on disagreement.",
+    )
+    parser.add_argument(
+        "--cascade-agreement",
+        type=float,
+        default=1.0,
+        help="Share of cheap-tier votes the leading answer needs to skip escalation.",
+    )
+    parser.add_argument(
+        "--cascade-min-confidence",
+        type=float,
+        default=0.0,
+        help="Mean confidence the leading cheap-tier answer needs to skip escalation.",
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Reuse candidates across exact and near-duplicate questions.",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        type=Path,
+        default=ROOT / "examples" / "output" / "runs",
+        help="Directory holding the columnar archive written for every saved run.",
+    )
+    parser.add_argument(
+        "--no-archive",
+        action="store_true",
+        help="Skip writing the run archive.",
+    )
+    parser.add_argument(
+        "--from-archive",
+        metavar="RUN_ID",
+        default=None,
+        help="Render the report from an archived run (or 'latest') instead of running.",
+    )
+    parser.add_argument(
+        "--archive-history",
+        type=int,
+        metavar="N",
+        default=None,
+        help="Print per-strategy accuracy over the last N archived runs and recent flips.",
+    )
     parser.add_argument(
         "--no-save",
         action="store_true",
@@ -250,18 +707,68 @@ def parse_args() -> argparse.Namespace:
         default=Path("examples/output/self_moa_showcase.md"),
         help="Where to write the markdown showcase.",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.workers > 1 and args.cache_dir is not None:
+        parser.error("--cache-dir is only supported with a single worker")
+    if args.resume and args.journal is None:
+        parser.error("--resume requires --journal")
+    return args
 
 
 def main() -> None:
     args = parse_args()
+    if args.archive_history is not None:
+        print_archive_history(archive_dir=args.archive_dir, last=args.archive_history)
+        return
     save_path = None if args.no_save else args.output_path
+    if args.from_archive is not None:
+        try:
+            render_from_archive(
+                archive_dir=args.archive_dir,
+                run_id=args.from_archive,
+                save_path=save_path,
+                bootstrap_resamples=args.bootstrap_resamples,
+            )
+        except FileNotFoundError as error:
+            raise SystemExit(f"error: {error}") from None
+        return
+    if args.sweep_samples is not None:
+        run_sweep(
+            prompts_path=args.prompts,
+            sample_grid=args.sweep_samples,
+            window_grid=args.sweep_windows or [args.sequential_window],
+            temperature=args.temperature,
+            max_concurrency=args.max_concurrency,
+        )
+        return
+    if args.cascade:
+        run_cascade_demo(
+            prompts_path=args.prompts,
+            self_samples=args.self_samples,
+            agreement=args.cascade_agreement,
+            min_confidence=args.cascade_min_confidence,
+            temperature=args.temperature,
+            max_concurrency=args.max_concurrency,
+        )
+        return
     run_showcase(
         prompts_path=args.prompts,
         self_samples=args.self_samples,
         sequential_window=args.sequential_window,
         temperature=args.temperature,
         save_path=save_path,
+        max_concurrency=args.max_concurrency,
+        adaptive=args.adaptive or args.adaptive_confidence is not None,
+        adaptive_confidence=args.adaptive_confidence,
+        cache_dir=args.cache_dir,
+        workers=args.workers,
+        bootstrap_resamples=args.bootstrap_resamples,
+        trace_path=args.trace_json,
+        metrics_path=args.metrics_prom,
+        journal_path=args.journal,
+        resume=args.resume,
+        dedup=args.dedup,
+        archive_dir=None if args.no_archive or save_path is None else args.archive_dir,
     )
 
 
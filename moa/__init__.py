@@ -1,12 +1,31 @@
 """Utilities for demonstrating Mixture-of-Agents concepts."""
 
-from .aggregation import AggregationResult, aggregate_flat, aggregate_sequential
-from .models import Candidate, MockModel
+from .aggregation import (
+    AggregationResult,
+    IncrementalAggregator,
+    aggregate_flat,
+    aggregate_hierarchical,
+    aggregate_sequential,
+)
+from .generation import AsyncProposer, GenerationRequest, run_generation
+from .models import BatchProposer, Candidate, MockModel, Proposer
+from .streaming import StreamingProposer, stream_self_moa
+from .table import CandidateTable
 
 __all__ = [
     "AggregationResult",
+    "AsyncProposer",
+    "BatchProposer",
     "Candidate",
+    "CandidateTable",
+    "GenerationRequest",
+    "IncrementalAggregator",
     "MockModel",
+    "Proposer",
+    "StreamingProposer",
     "aggregate_flat",
+    "aggregate_hierarchical",
     "aggregate_sequential",
+    "run_generation",
+    "stream_self_moa",
 ]
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import functools
+import heapq
 from collections import Counter
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
 
+from . import tracing
 from .models import Candidate
+from .table import CandidateTable
 
 
 @dataclass
@@ -15,19 +20,87 @@ class AggregationResult:
     supporting_models: List[str]
     vote_counts: Counter
     rationale: str
+    partial: bool = False
 
     @property
     def support_size(self) -> int:
         return sum(self.vote_counts.values())
 
 
+class LazyAggregationResult(AggregationResult):
+    """:class:`AggregationResult` whose ``rationale`` is rendered on first access.
+
+    The text is built from the result's own fields, with ``hidden_supporters``
+    counting winning votes whose labels were not kept, so results pickle and
+    work with :func:`dataclasses.replace`.
+    """
+
+    def __init__(self, *args, hidden_supporters: int = 0, **kwargs) -> None:
+        self.hidden_supporters = hidden_supporters
+        kwargs.setdefault("rationale", None)
+        super().__init__(*args, **kwargs)
+
+    @property  # type: ignore[override]
+    def rationale(self) -> str:
+        if self._rationale is None:
+            shown = self.supporting_models
+            if self.hidden_supporters > 0:
+                shown = shown + [f"+{self.hidden_supporters} more"]
+            self._rationale = _build_rationale(
+                self.strategy, self.final_answer, self.vote_counts, shown
+            )
+        return self._rationale
+
+    @rationale.setter
+    def rationale(self, value: Optional[str]) -> None:
+        self._rationale = value
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AggregationResult):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name)
+            for name in AggregationResult.__dataclass_fields__
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+_Aggregator = TypeVar("_Aggregator", bound=Callable[..., AggregationResult])
+
+
 def extract_final_answer(candidate: Candidate) -> str:
     return candidate.final_answer.strip()
 
 
-def aggregate_flat(candidates: Sequence[Candidate], *, strategy_name: str) -> AggregationResult:
-    if not candidates:
+def _traced(func: _Aggregator) -> _Aggregator:
+    @functools.wraps(func)
+    def wrapper(candidates, **kwargs):
+        if not tracing.enabled():
+            return func(candidates, **kwargs)
+        strategy = kwargs.get("strategy_name", "")
+        with tracing.span("aggregate", strategy=strategy, aggregator=func.__name__):
+            result = func(candidates, **kwargs)
+        _record_vote_margin(result)
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _record_vote_margin(result: AggregationResult) -> None:
+    top = result.vote_counts.most_common(2)
+    runner_up = top[1][1] if len(top) > 1 else 0
+    tracing.observe("moa_vote_margin", top[0][1] - runner_up, strategy=result.strategy)
+
+
+@_traced
+def aggregate_flat(
+    candidates: Sequence[Candidate] | CandidateTable, *, strategy_name: str
+) -> AggregationResult:
+    if not len(candidates):
         raise ValueError("aggregate_flat requires at least one candidate")
+    if isinstance(candidates, CandidateTable):
+        return _aggregate_table(candidates, strategy_name=strategy_name)
 
     votes = Counter()
     label_map = {}
@@ -43,27 +116,31 @@ def aggregate_flat(candidates: Sequence[Candidate], *, strategy_name: str) -> Ag
         key=lambda c: (c.confidence, -c.sample_index),
         reverse=True,
     )
-    rationale = _build_rationale(strategy_name, best_answer, votes, supporting)
+    labels = [cand.short_label() for cand in supporting]
+    rationale = _build_rationale(strategy_name, best_answer, votes, labels)
     return AggregationResult(
         prompt_id=candidates[0].prompt_id,
         strategy=strategy_name,
         final_answer=best_answer,
-        supporting_models=[cand.short_label() for cand in supporting],
+        supporting_models=labels,
         vote_counts=votes,
         rationale=rationale,
     )
 
 
+@_traced
 def aggregate_sequential(
-    candidates: Sequence[Candidate],
+    candidates: Sequence[Candidate] | CandidateTable,
     *,
     window_size: int,
     strategy_name: str,
 ) -> AggregationResult:
-    if not candidates:
+    if not len(candidates):
         raise ValueError("aggregate_sequential requires candidates")
     if window_size <= 0:
         raise ValueError("window_size must be positive")
+    if isinstance(candidates, CandidateTable):
+        return _aggregate_table(candidates, strategy_name=strategy_name, window_size=window_size)
 
     votes = Counter()
     order = list(sorted(candidates, key=lambda c: c.sample_index))
@@ -84,11 +161,12 @@ def aggregate_sequential(
         key=lambda c: (c.confidence, -c.sample_index),
         reverse=True,
     )
+    labels = [cand.short_label() for cand in supporting]
     rationale = _build_rationale(
         strategy_name,
         best_answer,
         votes,
-        supporting,
+        labels,
         windows=len(windows),
         window_size=window_size,
     )
@@ -96,7 +174,490 @@ def aggregate_sequential(
         prompt_id=candidates[0].prompt_id,
         strategy=strategy_name,
         final_answer=best_answer,
-        supporting_models=[cand.short_label() for cand in supporting],
+        supporting_models=labels,
+        vote_counts=votes,
+        rationale=rationale,
+    )
+
+
+@_traced
+def aggregate_hierarchical(
+    candidates: Sequence[Candidate],
+    *,
+    fan_in: int,
+    strategy_name: str,
+    max_depth: int | None = None,
+    keep_answers: int | None = None,
+    keep_supporters: int | None = None,
+    executor: Executor | None = None,
+) -> AggregationResult:
+    """Tree-structured Self-MoA: windows of ``fan_in`` are aggregated per layer.
+
+    Layer 0 aggregates windows of ``fan_in`` candidates (in sample order);
+    every later layer merges ``fan_in`` child nodes, so a prompt with n
+    samples needs about log_fan_in(n) layers. The nodes of a layer are
+    independent: they are reduced in order by default, or mapped over
+    ``executor`` when one is given. The work is pure Python, so a thread
+    pool only adds overhead under the GIL; a ``ProcessPoolExecutor`` runs
+    nodes in parallel but pickles every window, which costs more than the
+    votes themselves unless nodes are expensive. ``max_depth`` caps the
+    number of layers by merging whatever remains at the last one.
+
+    Each node forwards its vote counts and its best supporters. With
+    ``keep_answers``/``keep_supporters`` unset this is exact and selects the
+    same answer as :func:`aggregate_sequential`; setting them bounds per-node
+    memory at the cost of approximate tallies for long-tail answers.
+    """
+    if not candidates:
+        raise ValueError("aggregate_hierarchical requires candidates")
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    if max_depth is not None and max_depth < 2:
+        raise ValueError("max_depth must be at least 2")
+
+    order = sorted(candidates, key=lambda c: c.sample_index)
+    windows = [order[i : i + fan_in] for i in range(0, len(order), fan_in)]
+    run = executor.map if executor is not None else map
+    nodes = list(
+        run(
+            _hierarchical_leaf,
+            windows,
+            [keep_answers] * len(windows),
+            [keep_supporters] * len(windows),
+        )
+    )
+    layers = 1
+    while len(nodes) > 1:
+        if max_depth is not None and layers + 1 >= max_depth:
+            groups = [nodes]
+        else:
+            groups = [nodes[i : i + fan_in] for i in range(0, len(nodes), fan_in)]
+        nodes = list(
+            run(
+                _hierarchical_merge,
+                groups,
+                [keep_answers] * len(groups),
+                [keep_supporters] * len(groups),
+            )
+        )
+        layers += 1
+
+    votes, supporters = nodes[0]
+    best_answer, _ = votes.most_common(1)[0]
+    labels = [label for _, _, label in sorted(supporters[best_answer], reverse=True)]
+    rationale = _build_rationale(strategy_name, best_answer, votes, labels)
+    rationale += f" Aggregated through {layers} layers with fan-in {fan_in}."
+    return AggregationResult(
+        prompt_id=candidates[0].prompt_id,
+        strategy=strategy_name,
+        final_answer=best_answer,
+        supporting_models=labels,
+        vote_counts=votes,
+        rationale=rationale,
+    )
+
+
+_Supporter = Tuple[float, int, str]
+_HierarchyNode = Tuple[Counter, Dict[str, List[_Supporter]]]
+
+
+def _hierarchical_leaf(
+    window: Sequence[Candidate], keep_answers: int | None, keep_supporters: int | None
+) -> _HierarchyNode:
+    votes: Counter = Counter()
+    supporters: Dict[str, List[_Supporter]] = {}
+    for cand in window:
+        answer = extract_final_answer(cand)
+        votes[answer] += 1
+        supporters.setdefault(answer, []).append(
+            (cand.confidence, -cand.sample_index, cand.short_label())
+        )
+    return _prune_node(votes, supporters, keep_answers, keep_supporters)
+
+
+def _hierarchical_merge(
+    children: Sequence[_HierarchyNode], keep_answers: int | None, keep_supporters: int | None
+) -> _HierarchyNode:
+    votes: Counter = Counter()
+    supporters: Dict[str, List[_Supporter]] = {}
+    for child_votes, child_supporters in children:
+        votes.update(child_votes)
+        for answer, items in child_supporters.items():
+            supporters.setdefault(answer, []).extend(items)
+    return _prune_node(votes, supporters, keep_answers, keep_supporters)
+
+
+def _prune_node(
+    votes: Counter,
+    supporters: Dict[str, List[_Supporter]],
+    keep_answers: int | None,
+    keep_supporters: int | None,
+) -> _HierarchyNode:
+    if keep_answers is not None and len(votes) > keep_answers:
+        votes = Counter(dict(votes.most_common(keep_answers)))
+        supporters = {answer: supporters[answer] for answer in votes}
+    if keep_supporters is not None:
+        supporters = {
+            answer: heapq.nlargest(keep_supporters, items) for answer, items in supporters.items()
+        }
+    return votes, supporters
+
+
+@dataclass(frozen=True)
+class AggregationSpec:
+    """One strategy for :func:`aggregate_many`.
+
+    Plain specs are majority votes like :func:`aggregate_flat`; with
+    ``window_size`` they match :func:`aggregate_sequential`; ``weighted``
+    votes by summed candidate confidence instead of counts.
+    """
+
+    strategy_name: str
+    window_size: Optional[int] = None
+    weighted: bool = False
+
+    def __post_init__(self) -> None:
+        if self.window_size is not None and self.window_size <= 0:
+            raise ValueError("window_size must be positive")
+        if self.window_size is not None and self.weighted:
+            raise ValueError("weighted specs do not take a window_size")
+
+
+def aggregate_many(
+    candidates: Sequence[Candidate], specs: Sequence[AggregationSpec]
+) -> List[AggregationResult]:
+    """Evaluate several strategies over one candidate pool in a single pass.
+
+    Answers are extracted and grouped once, the sample-index ordering needed
+    by windowed specs is computed once, and supporter labels are built once
+    per winning answer, so each extra spec costs only a scan over distinct
+    answers plus its rationale. Results equal calling the single-strategy
+    aggregators one by one, in ``specs`` order. Results with the same winner
+    share one ``supporting_models`` list; copy it before mutating.
+    """
+    if not len(candidates):
+        raise ValueError("aggregate_many requires at least one candidate")
+    with tracing.span("aggregate", strategy="*", aggregator="aggregate_many"):
+        results = _aggregate_many(candidates, specs)
+    if tracing.enabled():
+        for result in results:
+            _record_vote_margin(result)
+    return results
+
+
+def _aggregate_many(
+    candidates: Sequence[Candidate], specs: Sequence[AggregationSpec]
+) -> List[AggregationResult]:
+    counts: Dict[str, int] = {}
+    weights: Dict[str, float] = {}
+    members: Dict[str, List[Candidate]] = {}
+    for cand in candidates:
+        answer = extract_final_answer(cand)
+        counts[answer] = counts.get(answer, 0) + 1
+        weights[answer] = weights.get(answer, 0.0) + cand.confidence
+        members.setdefault(answer, []).append(cand)
+
+    sequential_order: Optional[List[str]] = None
+    if any(spec.window_size is not None for spec in specs):
+        ordered = sorted(candidates, key=lambda c: c.sample_index)
+        sequential_order = list(dict.fromkeys(extract_final_answer(c) for c in ordered))
+
+    labels: Dict[str, List[str]] = {}
+    joined_labels: Dict[str, str] = {}
+    # Plain and windowed specs tally the same counts, but in different orders.
+    described: Dict[Tuple[bool, bool], str] = {}
+    results: List[AggregationResult] = []
+    prompt_id = candidates[0].prompt_id
+    for spec in specs:
+        if spec.weighted:
+            votes = Counter({answer: round(weight, 4) for answer, weight in weights.items()})
+        elif spec.window_size is not None:
+            assert sequential_order is not None
+            votes = Counter({answer: counts[answer] for answer in sequential_order})
+        else:
+            votes = Counter(counts)
+        best_answer, _ = votes.most_common(1)[0]
+        supporting = labels.get(best_answer)
+        if supporting is None:
+            ranked = sorted(
+                members[best_answer],
+                key=lambda c: (c.confidence, -c.sample_index),
+                reverse=True,
+            )
+            supporting = labels[best_answer] = [cand.short_label() for cand in ranked]
+            joined_labels[best_answer] = ", ".join(supporting)
+        kind = (spec.weighted, spec.window_size is not None)
+        if kind not in described:
+            described[kind] = _describe_votes(votes)
+        windows = None
+        if spec.window_size is not None:
+            windows = -(-len(candidates) // spec.window_size)
+        rationale = _format_rationale(
+            spec.strategy_name,
+            best_answer,
+            described[kind],
+            joined_labels[best_answer],
+            windows=windows,
+            window_size=spec.window_size,
+        )
+        results.append(
+            AggregationResult(
+                prompt_id=prompt_id,
+                strategy=spec.strategy_name,
+                final_answer=best_answer,
+                supporting_models=supporting,
+                vote_counts=votes,
+                rationale=rationale,
+            )
+        )
+    return results
+
+
+def aggregate_bounded(
+    candidates: Iterable[Candidate],
+    *,
+    strategy_name: str,
+    top_k: int = 8,
+    max_answers: Optional[int] = None,
+) -> AggregationResult:
+    """Majority vote over a candidate stream in memory bounded by answers x ``top_k``.
+
+    Only the ``top_k`` best supporters per answer are kept, in a min-heap
+    ordered like :func:`aggregate_flat`'s supporter sort, and only their
+    labels are retained. With ``max_answers`` votes are tracked by a
+    Space-Saving heavy-hitters sketch of that many counters: memory no longer
+    grows with answer diversity, and a count overestimates its true value by
+    at most ``len(candidates) / max_answers``. The rationale is rendered only
+    when read. When every supporter fits and no sketch is used, the result
+    equals :func:`aggregate_flat` apart from truncated supporters.
+    """
+    if top_k <= 0:
+        raise ValueError("top_k must be positive")
+    if max_answers is not None and max_answers <= 0:
+        raise ValueError("max_answers must be positive")
+    counts: Dict[str, int] = {}
+    supporters: Dict[str, List[Tuple[float, int, int, str]]] = {}
+    # One (count, arrival, answer) entry per sketch counter. Counts only grow, so
+    # an entry may lag its counter; it is refreshed when it reaches the top.
+    smallest: List[Tuple[int, int, str]] = []
+    prompt_id: Optional[str] = None
+    seen = 0
+    for cand in candidates:
+        if prompt_id is None:
+            prompt_id = cand.prompt_id
+        answer = extract_final_answer(cand)
+        if answer not in counts and max_answers is not None:
+            floor = 0
+            if len(counts) >= max_answers:
+                # Space-Saving: the newcomer takes over the smallest counter.
+                evicted = _pop_smallest(smallest, counts)
+                floor = counts.pop(evicted)
+                del supporters[evicted]
+            heapq.heappush(smallest, (floor + 1, seen, answer))
+            counts[answer] = floor
+        counts[answer] = counts.get(answer, 0) + 1
+        heap = supporters.setdefault(answer, [])
+        entry = (cand.confidence, -cand.sample_index, -seen, cand.short_label())
+        if len(heap) < top_k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+        seen += 1
+    if prompt_id is None:
+        raise ValueError("aggregate_bounded requires at least one candidate")
+
+    votes = Counter(counts)
+    best_answer, best_count = votes.most_common(1)[0]
+    labels = [entry[3] for entry in sorted(supporters[best_answer], reverse=True)]
+    return LazyAggregationResult(
+        prompt_id=prompt_id,
+        strategy=strategy_name,
+        final_answer=best_answer,
+        supporting_models=labels,
+        vote_counts=votes,
+        hidden_supporters=best_count - len(labels),
+    )
+
+
+def _pop_smallest(heap: List[Tuple[int, int, str]], counts: Dict[str, int]) -> str:
+    """Pop the answer with the smallest count, earliest arrival first on ties."""
+    while True:
+        count, arrival, answer = heap[0]
+        if counts[answer] == count:
+            heapq.heappop(heap)
+            return answer
+        heapq.heapreplace(heap, (counts[answer], arrival, answer))
+
+
+class IncrementalAggregator:
+    """Majority vote that accepts candidates one at a time.
+
+    Each ``add`` updates running vote counts, the current leader and the
+    sliding-window tallies in constant time, so a provisional
+    :class:`AggregationResult` is available while samples are still arriving.
+    Without ``window_size`` results match :func:`aggregate_flat` over the
+    arrival order; with it they match :func:`aggregate_sequential`. Windows
+    are keyed by ``sample_index // window_size``, which coincides with
+    ``aggregate_sequential`` for contiguous sample indices.
+    """
+
+    def __init__(self, *, strategy_name: str, window_size: int | None = None) -> None:
+        if window_size is not None and window_size <= 0:
+            raise ValueError("window_size must be positive")
+        self.strategy_name = strategy_name
+        self.window_size = window_size
+        self._prompt_id: Optional[str] = None
+        self._votes: Dict[str, int] = {}
+        self._first_seen: Dict[str, Tuple[int, int]] = {}
+        self._supporters: Dict[str, List[Candidate]] = {}
+        self._windows: Dict[int, Counter] = {}
+        self._leader: Optional[str] = None
+        self._seen = 0
+
+    def __len__(self) -> int:
+        return self._seen
+
+    @property
+    def leader(self) -> Optional[str]:
+        return self._leader
+
+    @property
+    def leader_votes(self) -> int:
+        if self._leader is None:
+            return 0
+        return self._votes[self._leader]
+
+    def margin(self) -> int:
+        """Votes separating the leader from the runner-up."""
+        if self._leader is None:
+            return 0
+        runner_up = max(
+            (count for answer, count in self._votes.items() if answer != self._leader),
+            default=0,
+        )
+        return self._votes[self._leader] - runner_up
+
+    def add(self, candidate: Candidate) -> None:
+        if self._prompt_id is None:
+            self._prompt_id = candidate.prompt_id
+        answer = extract_final_answer(candidate)
+        order = self._order_key(candidate)
+        count = self._votes.get(answer, 0) + 1
+        self._votes[answer] = count
+        if answer not in self._first_seen or order < self._first_seen[answer]:
+            self._first_seen[answer] = order
+        self._supporters.setdefault(answer, []).append(candidate)
+        if self.window_size is not None:
+            window = candidate.sample_index // self.window_size
+            self._windows.setdefault(window, Counter())[answer] += 1
+        self._seen += 1
+
+        leader = self._leader
+        if leader is None or leader == answer:
+            self._leader = answer
+            return
+        leader_count = self._votes[leader]
+        if count > leader_count or (
+            count == leader_count and self._first_seen[answer] < self._first_seen[leader]
+        ):
+            self._leader = answer
+
+    def extend(self, candidates: Iterable[Candidate]) -> None:
+        for candidate in candidates:
+            self.add(candidate)
+
+    def window_votes(self, window: int) -> Counter:
+        if self.window_size is None:
+            raise ValueError("window_votes requires a window_size")
+        return Counter(self._windows.get(window, Counter()))
+
+    def result(self) -> AggregationResult:
+        if self._leader is None or self._prompt_id is None:
+            raise ValueError("IncrementalAggregator has not received any candidates")
+        best_answer = self._leader
+        votes = Counter(
+            {answer: self._votes[answer] for answer in sorted(self._votes, key=self._first_seen.get)}
+        )
+        supporting = sorted(
+            self._supporters[best_answer],
+            key=lambda c: (c.confidence, -c.sample_index),
+            reverse=True,
+        )
+        labels = [cand.short_label() for cand in supporting]
+        if self.window_size is None:
+            rationale = _build_rationale(self.strategy_name, best_answer, votes, labels)
+        else:
+            rationale = _build_rationale(
+                self.strategy_name,
+                best_answer,
+                votes,
+                labels,
+                windows=-(-self._seen // self.window_size),
+                window_size=self.window_size,
+            )
+        return AggregationResult(
+            prompt_id=self._prompt_id,
+            strategy=self.strategy_name,
+            final_answer=best_answer,
+            supporting_models=labels,
+            vote_counts=votes,
+            rationale=rationale,
+        )
+
+    def _order_key(self, candidate: Candidate) -> Tuple[int, int]:
+        if self.window_size is None:
+            return (self._seen, 0)
+        return (candidate.sample_index, self._seen)
+
+
+def _aggregate_table(
+    table: CandidateTable,
+    *,
+    strategy_name: str,
+    window_size: int | None = None,
+) -> AggregationResult:
+    stripped = [answer.strip() for answer in table.answer_values]
+    codes = table.answer_codes
+    code_counts = Counter(codes)
+    if window_size is None:
+        # Codes are interned in arrival order, so walking them in code order
+        # reproduces the first-seen ordering aggregate_flat gets from Counter.
+        order: Sequence[int] = range(len(table))
+        first_seen_codes: Sequence[int] = range(len(stripped))
+    else:
+        order = sorted(range(len(table)), key=table.sample_indices.__getitem__)
+        first_seen_codes = list(dict.fromkeys(codes[row] for row in order))
+
+    votes: Counter = Counter()
+    for code in first_seen_codes:
+        votes[stripped[code]] += code_counts[code]
+
+    best_answer, _ = votes.most_common(1)[0]
+    best_codes = {code for code, answer in enumerate(stripped) if answer == best_answer}
+    confidences = table.confidences
+    sample_indices = table.sample_indices
+    supporting = sorted(
+        (row for row in order if codes[row] in best_codes),
+        key=lambda row: (confidences[row], -sample_indices[row]),
+        reverse=True,
+    )
+    labels = [table.short_label(row) for row in supporting]
+    if window_size is None:
+        rationale = _build_rationale(strategy_name, best_answer, votes, labels)
+    else:
+        rationale = _build_rationale(
+            strategy_name,
+            best_answer,
+            votes,
+            labels,
+            windows=-(-len(table) // window_size),
+            window_size=window_size,
+        )
+    return AggregationResult(
+        prompt_id=table.prompt_id(0),
+        strategy=strategy_name,
+        final_answer=best_answer,
+        supporting_models=labels,
         vote_counts=votes,
         rationale=rationale,
     )
@@ -106,27 +667,55 @@ def _build_rationale(
     strategy_name: str,
     best_answer: str,
     votes: Counter,
-    supporting: Sequence[Candidate],
+    supporting: Sequence[str],
     *,
     windows: int | None = None,
     window_size: int | None = None,
 ) -> str:
-    vote_descriptions = ", ".join(
-        f"{answer}: {count}" for answer, count in sorted(votes.items(), key=lambda x: -x[1])
+    return _format_rationale(
+        strategy_name,
+        best_answer,
+        _describe_votes(votes),
+        ", ".join(supporting),
+        windows=windows,
+        window_size=window_size,
     )
-    supporters = ", ".join(c.short_label() for c in supporting)
-    base = (
-        f"{strategy_name} selected '{best_answer}' with vote distribution [{vote_descriptions}]."
-        f" Supporting samples: {supporters}."
+
+
+def _describe_votes(votes: Counter) -> str:
+    return ", ".join(
+        f"{answer}: {count}" for answer, count in sorted(votes.items(), key=lambda x: -x[1])
     )
-    if windows is not None and window_size is not None:
-        base += f" Processed in {windows} sliding windows of size {window_size}."
-    return base
+
+
+def _format_rationale(
+    strategy_name: str,
+    best_answer: str,
+    vote_descriptions: str,
+    supporters: str,
+    *,
+    windows: int | None = None,
+    window_size: int | None = None,
+) -> str:
+    with tracing.span("rationale", strategy=strategy_name):
+        base = (
+            f"{strategy_name} selected '{best_answer}' with vote distribution [{vote_descriptions}]."
+            f" Supporting samples: {supporters}."
+        )
+        if windows is not None and window_size is not None:
+            base += f" Processed in {windows} sliding windows of size {window_size}."
+        return base
 
 
 __all__ = [
     "AggregationResult",
+    "AggregationSpec",
+    "IncrementalAggregator",
+    "LazyAggregationResult",
+    "aggregate_bounded",
     "aggregate_flat",
+    "aggregate_many",
+    "aggregate_hierarchical",
     "aggregate_sequential",
     "extract_final_answer",
 ]
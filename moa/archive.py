@@ -0,0 +1,565 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import time
+import zlib
+from array import array
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .aggregation import AggregationResult
+from .eval import EvaluationResult, exact_match
+from .models import Candidate
+from .runner import MIXED_MOA, SELF_MOA, SELF_MOA_SEQ, STRATEGIES, PromptRecord
+from .sampling import SamplingReport
+
+ARCHIVE_MAGIC = b"MOARUN1\0"
+ARCHIVE_SUFFIX = ".moar"
+ARCHIVE_VERSION = 1
+_TRAILER = struct.Struct("<Q8s")
+_ARRAYS = {"u8": "B", "i8": "b", "u32": "I", "f64": "d"}
+_BASE, _MIXED, _SELF = range(3)
+
+PROMPT_COLUMNS = {"prompt_id": "str", "prompt": "str", "sampling": "str", "duplicate_of": "str"}
+CANDIDATE_COLUMNS = {
+    "prompt": "u32",
+    "role": "u8",
+    "position": "u32",
+    "sample_index": "u32",
+    "answer": "u32",
+    "confidence": "f64",
+    "correct": "i8",
+    "text": "str",
+    "metadata": "str",
+}
+# Bulky candidate columns that aggregate queries never need.
+_TEXT_COLUMNS = frozenset({"text", "metadata"})
+RESULT_COLUMNS = {
+    "answer": "u32",
+    "correct": "u8",
+    "partial": "u8",
+    "label": "str",
+    "supporters": "str",
+    "votes": "str",
+    "rationale": "str",
+}
+
+
+def _encode(kind: str, values: List[Any], level: int) -> bytes:
+    if kind == "str":
+        raw = json.dumps(values, ensure_ascii=False).encode("utf-8")
+    else:
+        raw = array(_ARRAYS[kind], values).tobytes()
+    return zlib.compress(raw, level)
+
+
+def _decode(kind: str, payload: bytes) -> List[Any]:
+    raw = zlib.decompress(payload)
+    if kind == "str":
+        return json.loads(raw)
+    values = array(_ARRAYS[kind])
+    values.frombytes(raw)
+    return values.tolist()
+
+
+def _bucket(prompt_id: str, buckets: int) -> int:
+    return zlib.crc32(prompt_id.encode("utf-8")) % buckets
+
+
+class _TableWriter:
+    def __init__(self, columns: Dict[str, str]) -> None:
+        self.columns = columns
+        self.rows: List[Tuple[Any, ...]] = []
+        self.prompts: List[int] = []
+        self.meta: Dict[str, Any] = {"columns": columns, "rows": 0, "chunks": []}
+
+    def flush(self, handle: BinaryIO, level: int) -> None:
+        if not self.rows:
+            return
+        offsets: Dict[str, List[int]] = {}
+        for name, values in zip(self.columns, zip(*self.rows)):
+            payload = _encode(self.columns[name], list(values), level)
+            offsets[name] = [handle.tell(), len(payload)]
+            handle.write(payload)
+        self.meta["chunks"].append(
+            {
+                "rows": len(self.rows),
+                "prompts": [self.prompts[0], self.prompts[-1]],
+                "columns": offsets,
+            }
+        )
+        self.meta["rows"] += len(self.rows)
+        self.rows = []
+        self.prompts = []
+
+
+class ArchiveWriter:
+    """Streams :class:`PromptRecord` objects into a columnar run archive.
+
+    The archive holds three kinds of tables: ``prompts``, one
+    ``candidates/<model>`` partition per proposer and one
+    ``results/<strategy>`` partition per entry of :data:`STRATEGIES`, whose
+    rows line up with the prompt rows. Every table is cut into chunks of
+    ``chunk_rows`` rows and each column of a chunk is zlib-compressed
+    separately, so readers decompress only the columns and chunks a query
+    touches. Answers are dictionary-encoded. Prompt ids are hashed into
+    buckets of about ``chunk_rows`` ``(prompt_id, row)`` pairs, stored like
+    chunks, so one lookup decompresses a single bucket. The footer (chunk and
+    bucket offsets, the answer dictionary and run metadata) is written last.
+    The file only appears under ``path`` once :meth:`close` succeeds.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        run_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        chunk_rows: int = 4096,
+        level: int = 6,
+    ) -> None:
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+        self.path = Path(path)
+        self.run_id = run_id or self.path.name[: -len(ARCHIVE_SUFFIX)]
+        self.metadata = dict(metadata or {})
+        self.chunk_rows = chunk_rows
+        self.level = level
+        self.created_ns = time.time_ns()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._handle = self._tmp_path.open("wb")
+        self._handle.write(ARCHIVE_MAGIC)
+        self._tables: Dict[str, _TableWriter] = {}
+        self._answers: Dict[str, int] = {}
+        self._prompt_ids: List[str] = []
+        self._prompts = 0
+
+    def __len__(self) -> int:
+        return self._prompts
+
+    def append(self, record: PromptRecord) -> None:
+        row = self._prompts
+        self._prompts += 1
+        self._prompt_ids.append(record.prompt_id)
+        sampling = record.sampling
+        self._add(
+            "prompts",
+            PROMPT_COLUMNS,
+            row,
+            (
+                record.prompt_id,
+                json.dumps(record.prompt, ensure_ascii=False),
+                json.dumps(asdict(sampling)) if sampling is not None else "",
+                record.duplicate_of or "",
+            ),
+        )
+        roles = ((_BASE, [record.base]), (_MIXED, record.mixed), (_SELF, record.self_moa))
+        for role, candidates in roles:
+            for position, cand in enumerate(candidates):
+                self._add(
+                    f"candidates/{cand.model_name}",
+                    CANDIDATE_COLUMNS,
+                    row,
+                    (
+                        row,
+                        role,
+                        position,
+                        cand.sample_index,
+                        self._code(cand.final_answer),
+                        cand.confidence,
+                        -1 if cand.is_correct is None else int(cand.is_correct),
+                        cand.text,
+                        json.dumps(cand.metadata, ensure_ascii=False) if cand.metadata else "",
+                    ),
+                )
+        results = {
+            MIXED_MOA: record.mixed_result,
+            SELF_MOA: record.self_result,
+            SELF_MOA_SEQ: record.seq_result,
+        }
+        for strategy in STRATEGIES:
+            result = results.get(strategy)
+            if result is None:
+                # The baseline is a single sample; keep its row so strategies line up.
+                answer = record.base.final_answer
+                values: Tuple[Any, ...] = (answer, 0, strategy, "", "", "")
+            else:
+                answer = result.final_answer
+                values = (
+                    answer,
+                    int(result.partial),
+                    result.strategy,
+                    json.dumps(result.supporting_models, ensure_ascii=False),
+                    json.dumps(list(result.vote_counts.items()), ensure_ascii=False),
+                    result.rationale,
+                )
+            correct = int(exact_match(answer, record.reference))
+            self._add(
+                f"results/{strategy}",
+                RESULT_COLUMNS,
+                row,
+                (self._code(answer), correct) + values[1:],
+            )
+
+    def close(self) -> None:
+        for table in self._tables.values():
+            table.flush(self._handle, self.level)
+        buckets: List[List[Tuple[str, int]]] = [
+            [] for _ in range(max(1, -(-self._prompts // self.chunk_rows)))
+        ]
+        for row, prompt_id in enumerate(self._prompt_ids):
+            buckets[_bucket(prompt_id, len(buckets))].append((prompt_id, row))
+        prompt_index = []
+        for bucket in buckets:
+            payload = _encode("str", bucket, self.level)
+            prompt_index.append([self._handle.tell(), len(payload)])
+            self._handle.write(payload)
+        footer = {
+            "version": ARCHIVE_VERSION,
+            "run_id": self.run_id,
+            "created_ns": self.created_ns,
+            "metadata": self.metadata,
+            "prompts": self._prompts,
+            "answers": list(self._answers),
+            "tables": {name: table.meta for name, table in self._tables.items()},
+            "prompt_index": prompt_index,
+        }
+        payload = zlib.compress(json.dumps(footer, ensure_ascii=False).encode("utf-8"), self.level)
+        self._handle.write(payload)
+        self._handle.write(_TRAILER.pack(len(payload), ARCHIVE_MAGIC))
+        self._handle.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._handle.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _code(self, answer: str) -> int:
+        return self._answers.setdefault(answer, len(self._answers))
+
+    def _add(
+        self, name: str, columns: Dict[str, str], prompt: int, values: Tuple[Any, ...]
+    ) -> None:
+        table = self._tables.get(name)
+        if table is None:
+            table = self._tables[name] = _TableWriter(columns)
+        table.rows.append(values)
+        table.prompts.append(prompt)
+        if len(table.rows) >= self.chunk_rows:
+            table.flush(self._handle, self.level)
+
+
+class RunArchive:
+    """Read side of an archive written by :class:`ArchiveWriter`.
+
+    Opening reads only the footer. :meth:`column` decompresses just the
+    chunks overlapping the requested rows, and :meth:`records` rebuilds
+    :class:`PromptRecord` objects one prompt chunk at a time.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            if handle.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+                raise ValueError(f"{self.path} is not a run archive")
+            handle.seek(-_TRAILER.size, os.SEEK_END)
+            length, magic = _TRAILER.unpack(handle.read(_TRAILER.size))
+            if magic != ARCHIVE_MAGIC:
+                raise ValueError(f"{self.path} is truncated")
+            handle.seek(-_TRAILER.size - length, os.SEEK_END)
+            footer = json.loads(zlib.decompress(handle.read(length)))
+        if footer["version"] != ARCHIVE_VERSION:
+            raise ValueError(f"{self.path} has unsupported archive version {footer['version']}")
+        self.run_id: str = footer["run_id"]
+        self.created_ns: int = footer["created_ns"]
+        self.metadata: Dict[str, Any] = footer["metadata"]
+        self.answers: List[str] = footer["answers"]
+        self._prompts: int = footer["prompts"]
+        self._tables: Dict[str, Dict[str, Any]] = footer["tables"]
+        self._prompt_index: Optional[List[List[int]]] = footer.get("prompt_index")
+        self._prompt_rows: Dict[int, Dict[str, int]] = {}
+        self._handle: Optional[BinaryIO] = None
+
+    def __len__(self) -> int:
+        return self._prompts
+
+    @property
+    def models(self) -> List[str]:
+        return [name.split("/", 1)[1] for name in self._tables if name.startswith("candidates/")]
+
+    @property
+    def strategies(self) -> List[str]:
+        return [name.split("/", 1)[1] for name in self._tables if name.startswith("results/")]
+
+    def column(
+        self, table: str, name: str, start: int = 0, stop: Optional[int] = None
+    ) -> List[Any]:
+        """Values of one column for rows ``[start, stop)`` of ``table``."""
+        meta = self._tables[table]
+        kind = meta["columns"][name]
+        stop = meta["rows"] if stop is None else stop
+        values: List[Any] = []
+        offset = 0
+        for chunk in meta["chunks"]:
+            end = offset + chunk["rows"]
+            if offset < stop and start < end:
+                decoded = self._read(kind, chunk["columns"][name])
+                values.extend(decoded[max(start - offset, 0) : stop - offset])
+            offset = end
+        return values
+
+    def prompt_row(self, prompt_id: str) -> int:
+        """Row of ``prompt_id``, decompressing only its bucket of the prompt index."""
+        if self._prompt_index is None:
+            # Written before archives carried a prompt index: scan the id column once.
+            if not self._prompt_rows:
+                ids = self.column("prompts", "prompt_id")
+                self._prompt_rows[0] = {value: row for row, value in enumerate(ids)}
+            return self._prompt_rows[0][prompt_id]
+        bucket = _bucket(prompt_id, len(self._prompt_index))
+        rows = self._prompt_rows.get(bucket)
+        if rows is None:
+            rows = dict(self._read("str", self._prompt_index[bucket]))
+            self._prompt_rows[bucket] = rows
+        return rows[prompt_id]
+
+    def accuracy(self, strategy: str) -> EvaluationResult:
+        correct = self.column(f"results/{strategy}", "correct")
+        return EvaluationResult(total=len(correct), correct=sum(correct))
+
+    def model_accuracy(self, model: str) -> EvaluationResult:
+        """Exact-match accuracy of every sample ``model`` proposed in this run."""
+        correct = [flag for flag in self.column(f"candidates/{model}", "correct") if flag >= 0]
+        return EvaluationResult(total=len(correct), correct=sum(correct))
+
+    def records(self, *, texts: bool = True) -> Iterator[PromptRecord]:
+        """Rebuild the run's records; ``texts=False`` skips candidate text and metadata."""
+        columns = [name for name in CANDIDATE_COLUMNS if texts or name not in _TEXT_COLUMNS]
+        start = 0
+        for chunk in self._tables["prompts"]["chunks"]:
+            stop = start + chunk["rows"]
+            yield from self._decode_records(start, stop, columns)
+            start = stop
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> "RunArchive":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _read(self, kind: str, location: List[int]) -> List[Any]:
+        if self._handle is None:
+            self._handle = self.path.open("rb")
+        offset, length = location
+        self._handle.seek(offset)
+        return _decode(kind, self._handle.read(length))
+
+    def _decode_records(
+        self, start: int, stop: int, columns: Sequence[str]
+    ) -> Iterator[PromptRecord]:
+        prompts = {name: self.column("prompts", name, start, stop) for name in PROMPT_COLUMNS}
+        ids = prompts["prompt_id"]
+        grouped: List[List[Tuple[int, int, Candidate]]] = [[] for _ in range(stop - start)]
+        for model in self.models:
+            for row in self._candidate_rows(f"candidates/{model}", start, stop, columns):
+                local = row["prompt"] - start
+                metadata = row.get("metadata")
+                cand = Candidate(
+                    prompt_id=ids[local],
+                    model_name=model,
+                    sample_index=row["sample_index"],
+                    text=row.get("text", ""),
+                    final_answer=self.answers[row["answer"]],
+                    confidence=row["confidence"],
+                    is_correct=None if row["correct"] < 0 else bool(row["correct"]),
+                    metadata=json.loads(metadata) if metadata else {},
+                )
+                grouped[local].append((row["role"], row["position"], cand))
+        results = {
+            strategy: {
+                name: self.column(f"results/{strategy}", name, start, stop)
+                for name in RESULT_COLUMNS
+            }
+            for strategy in (MIXED_MOA, SELF_MOA, SELF_MOA_SEQ)
+        }
+
+        def result(strategy: str, local: int) -> AggregationResult:
+            columns = results[strategy]
+            return AggregationResult(
+                prompt_id=ids[local],
+                strategy=columns["label"][local],
+                final_answer=self.answers[columns["answer"][local]],
+                supporting_models=json.loads(columns["supporters"][local]),
+                vote_counts=Counter(dict(json.loads(columns["votes"][local]))),
+                rationale=columns["rationale"][local],
+                partial=bool(columns["partial"][local]),
+            )
+
+        for local, candidates in enumerate(grouped):
+            candidates.sort(key=lambda item: item[:2])
+            by_role: Dict[int, List[Candidate]] = {_BASE: [], _MIXED: [], _SELF: []}
+            for role, _, cand in candidates:
+                by_role[role].append(cand)
+            sampling = prompts["sampling"][local]
+            yield PromptRecord(
+                prompt=json.loads(prompts["prompt"][local]),
+                base=by_role[_BASE][0],
+                mixed=by_role[_MIXED],
+                self_moa=by_role[_SELF],
+                mixed_result=result(MIXED_MOA, local),
+                self_result=result(SELF_MOA, local),
+                seq_result=result(SELF_MOA_SEQ, local),
+                sampling=SamplingReport(**json.loads(sampling)) if sampling else None,
+                duplicate_of=prompts["duplicate_of"][local] or None,
+            )
+
+    def _candidate_rows(
+        self, table: str, start: int, stop: int, columns: Sequence[str]
+    ) -> Iterator[Dict[str, Any]]:
+        """Rows of prompts ``[start, stop)``, decoding only ``columns`` of matching chunks."""
+        meta = self._tables[table]
+        for chunk in meta["chunks"]:
+            low, high = chunk["prompts"]
+            if high < start or low >= stop:
+                continue
+            prompts = self._read(meta["columns"]["prompt"], chunk["columns"]["prompt"])
+            rows = [index for index, prompt in enumerate(prompts) if start <= prompt < stop]
+            if not rows:
+                continue
+            decoded = {"prompt": prompts}
+            for name in columns:
+                if name not in decoded:
+                    decoded[name] = self._read(meta["columns"][name], chunk["columns"][name])
+            for index in rows:
+                yield {name: values[index] for name, values in decoded.items()}
+
+
+@dataclass
+class PromptFlip:
+    prompt_id: str
+    before: str
+    after: str
+    fixed: bool
+
+
+class RunStore:
+    """Directory of run archives with queries that span runs."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def writer(
+        self, *, metadata: Optional[Dict[str, Any]] = None, chunk_rows: int = 4096
+    ) -> ArchiveWriter:
+        now = time.time_ns()
+        run_id = time.strftime("%Y%m%d-%H%M%S", time.localtime(now // 10**9))
+        run_id += f"-{now % 10**9 // 1000:06d}"
+        return ArchiveWriter(
+            self.root / f"{run_id}{ARCHIVE_SUFFIX}",
+            run_id=run_id,
+            metadata=metadata,
+            chunk_rows=chunk_rows,
+        )
+
+    def runs(self, *, last: Optional[int] = None) -> List[RunArchive]:
+        """Archived runs, oldest first; only their footers are read."""
+        archives = sorted(
+            (RunArchive(path) for path in self.root.glob(f"*{ARCHIVE_SUFFIX}")),
+            key=lambda run: (run.created_ns, run.run_id),
+        )
+        return archives[-last:] if last else archives
+
+    def get(self, run_id: str) -> RunArchive:
+        if run_id == "latest":
+            runs = self.runs(last=1)
+            if not runs:
+                raise FileNotFoundError(f"no run archives in {self.root}")
+            return runs[0]
+        path = self.root / f"{run_id}{ARCHIVE_SUFFIX}"
+        if not path.exists():
+            raise FileNotFoundError(f"no run archive {run_id!r} in {self.root}")
+        return RunArchive(path)
+
+    def accuracy_history(
+        self, *, last: int = 20
+    ) -> List[Tuple[str, Dict[str, EvaluationResult]]]:
+        """Per-strategy accuracy of the ``last`` runs, reading one column per strategy."""
+        history = []
+        for run in self.runs(last=last):
+            with run:
+                accuracy = {strategy: run.accuracy(strategy) for strategy in run.strategies}
+            history.append((run.run_id, accuracy))
+        return history
+
+    def prompt_history(self, prompt_id: str, strategy: str) -> List[Tuple[str, str, bool]]:
+        """``(run_id, answer, correct)`` for one prompt in every run that contains it."""
+        history = []
+        table = f"results/{strategy}"
+        for run in self.runs():
+            with run:
+                try:
+                    row = run.prompt_row(prompt_id)
+                except KeyError:
+                    continue
+                (answer,) = run.column(table, "answer", row, row + 1)
+                (correct,) = run.column(table, "correct", row, row + 1)
+                history.append((run.run_id, run.answers[answer], bool(correct)))
+        return history
+
+
+def flipped_prompts(before: RunArchive, after: RunArchive, strategy: str) -> List[PromptFlip]:
+    """Prompts in both runs whose correctness under ``strategy`` changed."""
+    table = f"results/{strategy}"
+    earlier = {
+        prompt_id: (answer, correct)
+        for prompt_id, answer, correct in zip(
+            before.column("prompts", "prompt_id"),
+            before.column(table, "answer"),
+            before.column(table, "correct"),
+        )
+    }
+    flips: List[PromptFlip] = []
+    for prompt_id, answer, correct in zip(
+        after.column("prompts", "prompt_id"),
+        after.column(table, "answer"),
+        after.column(table, "correct"),
+    ):
+        previous = earlier.get(prompt_id)
+        if previous is not None and previous[1] != correct:
+            flips.append(
+                PromptFlip(
+                    prompt_id, before.answers[previous[0]], after.answers[answer], bool(correct)
+                )
+            )
+    return flips
+
+
+__all__ = [
+    "ARCHIVE_MAGIC",
+    "ARCHIVE_SUFFIX",
+    "ARCHIVE_VERSION",
+    "ArchiveWriter",
+    "PromptFlip",
+    "RunArchive",
+    "RunStore",
+    "flipped_prompts",
+]
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import tracing
+from .models import Candidate
+
+CacheKey = Tuple[str, str, str, int, str, str]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+
+def proposer_fingerprint(proposer: Any) -> str:
+    fingerprint = getattr(proposer, "config_fingerprint", None)
+    if callable(fingerprint):
+        return fingerprint()
+    return proposer.name
+
+
+class CandidateCache:
+    """In-memory LRU of candidates backed by an optional on-disk SQLite store.
+
+    The disk tier keeps its payload byte total and access clock in a one-row
+    ``meta`` table, so puts never scan the store. Writes are committed every
+    ``commit_every`` operations and on :meth:`flush`/:meth:`close`; other
+    connections only see entries written before the last commit. Candidates
+    are copied on the way in and out, so callers cannot mutate cached entries.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        max_entries: int = 4096,
+        max_disk_bytes: int = 64 * 1024 * 1024,
+        commit_every: int = 64,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if max_disk_bytes <= 0:
+            raise ValueError("max_disk_bytes must be positive")
+        if commit_every <= 0:
+            raise ValueError("commit_every must be positive")
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.commit_every = commit_every
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[CacheKey, Candidate]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._bytes = 0
+        self._tick = 0
+        self._pending = 0
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path))
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS candidates (
+                    key TEXT PRIMARY KEY,
+                    model_name TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    accessed INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS candidates_model ON candidates (model_name);
+                CREATE INDEX IF NOT EXISTS candidates_accessed ON candidates (accessed);
+                CREATE TABLE IF NOT EXISTS models (
+                    model_name TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    payload_bytes INTEGER NOT NULL,
+                    tick INTEGER NOT NULL
+                );
+                """
+            )
+            row = self._db.execute("SELECT payload_bytes, tick FROM meta").fetchone()
+            if row is None:
+                # Stores written before the meta table existed are summed once.
+                row = self._db.execute(
+                    "SELECT COALESCE(SUM(LENGTH(payload)), 0), COALESCE(MAX(accessed), 0)"
+                    " FROM candidates"
+                ).fetchone()
+                self._db.execute("INSERT INTO meta VALUES (0, ?, ?)", row)
+            self._bytes, self._tick = int(row[0]), int(row[1])
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def get(self, key: CacheKey) -> Optional[Candidate]:
+        cand = self._memory.get(key)
+        if cand is not None:
+            self._memory.move_to_end(key)
+            self.stats.hits += 1
+            self.stats.memory_hits += 1
+            tracing.count("moa_cache_hits_total", model=key[1], tier="memory")
+            return _copy(cand)
+        if self._db is not None:
+            db_key = _encode_key(key)
+            row = self._db.execute(
+                "SELECT payload FROM candidates WHERE key = ?", (db_key,)
+            ).fetchone()
+            if row is not None:
+                self._db.execute(
+                    "UPDATE candidates SET accessed = ? WHERE key = ?",
+                    (self._next_tick(), db_key),
+                )
+                self._wrote()
+                cand = Candidate(**json.loads(row[0]))
+                self._remember(key, cand)
+                self.stats.hits += 1
+                self.stats.disk_hits += 1
+                tracing.count("moa_cache_hits_total", model=key[1], tier="disk")
+                return _copy(cand)
+        self.stats.misses += 1
+        tracing.count("moa_cache_misses_total", model=key[1])
+        return None
+
+    def put(self, key: CacheKey, cand: Candidate) -> None:
+        self._remember(key, _copy(cand))
+        if self._db is None:
+            return
+        db_key = _encode_key(key)
+        payload = json.dumps(asdict(cand))
+        old = self._db.execute(
+            "SELECT LENGTH(payload) FROM candidates WHERE key = ?", (db_key,)
+        ).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO candidates (key, model_name, payload, accessed)"
+            " VALUES (?, ?, ?, ?)",
+            (db_key, key[1], payload, self._next_tick()),
+        )
+        self._bytes += len(payload) - (int(old[0]) if old is not None else 0)
+        self._evict_disk()
+        self._wrote()
+
+    def register_model(self, model_name: str, fingerprint: str) -> None:
+        """Drop cached candidates for ``model_name`` if its config changed."""
+        stale = [key for key in self._memory if key[1] == model_name and key[0] != fingerprint]
+        for key in stale:
+            del self._memory[key]
+        if self._db is None:
+            return
+        row = self._db.execute(
+            "SELECT fingerprint FROM models WHERE model_name = ?", (model_name,)
+        ).fetchone()
+        if row is not None and row[0] != fingerprint:
+            self._delete_model(model_name)
+        self._db.execute(
+            "INSERT OR REPLACE INTO models (model_name, fingerprint) VALUES (?, ?)",
+            (model_name, fingerprint),
+        )
+        self._commit()
+
+    def invalidate(self, model_name: str | None = None) -> None:
+        if model_name is None:
+            self._memory.clear()
+        else:
+            for key in [key for key in self._memory if key[1] == model_name]:
+                del self._memory[key]
+        if self._db is None:
+            return
+        if model_name is None:
+            self._db.execute("DELETE FROM candidates")
+            self._bytes = 0
+            self._save_meta()
+        else:
+            self._delete_model(model_name)
+        self._commit()
+
+    def disk_bytes(self) -> int:
+        return self._bytes if self._db is not None else 0
+
+    def flush(self) -> None:
+        """Commit pending disk writes."""
+        if self._db is not None and self._pending:
+            self._commit()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: CacheKey, cand: Candidate) -> None:
+        self._memory[key] = cand
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _next_tick(self) -> int:
+        self._tick += 1
+        return self._tick
+
+    def _wrote(self) -> None:
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.flush()
+
+    def _commit(self) -> None:
+        assert self._db is not None
+        self._save_meta()
+        self._db.commit()
+        self._pending = 0
+
+    def _save_meta(self) -> None:
+        assert self._db is not None
+        self._db.execute(
+            "UPDATE meta SET payload_bytes = ?, tick = ? WHERE id = 0", (self._bytes, self._tick)
+        )
+
+    def _delete_model(self, model_name: str) -> None:
+        assert self._db is not None
+        row = self._db.execute(
+            "SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM candidates WHERE model_name = ?",
+            (model_name,),
+        ).fetchone()
+        self._db.execute("DELETE FROM candidates WHERE model_name = ?", (model_name,))
+        self._bytes -= int(row[0])
+        self._save_meta()
+
+    def _evict_disk(self) -> None:
+        assert self._db is not None
+        while self._bytes > self.max_disk_bytes:
+            row = self._db.execute(
+                "SELECT key, LENGTH(payload) FROM candidates ORDER BY accessed LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM candidates WHERE key = ?", (row[0],))
+            self.stats.evictions += 1
+            self._bytes -= int(row[1])
+
+
+class CachedProposer:
+    """Wraps any proposer so repeated samples are served from a ``CandidateCache``.
+
+    ``generate_batch`` is cached per sample when the wrapped proposer has it;
+    ``astream`` is not exposed, since a token stream cannot be replayed from a
+    cached candidate.
+    """
+
+    def __init__(self, proposer: Any, cache: CandidateCache) -> None:
+        self.proposer = proposer
+        self.cache = cache
+        self.fingerprint = proposer_fingerprint(proposer)
+        cache.register_model(proposer.name, self.fingerprint)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr in _UNCACHED:
+            raise AttributeError(f"{attr} would bypass the candidate cache")
+        value = getattr(self.proposer, attr)
+        if attr == "generate_batch":
+            return self._generate_batch
+        return value
+
+    @property
+    def name(self) -> str:
+        return self.proposer.name
+
+    def generate(
+        self,
+        *,
+        prompt: Dict[str, str],
+        sample_index: int,
+        temperature: float = 0.7,
+    ) -> Candidate:
+        key = self._key(prompt, sample_index, temperature)
+        cand = self.cache.get(key)
+        if cand is None:
+            cand = self.proposer.generate(
+                prompt=prompt, sample_index=sample_index, temperature=temperature
+            )
+            self.cache.put(key, cand)
+        return cand
+
+    async def agenerate(
+        self,
+        *,
+        prompt: Dict[str, str],
+        sample_index: int,
+        temperature: float = 0.7,
+    ) -> Candidate:
+        key = self._key(prompt, sample_index, temperature)
+        cand = self.cache.get(key)
+        if cand is None:
+            cand = await self.proposer.agenerate(
+                prompt=prompt, sample_index=sample_index, temperature=temperature
+            )
+            self.cache.put(key, cand)
+        return cand
+
+    def _generate_batch(
+        self,
+        prompts: Sequence[Dict[str, str]],
+        sample_indices: Sequence[int],
+        *,
+        temperature: float = 0.7,
+    ) -> List[Candidate]:
+        found: Dict[Tuple[int, int], Candidate] = {}
+        # Prompts missing the same samples share one batch call.
+        missing: Dict[Tuple[int, ...], List[int]] = {}
+        for row, prompt in enumerate(prompts):
+            absent = []
+            for sample_index in sample_indices:
+                cand = self.cache.get(self._key(prompt, sample_index, temperature))
+                if cand is None:
+                    absent.append(sample_index)
+                else:
+                    found[row, sample_index] = cand
+            if absent:
+                missing.setdefault(tuple(absent), []).append(row)
+        for absent, rows in missing.items():
+            generated = self.proposer.generate_batch(
+                [prompts[row] for row in rows], list(absent), temperature=temperature
+            )
+            cands = iter(generated)
+            for row in rows:
+                for sample_index in absent:
+                    cand = next(cands)
+                    self.cache.put(self._key(prompts[row], sample_index, temperature), cand)
+                    found[row, sample_index] = cand
+        return [found[row, index] for row in range(len(prompts)) for index in sample_indices]
+
+    def _key(self, prompt: Dict[str, str], sample_index: int, temperature: float) -> CacheKey:
+        prompt_digest = hashlib.sha256(
+            json.dumps(prompt, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        seed = getattr(self.proposer, "seed", "")
+        return (
+            self.fingerprint,
+            self.proposer.name,
+            f"{prompt['id']}:{prompt_digest}",
+            sample_index,
+            f"{temperature!r}",
+            str(seed),
+        )
+
+
+_UNCACHED = frozenset({"astream"})
+
+
+def _copy(cand: Candidate) -> Candidate:
+    return replace(cand, metadata=dict(cand.metadata))
+
+
+def _encode_key(key: CacheKey) -> str:
+    return json.dumps(list(key))
+
+
+__all__ = ["CacheStats", "CachedProposer", "CandidateCache", "proposer_fingerprint"]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+from . import tracing
+from .aggregation import AggregationResult, aggregate_flat, extract_final_answer
+from .generation import AsyncProposer, GenerationRequest, run_generation
+from .models import Candidate
+
+CASCADE = "Cascade"
+
+
+@dataclass
+class CascadeTier:
+    name: str
+    proposers: Sequence[AsyncProposer]
+    samples: int = 1
+
+    def __post_init__(self) -> None:
+        if not self.proposers:
+            raise ValueError("a cascade tier needs at least one proposer")
+        if self.samples <= 0:
+            raise ValueError("samples must be positive")
+
+    @property
+    def calls_per_prompt(self) -> int:
+        return len(self.proposers) * self.samples
+
+
+@dataclass
+class CascadeOutcome:
+    prompt: Dict[str, str]
+    tier: str
+    candidates: List[Candidate]
+    result: AggregationResult
+
+    @property
+    def prompt_id(self) -> str:
+        return self.prompt["id"]
+
+
+@dataclass
+class CascadeReport:
+    outcomes: List[CascadeOutcome] = field(default_factory=list)
+    tier_calls: Dict[str, int] = field(default_factory=dict)
+    resolved: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.tier_calls.values())
+
+
+def is_settled(candidates: Sequence[Candidate], *, agreement: float, min_confidence: float) -> bool:
+    """Whether a tier's votes are unanimous enough and confident enough to stop."""
+    votes = Counter(extract_final_answer(cand) for cand in candidates)
+    leader, count = votes.most_common(1)[0]
+    supporters = [cand.confidence for cand in candidates if extract_final_answer(cand) == leader]
+    return (
+        count / len(candidates) >= agreement
+        and sum(supporters) / len(supporters) >= min_confidence
+    )
+
+
+def run_cascade(
+    prompts: Sequence[Dict[str, str]],
+    tiers: Sequence[CascadeTier],
+    *,
+    agreement: float = 1.0,
+    min_confidence: float = 0.0,
+    temperature: float = 0.7,
+    max_concurrency: int = 8,
+    strategy_name: str = CASCADE,
+) -> CascadeReport:
+    """Route prompts through ``tiers`` from cheapest to most expensive.
+
+    Every prompt is first answered by the first tier. A prompt escalates to
+    the next tier unless the tier's leading answer holds at least
+    ``agreement`` of its votes and its supporters' mean confidence is at
+    least ``min_confidence``; the last tier always settles. A prompt's result
+    is the majority vote of the tier that settled it, so cheap disagreeing
+    votes never dilute the strong model's. Each tier is one concurrent
+    fan-out over the prompts that reached it. Outcomes keep prompt order.
+    """
+    if not tiers:
+        raise ValueError("run_cascade requires at least one tier")
+    if not 0.0 < agreement <= 1.0:
+        raise ValueError("agreement must be in (0, 1]")
+
+    report = CascadeReport()
+    outcomes: Dict[str, CascadeOutcome] = {}
+    pending = list(prompts)
+    for depth, tier in enumerate(tiers):
+        if not pending:
+            break
+        requests = [
+            GenerationRequest(proposer, prompt, sample_index, temperature)
+            for prompt in pending
+            for proposer in tier.proposers
+            for sample_index in range(tier.samples)
+        ]
+        with tracing.span("cascade.tier", tier=tier.name, prompts=len(pending)):
+            candidates = run_generation(requests, max_concurrency=max_concurrency)
+        report.tier_calls[tier.name] = len(requests)
+        tracing.count("moa_cascade_calls_total", len(requests), tier=tier.name)
+
+        last = depth == len(tiers) - 1
+        escalated: List[Dict[str, str]] = []
+        stride = tier.calls_per_prompt
+        for offset, prompt in zip(range(0, len(candidates), stride), pending):
+            chunk = [cand for cand in candidates[offset : offset + stride] if cand is not None]
+            if not last and not is_settled(
+                chunk, agreement=agreement, min_confidence=min_confidence
+            ):
+                escalated.append(prompt)
+                continue
+            result = aggregate_flat(chunk, strategy_name=f"{strategy_name} ({tier.name})")
+            outcomes[prompt["id"]] = CascadeOutcome(prompt, tier.name, chunk, result)
+            report.resolved[tier.name] = report.resolved.get(tier.name, 0) + 1
+        pending = escalated
+
+    report.outcomes = [outcomes[prompt["id"]] for prompt in prompts]
+    return report
+
+
+__all__ = [
+    "CASCADE",
+    "CascadeOutcome",
+    "CascadeReport",
+    "CascadeTier",
+    "is_settled",
+    "run_cascade",
+]
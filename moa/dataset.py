@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Union, overload
+
+INDEX_MAGIC = b"MOAIDX1\0"
+_HEADER = struct.Struct("<8sQQQ")
+_BLANK = (b" ", b"\t", b"\r")
+
+# A freshly built index, or a zero-copy view of a persisted one.
+_Offsets = Union[array, memoryview]
+
+
+class PromptDataset(Sequence[Dict[str, str]]):
+    """Random-access, lazily parsed view of a prompts JSONL file.
+
+    The file is memory-mapped and a line-offset index is loaded from
+    ``index_path`` (default ``<path>.idx``) or built with one scan and
+    persisted there; the index is rebuilt whenever the file's size or
+    modification time changes. A persisted index is memory-mapped too, and
+    records are parsed on access only, so opening a dataset reads neither
+    file up front.
+    :meth:`shard` returns views that borrow the mapping and index of the
+    dataset they came from: only that dataset's :meth:`close` releases them,
+    and it reopens them lazily if a view is read afterwards. Views pickle as
+    ``(path, index_path, positions)`` and reopen lazily in worker processes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        index_path: Optional[Path] = None,
+        persist_index: bool = True,
+        positions: Optional[range] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.index_path = index_path or self.path.with_name(self.path.name + ".idx")
+        self.persist_index = persist_index
+        self._mmap: Optional[mmap.mmap] = None
+        self._index_map: Optional[mmap.mmap] = None
+        self._offsets: Optional[_Offsets] = None
+        self._positions = positions
+        self._owner = self
+
+    @property
+    def positions(self) -> range:
+        if self._positions is None:
+            self._positions = range(len(self._index()))
+        return self._positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @overload
+    def __getitem__(self, item: int) -> Dict[str, str]:
+        ...
+
+    @overload
+    def __getitem__(self, item: slice) -> "PromptDataset":
+        ...
+
+    def __getitem__(self, item: Any) -> Any:
+        if isinstance(item, slice):
+            return self._view(self.positions[item])
+        return self._parse(self.positions[item])
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for position in self.positions:
+            yield self._parse(position)
+
+    def shard(self, index: int, count: int, *, strided: bool = False) -> "PromptDataset":
+        """The ``index``-th of ``count`` shards: contiguous blocks, or every ``count``-th prompt."""
+        if count <= 0 or not 0 <= index < count:
+            raise ValueError("shard index must be in [0, count)")
+        positions = self.positions
+        if strided:
+            return self._view(positions[index::count])
+        size, extra = divmod(len(positions), count)
+        start = index * size + min(index, extra)
+        return self._view(positions[start : start + size + (index < extra)])
+
+    def close(self) -> None:
+        if self._owner is not self:
+            return
+        if self._index_map is not None:
+            assert isinstance(self._offsets, memoryview)
+            self._offsets.release()
+            self._offsets = None
+            self._index_map.close()
+            self._index_map = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "index_path": self.index_path,
+            "persist_index": self.persist_index,
+            "positions": self.positions,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(  # type: ignore[misc]
+            state["path"],
+            index_path=state["index_path"],
+            persist_index=state["persist_index"],
+            positions=state["positions"],
+        )
+
+    def _view(self, positions: range) -> "PromptDataset":
+        view = PromptDataset(
+            self.path,
+            index_path=self.index_path,
+            persist_index=self.persist_index,
+            positions=positions,
+        )
+        view._owner = self._owner
+        return view
+
+    def _parse(self, position: int) -> Dict[str, str]:
+        data = self._map()
+        start = self._index()[position]
+        end = data.find(b"\n", start)
+        return json.loads(data[start : end if end >= 0 else len(data)])
+
+    def _map(self) -> mmap.mmap:
+        if self._owner is not self:
+            return self._owner._map()
+        if self._mmap is None:
+            with self.path.open("rb") as handle:
+                if os.fstat(handle.fileno()).st_size == 0:
+                    raise ValueError(f"{self.path} is empty")
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _index(self) -> _Offsets:
+        if self._owner is not self:
+            return self._owner._index()
+        if self._offsets is None:
+            stat = self.path.stat()
+            self._offsets = self._load_index(stat)
+            if self._offsets is None:
+                self._offsets = self._build_index() if stat.st_size else array("Q")
+                if self.persist_index:
+                    self._save_index(stat)
+        return self._offsets
+
+    def _build_index(self) -> array:
+        data = self._map()
+        offsets = array("Q")
+        start = 0
+        size = len(data)
+        while start < size:
+            end = data.find(b"\n", start)
+            if end < 0:
+                end = size
+            if end > start and (data[start : start + 1] not in _BLANK or data[start:end].strip()):
+                offsets.append(start)
+            start = end + 1
+        return offsets
+
+    def _load_index(self, stat: os.stat_result) -> Optional[memoryview]:
+        try:
+            with self.index_path.open("rb") as handle:
+                index_map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            magic, size, mtime_ns, count = _HEADER.unpack_from(index_map)
+        except struct.error:
+            index_map.close()
+            return None
+        end = _HEADER.size + count * 8
+        if (magic, size, mtime_ns) != (INDEX_MAGIC, stat.st_size, stat.st_mtime_ns) or (
+            len(index_map) < end
+        ):
+            index_map.close()
+            return None
+        self._index_map = index_map
+        return memoryview(index_map)[_HEADER.size : end].cast("Q")
+
+    def _save_index(self, stat: os.stat_result) -> None:
+        assert self._offsets is not None
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with tmp_path.open("wb") as handle:
+            header = _HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(self._offsets))
+            handle.write(header)
+            self._offsets.tofile(handle)
+        os.replace(tmp_path, self.index_path)
+
+
+__all__ = ["INDEX_MAGIC", "PromptDataset"]
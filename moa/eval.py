@@ -15,6 +15,9 @@ class EvaluationResult:
             return 0.0
         return self.correct / self.total
 
+    def __add__(self, other: "EvaluationResult") -> "EvaluationResult":
+        return EvaluationResult(total=self.total + other.total, correct=self.correct + other.correct)
+
 
 def normalize_answer(answer: str) -> str:
     return answer.strip().lower()
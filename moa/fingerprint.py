@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def normalize_question(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def exact_fingerprint(prompt: Dict[str, str]) -> str:
+    return _digest(normalize_question(prompt["question"]))
+
+
+def _digest(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+@dataclass
+class DuplicateMatch:
+    canonical_id: str
+    kind: str
+    similarity: float
+
+
+@dataclass
+class IndexStats:
+    prompts: int = 0
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+
+    @property
+    def duplicates(self) -> int:
+        return self.exact_duplicates + self.near_duplicates
+
+    @property
+    def dedup_ratio(self) -> float:
+        if self.prompts == 0:
+            return 0.0
+        return self.duplicates / self.prompts
+
+
+class PromptIndex:
+    """Finds prompts whose question duplicates one seen earlier.
+
+    Exact duplicates share a hash of the normalized question. Near
+    duplicates are found with MinHash over word ``shingle``-grams and
+    banded LSH, then confirmed when the estimated Jaccard similarity reaches
+    ``threshold`` and both questions contain the same numbers, so "12 pages"
+    never matches "13 pages". Values attached to a canonical prompt (e.g. its
+    evaluated record) can be looked up for every duplicate; with
+    ``max_attached`` only that many are kept, least recently used evicted first.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle: int = 3,
+        seed: int = 1,
+        max_attached: Optional[int] = None,
+    ) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_perm <= 0 or bands <= 0 or num_perm % bands:
+            raise ValueError("num_perm must be a positive multiple of bands")
+        if shingle <= 0:
+            raise ValueError("shingle must be positive")
+        if max_attached is not None and max_attached <= 0:
+            raise ValueError("max_attached must be positive")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle = shingle
+        self.max_attached = max_attached
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self.stats = IndexStats()
+        self._exact: Dict[str, str] = {}
+        self._buckets: List[Dict[Tuple[int, ...], List[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, Tuple[Tuple[int, ...], Tuple[str, ...]]] = {}
+        self._rank: Dict[str, int] = {}
+        self._attached: "OrderedDict[str, Any]" = OrderedDict()
+
+    def match(self, prompt: Dict[str, str]) -> Optional[DuplicateMatch]:
+        """Return the earlier prompt this one duplicates, or register it as canonical."""
+        self.stats.prompts += 1
+        normalized = normalize_question(prompt["question"])
+        digest = _digest(normalized)
+        canonical = self._exact.get(digest)
+        if canonical is not None:
+            self.stats.exact_duplicates += 1
+            return DuplicateMatch(canonical, "exact", 1.0)
+
+        signature = self.signature(normalized)
+        numbers = tuple(sorted(_NUMBER.findall(normalized)))
+        best: Optional[DuplicateMatch] = None
+        for seen in self._candidates(signature):
+            other_signature, other_numbers = self._signatures[seen]
+            if other_numbers != numbers:
+                continue
+            similarity = sum(a == b for a, b in zip(signature, other_signature)) / len(signature)
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = DuplicateMatch(seen, "near", similarity)
+        if best is not None:
+            self.stats.near_duplicates += 1
+            return best
+
+        prompt_id = prompt["id"]
+        self._exact[digest] = prompt_id
+        self._signatures[prompt_id] = (signature, numbers)
+        self._rank[prompt_id] = len(self._rank)
+        for band, buckets in enumerate(self._buckets):
+            buckets.setdefault(self._band(signature, band), []).append(prompt_id)
+        return None
+
+    def signature(self, normalized: str) -> Tuple[int, ...]:
+        words = normalized.split()
+        size = min(self.shingle, max(len(words), 1))
+        shingles = {" ".join(words[i : i + size]) for i in range(max(len(words) - size + 1, 1))}
+        hashes = [_hash64(token) for token in shingles]
+        return tuple(
+            min((a * value + b) % _MERSENNE_PRIME for value in hashes) for a, b in self._perms
+        )
+
+    def attach(self, prompt_id: str, value: Any) -> None:
+        self._attached[prompt_id] = value
+        self._attached.move_to_end(prompt_id)
+        if self.max_attached is not None and len(self._attached) > self.max_attached:
+            self._attached.popitem(last=False)
+
+    def attached(self, prompt_id: str) -> Any:
+        """The value attached to ``prompt_id``, or ``None`` if it was evicted."""
+        if prompt_id not in self._attached:
+            return None
+        self._attached.move_to_end(prompt_id)
+        return self._attached[prompt_id]
+
+    def _band(self, signature: Tuple[int, ...], band: int) -> Tuple[int, ...]:
+        return signature[band * self.rows : (band + 1) * self.rows]
+
+    def _candidates(self, signature: Tuple[int, ...]) -> List[str]:
+        found: Set[str] = set()
+        for band, buckets in enumerate(self._buckets):
+            found.update(buckets.get(self._band(signature, band), ()))
+        # Prefer the earliest registered prompt when similarities tie.
+        return sorted(found, key=self._rank.__getitem__)
+
+
+__all__ = [
+    "DuplicateMatch",
+    "IndexStats",
+    "PromptIndex",
+    "exact_fingerprint",
+    "normalize_question",
+]
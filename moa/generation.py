@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    TypeVar,
+    runtime_checkable,
+)
+
+from .models import Candidate
+
+_T = TypeVar("_T")
+
+
+@runtime_checkable
+class AsyncProposer(Protocol):
+    """Proposer that can be awaited for a single sample."""
+
+    name: str
+
+    async def agenerate(
+        self,
+        *,
+        prompt: Dict[str, str],
+        sample_index: int,
+        temperature: float = 0.7,
+    ) -> Candidate:
+        ...
+
+
+@dataclass
+class GenerationRequest:
+    proposer: AsyncProposer
+    prompt: Dict[str, str]
+    sample_index: int
+    temperature: float = 0.7
+    deadline_s: Optional[float] = None
+
+    @property
+    def prompt_id(self) -> str:
+        return self.prompt["id"]
+
+
+@dataclass
+class HedgePolicy:
+    """When to send a duplicate of a slow proposer call.
+
+    A hedge goes out once a call has been running longer than the
+    ``percentile`` of that model's recently observed latencies; until
+    ``min_observations`` latencies are known, ``initial_delay_s`` is used
+    (``None`` disables hedging during warm-up).
+    """
+
+    percentile: float = 0.95
+    min_observations: int = 16
+    initial_delay_s: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.percentile < 1.0:
+            raise ValueError("percentile must be in (0, 1)")
+        if self.min_observations <= 0:
+            raise ValueError("min_observations must be positive")
+
+
+@dataclass
+class GenerationStats:
+    """Call counters plus a sliding window of latencies per model."""
+
+    window: int = 256
+    calls: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    deadline_misses: int = 0
+    latencies: Dict[str, Deque[float]] = field(default_factory=dict)
+
+    def observe(self, model_name: str, latency: float) -> None:
+        observed = self.latencies.get(model_name)
+        if observed is None:
+            observed = self.latencies[model_name] = deque(maxlen=self.window)
+        observed.append(latency)
+
+    def latency_quantile(self, model_name: str, quantile: float) -> Optional[float]:
+        observed = self.latencies.get(model_name)
+        if not observed:
+            return None
+        ordered = sorted(observed)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+def fan_out(
+    prompts: Sequence[Dict[str, str]],
+    proposers: Sequence[AsyncProposer],
+    *,
+    samples: int,
+    temperature: float = 0.7,
+) -> List[GenerationRequest]:
+    """Expand prompts x proposers x samples into requests in that nesting order."""
+    if samples <= 0:
+        raise ValueError("samples must be positive")
+    return [
+        GenerationRequest(
+            proposer=proposer,
+            prompt=prompt,
+            sample_index=sample_index,
+            temperature=temperature,
+        )
+        for prompt in prompts
+        for proposer in proposers
+        for sample_index in range(samples)
+    ]
+
+
+async def generate_all(
+    requests: Sequence[GenerationRequest],
+    *,
+    max_concurrency: int = 8,
+    per_model_limits: Optional[Mapping[str, int]] = None,
+    hedge: Optional[HedgePolicy] = None,
+    stats: Optional[GenerationStats] = None,
+) -> List[Optional[Candidate]]:
+    """Run requests concurrently; candidates come back in request order.
+
+    With ``hedge`` a straggling call is duplicated and the first response
+    wins; the duplicate waits for its own slot under ``max_concurrency`` and
+    the per-model limits, since it is a real call against the model's quota.
+    Its primary holds one of those slots, so under a limit of 1 the hedge
+    cannot start before the primary finishes and hedging has no effect. A
+    request with ``deadline_s`` yields ``None`` if it has not completed that
+    many seconds after its prompt's first request started.
+    """
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be positive")
+    limits = dict(per_model_limits or {})
+    for name, limit in limits.items():
+        if limit <= 0:
+            raise ValueError(f"per-model limit for {name!r} must be positive")
+
+    stats = stats if stats is not None else GenerationStats()
+    loop = asyncio.get_running_loop()
+    global_gate = asyncio.Semaphore(max_concurrency)
+    model_gates = {name: asyncio.Semaphore(limit) for name, limit in limits.items()}
+    prompt_started: Dict[str, float] = {}
+
+    async def in_slot(request: GenerationRequest, work: Callable[[], Awaitable[_T]]) -> _T:
+        model_gate = model_gates.get(request.proposer.name)
+        if model_gate is None:
+            async with global_gate:
+                return await work()
+        async with model_gate:
+            async with global_gate:
+                return await work()
+
+    async def slotted_call(request: GenerationRequest) -> Candidate:
+        return await in_slot(request, lambda: _call(request))
+
+    async def run_gated(request: GenerationRequest) -> Optional[Candidate]:
+        started = prompt_started.setdefault(request.prompt_id, loop.time())
+        if hedge is None:
+            call = _timed_call(request, stats)
+        else:
+            call = _hedged_call(request, hedge, stats, slotted_call)
+        if request.deadline_s is None:
+            return await call
+        remaining = started + request.deadline_s - loop.time()
+        try:
+            if remaining <= 0:
+                call.close()
+                raise asyncio.TimeoutError
+            return await asyncio.wait_for(call, remaining)
+        except asyncio.TimeoutError:
+            stats.deadline_misses += 1
+            return None
+
+    async def run_one(request: GenerationRequest) -> Optional[Candidate]:
+        return await in_slot(request, lambda: run_gated(request))
+
+    return list(await asyncio.gather(*(run_one(request) for request in requests)))
+
+
+def run_generation(
+    requests: Sequence[GenerationRequest],
+    *,
+    max_concurrency: int = 8,
+    per_model_limits: Optional[Mapping[str, int]] = None,
+    hedge: Optional[HedgePolicy] = None,
+    stats: Optional[GenerationStats] = None,
+) -> List[Optional[Candidate]]:
+    """Synchronous entry point around :func:`generate_all`."""
+    return asyncio.run(
+        generate_all(
+            requests,
+            max_concurrency=max_concurrency,
+            per_model_limits=per_model_limits,
+            hedge=hedge,
+            stats=stats,
+        )
+    )
+
+
+async def _call(request: GenerationRequest) -> Candidate:
+    return await request.proposer.agenerate(
+        prompt=request.prompt,
+        sample_index=request.sample_index,
+        temperature=request.temperature,
+    )
+
+
+async def _timed_call(request: GenerationRequest, stats: GenerationStats) -> Candidate:
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    stats.calls += 1
+    cand = await _call(request)
+    stats.observe(request.proposer.name, loop.time() - started)
+    return cand
+
+
+async def _hedged_call(
+    request: GenerationRequest,
+    policy: HedgePolicy,
+    stats: GenerationStats,
+    hedge_call: Callable[[GenerationRequest], Awaitable[Candidate]],
+) -> Candidate:
+    loop = asyncio.get_running_loop()
+    name = request.proposer.name
+    delay = policy.initial_delay_s
+    if len(stats.latencies.get(name, ())) >= policy.min_observations:
+        delay = stats.latency_quantile(name, policy.percentile)
+
+    started = loop.time()
+    stats.calls += 1
+    primary = loop.create_task(_call(request))
+    attempts: Set["asyncio.Task[Candidate]"] = {primary}
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done:
+                stats.calls += 1
+                stats.hedges += 1
+                attempts.add(loop.create_task(hedge_call(request)))
+        error: Optional[BaseException] = None
+        while attempts:
+            done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+            # Only the primary's own completion time feeds the threshold; a hedge
+            # win says nothing about the primary and would drag the percentile down.
+            if primary in done and primary.exception() is None:
+                stats.observe(name, loop.time() - started)
+            for task in sorted(done, key=lambda task: task is not primary):
+                if task.exception() is None:
+                    if task is not primary:
+                        stats.hedge_wins += 1
+                    return task.result()
+                error = task.exception()
+        assert error is not None
+        raise error
+    finally:
+        for task in attempts:
+            task.cancel()
+
+
+__all__ = [
+    "AsyncProposer",
+    "GenerationRequest",
+    "GenerationStats",
+    "HedgePolicy",
+    "fan_out",
+    "generate_all",
+    "run_generation",
+]
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import json
+import queue
+import random
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from .models import Candidate
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class ProposerHTTPError(RuntimeError):
+    """Raised when a proposer endpoint keeps failing after all retries."""
+
+    def __init__(self, message: str, *, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 4
+    backoff_s: float = 0.05
+    max_backoff_s: float = 2.0
+    jitter: float = 0.5
+
+    def delay(self, attempt: int, rng: random.Random) -> float:
+        base = min(self.max_backoff_s, self.backoff_s * 2**attempt)
+        return base * (1.0 - self.jitter * rng.random())
+
+
+class _ConnectionPool:
+    """Keep-alive ``HTTPConnection`` pool; connections are reused LIFO."""
+
+    def __init__(
+        self, host: str, port: int, *, size: int, connect_timeout: float, read_timeout: float
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.created = 0
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._slots.put(None)
+
+    def acquire(self) -> http.client.HTTPConnection:
+        self._slots.get()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.connect_timeout)
+            conn.connect()
+            assert conn.sock is not None
+            conn.sock.settimeout(self.read_timeout)
+            conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.created += 1
+            return conn
+
+    def release(self, conn: http.client.HTTPConnection, *, reusable: bool) -> None:
+        if reusable:
+            self._idle.put(conn)
+        else:
+            conn.close()
+        self._slots.put(None)
+
+    def discard_slot(self) -> None:
+        self._slots.put(None)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class HttpProposer:
+    """Proposer backed by an HTTP endpoint speaking the ``MockModelServer`` protocol.
+
+    Requests reuse pooled keep-alive connections, are retried with
+    exponential backoff and jitter on connection errors and retryable status
+    codes, and can be issued concurrently via :meth:`generate_many` or
+    awaited through :meth:`agenerate`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        *,
+        pool_size: int = 8,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 30.0,
+        retry: Optional[RetryPolicy] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if pool_size <= 0:
+            raise ValueError("pool_size must be positive")
+        parts = urlsplit(base_url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError("base_url must look like http://host:port")
+        self.name = name
+        self.base_path = parts.path.rstrip("/")
+        self.retry = retry or RetryPolicy()
+        self.retries = 0
+        self._rng = random.Random(seed)
+        self._pool = _ConnectionPool(
+            parts.hostname,
+            parts.port or 80,
+            size=pool_size,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix=name)
+
+    @property
+    def connections_opened(self) -> int:
+        return self._pool.created
+
+    def generate(
+        self,
+        *,
+        prompt: Dict[str, str],
+        sample_index: int,
+        temperature: float = 0.7,
+    ) -> Candidate:
+        payload = self._post(
+            "/v1/generate",
+            {
+                "model": self.name,
+                "prompt": prompt,
+                "sample_index": sample_index,
+                "temperature": temperature,
+            },
+        )
+        return Candidate(**payload)
+
+    def generate_batch(
+        self,
+        prompts: Sequence[Dict[str, str]],
+        sample_indices: Sequence[int],
+        *,
+        temperature: float = 0.7,
+    ) -> List[Candidate]:
+        payload = self._post(
+            "/v1/generate_batch",
+            {
+                "model": self.name,
+                "prompts": list(prompts),
+                "sample_indices": list(sample_indices),
+                "temperature": temperature,
+            },
+        )
+        return [Candidate(**item) for item in payload["candidates"]]
+
+    def generate_many(
+        self,
+        prompts: Sequence[Dict[str, str]],
+        sample_indices: Sequence[int],
+        *,
+        temperature: float = 0.7,
+    ) -> List[Candidate]:
+        """Issue one request per (prompt, sample) concurrently; results are prompt-major."""
+        futures = [
+            self._executor.submit(
+                self.generate, prompt=prompt, sample_index=index, temperature=temperature
+            )
+            for prompt in prompts
+            for index in sample_indices
+        ]
+        return [future.result() for future in futures]
+
+    async def agenerate(
+        self,
+        *,
+        prompt: Dict[str, str],
+        sample_index: int,
+        temperature: float = 0.7,
+    ) -> Candidate:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            lambda: self.generate(prompt=prompt, sample_index=sample_index, temperature=temperature),
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._pool.close()
+
+    def __enter__(self) -> "HttpProposer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _post(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        data = json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        last_error: Optional[ProposerHTTPError] = None
+        for attempt in range(self.retry.max_attempts):
+            if attempt:
+                self.retries += 1
+                time.sleep(self.retry.delay(attempt - 1, self._rng))
+            try:
+                conn = self._pool.acquire()
+            except OSError as exc:
+                self._pool.discard_slot()
+                last_error = ProposerHTTPError(f"connect failed: {exc}")
+                continue
+            try:
+                conn.request("POST", self.base_path + path, body=data, headers=headers)
+                response = conn.getresponse()
+                raw = response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                self._pool.release(conn, reusable=False)
+                last_error = ProposerHTTPError(f"request failed: {exc}")
+                continue
+            self._pool.release(conn, reusable=not response.will_close)
+            if response.status == 200:
+                return json.loads(raw)
+            message = f"{self.name} returned HTTP {response.status}: {raw[:200]!r}"
+            if response.status not in RETRYABLE_STATUS:
+                raise ProposerHTTPError(message, status=response.status)
+            last_error = ProposerHTTPError(message, status=response.status)
+        assert last_error is not None
+        raise last_error
+
+
+__all__ = ["HttpProposer", "ProposerHTTPError", "RetryPolicy"]
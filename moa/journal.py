@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set
+
+from .aggregation import AggregationResult
+from .models import Candidate
+from .runner import PromptRecord, RunConfig
+from .sampling import SamplingReport
+
+JOURNAL_VERSION = 1
+
+
+class JournalMismatchError(ValueError):
+    """Raised when resuming a journal written with a different run configuration."""
+
+
+class RunJournal:
+    """Append-only JSONL log of finished prompts for checkpointed runs.
+
+    The first line is a header holding the :class:`RunConfig`; every further
+    line is one :class:`PromptRecord`, flushed (and by default fsynced) as soon
+    as it is appended. Opening with ``resume=True`` keeps the existing records,
+    drops a torn trailing line left by a crash and refuses a journal whose
+    configuration differs; otherwise the file is started afresh.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        config: RunConfig,
+        resume: bool = False,
+        fsync: bool = True,
+    ) -> None:
+        self.path = path
+        self.config = config
+        self.fsync = fsync
+        self.completed: Set[str] = set()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {"type": "header", "version": JOURNAL_VERSION, "config": asdict(config)}
+        if resume and path.exists() and path.stat().st_size:
+            self._recover(header)
+            self._handle = path.open("a", encoding="utf-8")
+        else:
+            self._handle = path.open("w", encoding="utf-8")
+            self._write(header)
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def append(self, record: PromptRecord) -> None:
+        self._write({"type": "prompt", "record": encode_record(record)})
+        self.completed.add(record.prompt_id)
+
+    def records(self) -> Iterator[PromptRecord]:
+        """Stream every journaled record back from disk in the order appended."""
+        self._handle.flush()
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                entry = json.loads(line)
+                if entry["type"] == "prompt":
+                    yield decode_record(entry["record"])
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._handle.flush()
+        if self.fsync:
+            os.fsync(self._handle.fileno())
+
+    def _recover(self, header: Dict[str, Any]) -> None:
+        valid_bytes = 0
+        with self.path.open("rb") as handle:
+            for raw in handle:
+                try:
+                    if not raw.endswith(b"\n"):
+                        raise ValueError("torn line")
+                    entry = json.loads(raw)
+                except ValueError:
+                    break
+                if entry["type"] == "header":
+                    if entry != header:
+                        raise JournalMismatchError(
+                            f"{self.path} was written with config {entry.get('config')},"
+                            f" not {header['config']}"
+                        )
+                else:
+                    self.completed.add(entry["record"]["prompt"]["id"])
+                valid_bytes += len(raw)
+        if valid_bytes == 0:
+            raise JournalMismatchError(f"{self.path} has no readable header")
+        os.truncate(self.path, valid_bytes)
+
+
+def encode_record(record: PromptRecord) -> Dict[str, Any]:
+    return {
+        "prompt": record.prompt,
+        "base": asdict(record.base),
+        "mixed": [asdict(cand) for cand in record.mixed],
+        "self_moa": [asdict(cand) for cand in record.self_moa],
+        "mixed_result": _encode_result(record.mixed_result),
+        "self_result": _encode_result(record.self_result),
+        "seq_result": _encode_result(record.seq_result),
+        "sampling": asdict(record.sampling) if record.sampling is not None else None,
+        "duplicate_of": record.duplicate_of,
+    }
+
+
+def decode_record(data: Dict[str, Any]) -> PromptRecord:
+    sampling: Optional[Dict[str, Any]] = data["sampling"]
+    return PromptRecord(
+        prompt=data["prompt"],
+        base=Candidate(**data["base"]),
+        mixed=[Candidate(**cand) for cand in data["mixed"]],
+        self_moa=[Candidate(**cand) for cand in data["self_moa"]],
+        mixed_result=_decode_result(data["mixed_result"]),
+        self_result=_decode_result(data["self_result"]),
+        seq_result=_decode_result(data["seq_result"]),
+        sampling=SamplingReport(**sampling) if sampling is not None else None,
+        duplicate_of=data.get("duplicate_of"),
+    )
+
+
+def _encode_result(result: AggregationResult) -> Dict[str, Any]:
+    encoded = asdict(result)
+    # Counter order breaks ties and orders the rationale, so keep it explicit.
+    encoded["vote_counts"] = list(result.vote_counts.items())
+    return encoded
+
+
+def _decode_result(data: Dict[str, Any]) -> AggregationResult:
+    fields = dict(data)
+    fields["vote_counts"] = Counter(dict(fields["vote_counts"]))
+    return AggregationResult(**fields)
+
+
+__all__ = [
+    "JOURNAL_VERSION",
+    "JournalMismatchError",
+    "RunJournal",
+    "decode_record",
+    "encode_record",
+]
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from . import tracing
+from .aggregation import AggregationResult, aggregate_flat
+from .generation import AsyncProposer
+from .models import Candidate
+
+COMPONENTS = ("total", "queued", "generation", "aggregation")
+
+
+def poisson_arrivals(rate: float, count: int, *, seed: int = 0) -> List[float]:
+    """Arrival offsets in seconds of a Poisson process with ``rate`` prompts/s."""
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    if count < 0:
+        raise ValueError("count must be non-negative")
+    rng = random.Random(seed)
+    offsets: List[float] = []
+    now = 0.0
+    for _ in range(count):
+        now += rng.expovariate(rate)
+        offsets.append(now)
+    return offsets
+
+
+def load_trace(path: Path) -> List[float]:
+    """Arrival offsets replayed from a trace, relative to its first arrival.
+
+    Each non-blank line is either a timestamp in seconds or a JSON object
+    with an ``arrival_s`` field; lines starting with ``#`` are skipped.
+    """
+    stamps: List[float] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                stamps.append(float(json.loads(line)["arrival_s"]))
+            else:
+                stamps.append(float(line))
+    stamps.sort()
+    return [stamp - stamps[0] for stamp in stamps]
+
+
+def scale_arrivals(offsets: Sequence[float], rate: float) -> List[float]:
+    """Stretch or compress a trace so it arrives at ``rate`` prompts/s on average."""
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    if len(offsets) < 2 or offsets[-1] <= 0:
+        return list(offsets)
+    factor = (len(offsets) - 1) / (rate * offsets[-1])
+    return [offset * factor for offset in offsets]
+
+
+@dataclass
+class PromptTiming:
+    """Where one prompt's end-to-end latency went.
+
+    ``queued_s`` runs from arrival until its first proposer call got a slot,
+    ``generation_s`` from then until its last sample arrived (including
+    samples that waited behind other prompts), and ``aggregation_s`` covers
+    the vote.
+    """
+
+    prompt_id: str
+    arrival_s: float
+    queued_s: float
+    generation_s: float
+    aggregation_s: float
+
+    @property
+    def total_s(self) -> float:
+        return self.queued_s + self.generation_s + self.aggregation_s
+
+
+@dataclass
+class LoadReport:
+    offered_rate: float
+    timings: List[PromptTiming] = field(default_factory=list)
+    results: List[AggregationResult] = field(default_factory=list)
+    arrival_span_s: float = 0.0
+    duration_s: float = 0.0
+
+    @property
+    def arrival_rate(self) -> float:
+        """Rate the replayed arrivals actually had, which varies around ``offered_rate``."""
+        if self.arrival_span_s <= 0:
+            return self.offered_rate
+        return (len(self.timings) - 1) / self.arrival_span_s
+
+    @property
+    def achieved_rate(self) -> float:
+        if self.duration_s <= 0:
+            return 0.0
+        return len(self.timings) / self.duration_s
+
+    def latency_quantile(self, quantile: float, component: str = "total") -> float:
+        if component not in COMPONENTS:
+            raise ValueError(f"component must be one of {COMPONENTS}")
+        values = sorted(getattr(timing, f"{component}_s") for timing in self.timings)
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(round(quantile * (len(values) - 1))))]
+
+    def slo_attainment(self, slo_s: float) -> float:
+        """Fraction of prompts whose end-to-end latency met ``slo_s``."""
+        if not self.timings:
+            return 0.0
+        return sum(timing.total_s <= slo_s for timing in self.timings) / len(self.timings)
+
+    def saturated(self, *, slo_s: Optional[float] = None, percentile: float = 0.99) -> bool:
+        """Whether throughput fell behind the arrivals or the SLO percentile was missed."""
+        if self.achieved_rate < 0.9 * self.arrival_rate:
+            return True
+        return slo_s is not None and self.latency_quantile(percentile) > slo_s
+
+
+async def drive_load(
+    prompts: Sequence[Dict[str, str]],
+    proposers: Sequence[AsyncProposer],
+    arrivals: Sequence[float],
+    *,
+    samples: int = 1,
+    temperature: float = 0.7,
+    max_concurrency: int = 8,
+    strategy_name: str = "Self-MoA (majority)",
+    offered_rate: Optional[float] = None,
+) -> LoadReport:
+    """Replay ``arrivals`` open loop against the generation-plus-aggregation path.
+
+    The ``i``-th arrival submits ``prompts[i % len(prompts)]`` at its offset
+    whether or not earlier prompts finished, so queues build up once the
+    offered rate exceeds what ``max_concurrency`` proposer slots can serve.
+    Each prompt fans out ``samples`` calls per proposer and is majority-voted
+    as soon as its last sample arrives. Latency is measured from each
+    prompt's intended arrival time.
+    """
+    if not prompts:
+        raise ValueError("drive_load requires at least one prompt")
+    if samples <= 0 or max_concurrency <= 0:
+        raise ValueError("samples and max_concurrency must be positive")
+    loop = asyncio.get_running_loop()
+    gate = asyncio.Semaphore(max_concurrency)
+    if offered_rate is None:
+        offered_rate = len(arrivals) / arrivals[-1] if arrivals and arrivals[-1] > 0 else 0.0
+    span = arrivals[-1] - arrivals[0] if arrivals else 0.0
+    report = LoadReport(offered_rate=offered_rate, arrival_span_s=span)
+    start = loop.time()
+
+    async def call(
+        proposer: AsyncProposer, prompt: Dict[str, str], index: int, slots: List[float]
+    ) -> Candidate:
+        async with gate:
+            slots.append(loop.time())
+            return await proposer.agenerate(
+                prompt=prompt, sample_index=index, temperature=temperature
+            )
+
+    async def serve(
+        prompt: Dict[str, str], arrived: float
+    ) -> tuple[PromptTiming, AggregationResult]:
+        slots: List[float] = []
+        candidates = await asyncio.gather(
+            *(
+                call(proposer, prompt, index, slots)
+                for proposer in proposers
+                for index in range(samples)
+            )
+        )
+        generated = loop.time()
+        with tracing.span("loadgen.aggregate", prompt_id=prompt["id"]):
+            result = aggregate_flat(list(candidates), strategy_name=strategy_name)
+        timing = PromptTiming(
+            prompt_id=prompt["id"],
+            arrival_s=arrived - start,
+            queued_s=min(slots) - arrived,
+            generation_s=generated - min(slots),
+            aggregation_s=loop.time() - generated,
+        )
+        return timing, result
+
+    tasks: List["asyncio.Task[tuple[PromptTiming, AggregationResult]]"] = []
+    with tracing.span("loadgen", arrivals=len(arrivals), rate=offered_rate):
+        for position, offset in enumerate(arrivals):
+            delay = start + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            prompt = prompts[position % len(prompts)]
+            # Latency counts from the scheduled arrival, not from when this loop got
+            # around to it, so a stalled event loop cannot hide queueing delay.
+            tasks.append(loop.create_task(serve(prompt, start + offset)))
+        for timing, result in await asyncio.gather(*tasks):
+            report.timings.append(timing)
+            report.results.append(result)
+    report.duration_s = loop.time() - start
+    return report
+
+
+def run_load(
+    prompts: Sequence[Dict[str, str]],
+    proposers: Sequence[AsyncProposer],
+    arrivals: Sequence[float],
+    **kwargs: object,
+) -> LoadReport:
+    """Synchronous entry point around :func:`drive_load`."""
+    return asyncio.run(drive_load(prompts, proposers, arrivals, **kwargs))  # type: ignore[arg-type]
+
+
+def load_curve(
+    prompts: Sequence[Dict[str, str]],
+    proposers: Sequence[AsyncProposer],
+    rates: Sequence[float],
+    *,
+    count: int,
+    trace: Optional[Sequence[float]] = None,
+    seed: int = 0,
+    **kwargs: object,
+) -> List[LoadReport]:
+    """One :class:`LoadReport` per offered rate, from Poisson or a rescaled ``trace``."""
+    reports: List[LoadReport] = []
+    for rate in rates:
+        if trace is not None:
+            arrivals = scale_arrivals(trace[:count], rate)
+        else:
+            arrivals = poisson_arrivals(rate, count, seed=seed)
+        reports.append(run_load(prompts, proposers, arrivals, offered_rate=rate, **kwargs))
+    return reports
+
+
+def format_load_curve(
+    reports: Sequence[LoadReport], *, slo_s: Optional[float] = None, percentile: float = 0.99
+) -> List[str]:
+    """Markdown latency-vs-load table; the first saturated rate is flagged."""
+    slo_header = f" | ≤ {slo_s * 1000:.0f} ms" if slo_s is not None else ""
+    lines = [
+        "| Offered /s | Achieved /s | p50 ms | p99 ms | Queue p99 ms | Gen p50 ms"
+        f" | Agg p50 ms{slo_header} |",
+        "| --- " * (7 + (slo_s is not None)) + "|",
+    ]
+    flagged = False
+    for report in reports:
+        def ms(quantile: float, component: str = "total") -> str:
+            return f"{report.latency_quantile(quantile, component) * 1000:.1f}"
+
+        slo_cell = f" | {report.slo_attainment(slo_s):.0%}" if slo_s is not None else ""
+        marker = ""
+        if not flagged and report.saturated(slo_s=slo_s, percentile=percentile):
+            marker, flagged = " (saturated)", True
+        lines.append(
+            f"| {report.offered_rate:g}{marker} | {report.achieved_rate:.1f} | {ms(0.5)}"
+            f" | {ms(0.99)} | {ms(0.99, 'queued')} | {ms(0.5, 'generation')}"
+            f" | {ms(0.5, 'aggregation')}{slo_cell} |"
+        )
+    return lines
+
+
+__all__ = [
+    "COMPONENTS",
+    "LoadReport",
+    "PromptTiming",
+    "drive_load",
+    "format_load_curve",
+    "load_curve",
+    "load_trace",
+    "poisson_arrivals",
+    "run_load",
+    "scale_arrivals",
+]
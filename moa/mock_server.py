@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Mapping, Optional
+
+from .models import MockModel
+
+
+class MockModelServer:
+    """Serves ``MockModel`` proposers over HTTP/1.1 with keep-alive.
+
+    ``POST /v1/generate`` takes ``{"model", "prompt", "sample_index",
+    "temperature"}`` and ``POST /v1/generate_batch`` takes ``{"model",
+    "prompts", "sample_indices", "temperature"}``; both answer with serialized
+    candidates. Every request sleeps ``latency_s`` plus uniform jitter and
+    fails with HTTP 503 at ``failure_rate``, so clients can be exercised for
+    throughput, tail latency and retries without a real backend.
+    """
+
+    def __init__(
+        self,
+        models: Mapping[str, MockModel],
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_s: float = 0.0,
+        latency_jitter_s: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        if latency_s < 0 or latency_jitter_s < 0:
+            raise ValueError("latency must be non-negative")
+        if not 0.0 <= failure_rate < 1.0:
+            raise ValueError("failure_rate must be in [0, 1)")
+        self.models = dict(models)
+        self.latency_s = latency_s
+        self.latency_jitter_s = latency_jitter_s
+        self.failure_rate = failure_rate
+        self.requests_served = 0
+        self.failures_injected = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockModelServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> "MockModelServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _draw_fault(self) -> tuple[float, bool]:
+        with self._lock:
+            self.requests_served += 1
+            delay = self.latency_s + self._rng.uniform(0.0, self.latency_jitter_s)
+            fail = self._rng.random() < self.failure_rate
+            if fail:
+                self.failures_injected += 1
+        return delay, fail
+
+    def _handle(self, path: str, body: Dict[str, Any]) -> tuple[int, Dict[str, Any]]:
+        delay, fail = self._draw_fault()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            return 503, {"error": "injected failure"}
+        model = self.models.get(body.get("model", ""))
+        if model is None:
+            return 404, {"error": f"unknown model {body.get('model')!r}"}
+        temperature = float(body.get("temperature", 0.7))
+        if path == "/v1/generate":
+            cand = model.generate(
+                prompt=body["prompt"],
+                sample_index=int(body["sample_index"]),
+                temperature=temperature,
+            )
+            return 200, asdict(cand)
+        if path == "/v1/generate_batch":
+            cands = model.generate_batch(
+                body["prompts"], [int(i) for i in body["sample_indices"]], temperature=temperature
+            )
+            return 200, {"candidates": [asdict(cand) for cand in cands]}
+        return 404, {"error": f"unknown path {path!r}"}
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                if self.path == "/healthz":
+                    self._reply(200, {"status": "ok", "models": sorted(server.models)})
+                else:
+                    self._reply(404, {"error": f"unknown path {self.path!r}"})
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", "0"))
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._reply(400, {"error": "invalid JSON"})
+                    return
+                try:
+                    status, payload = server._handle(self.path, body)
+                except (KeyError, TypeError, ValueError) as exc:
+                    status, payload = 400, {"error": str(exc)}
+                self._reply(status, payload)
+
+            def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve MockModel proposers over HTTP")
+    parser.add_argument(
+        "--model",
+        action="append",
+        default=[],
+        metavar="NAME:STRENGTH",
+        help="Model to serve; may be repeated. Defaults to Mock-Strong:0.9 and Mock-Weak:0.3.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind.")
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="Base latency added to every request.",
+    )
+    parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=0.0,
+        help="Uniform random latency added on top of the base latency.",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with HTTP 503.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    specs = args.model or ["Mock-Strong:0.9", "Mock-Weak:0.3"]
+    models = {}
+    for spec in specs:
+        name, _, strength = spec.partition(":")
+        models[name] = MockModel(name, strength=float(strength or 0.5))
+    server = MockModelServer(
+        models,
+        host=args.host,
+        port=args.port,
+        latency_s=args.latency_ms / 1000,
+        latency_jitter_s=args.jitter_ms / 1000,
+        failure_rate=args.failure_rate,
+    )
+    print(f"Serving {', '.join(sorted(models))} on {server.base_url}")
+    server.serve_forever()
+
+
+__all__ = ["MockModelServer"]
+
+
+if __name__ == "__main__":
+    main()
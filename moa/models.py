@@ -1,8 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import random
+import re
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional
+from typing import (
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    runtime_checkable,
+)
+
+from . import rng as counter_rng
+from . import tracing
+
+RNG_MODES = ("mersenne", "counter")
 
 
 @dataclass
@@ -22,6 +40,77 @@ class Candidate:
         return f"{self.model_name}#${self.sample_index}".replace("$", "")
 
 
+@runtime_checkable
+class Proposer(Protocol):
+    """Anything that can produce a single ``Candidate`` for a prompt."""
+
+    name: str
+
+    def generate(
+        self,
+        *,
+        prompt: Dict[str, str],
+        sample_index: int,
+        temperature: float = 0.7,
+    ) -> Candidate:
+        ...
+
+
+@runtime_checkable
+class BatchProposer(Proposer, Protocol):
+    """Proposer with a native batch endpoint for a prompts x samples grid.
+
+    ``generate_batch`` returns candidates prompt-major, i.e. all requested
+    sample indices for ``prompts[0]`` first, in ``sample_indices`` order.
+    """
+
+    def generate_batch(
+        self,
+        prompts: Sequence[Dict[str, str]],
+        sample_indices: Sequence[int],
+        *,
+        temperature: float = 0.7,
+    ) -> List[Candidate]:
+        ...
+
+
+@dataclass
+class LatencyModel:
+    """Seeded stand-in for proposer call latency.
+
+    Latencies are log-normal around ``median_s``; with probability
+    ``straggler_rate`` a call additionally stalls for ``straggler_s``, which
+    produces the heavy tail that hedged requests are meant to cut.
+    """
+
+    median_s: float
+    sigma: float = 0.25
+    straggler_rate: float = 0.0
+    straggler_s: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.median_s < 0 or self.sigma < 0 or self.straggler_s < 0:
+            raise ValueError("latency parameters must be non-negative")
+        if not 0.0 <= self.straggler_rate <= 1.0:
+            raise ValueError("straggler_rate must be between 0 and 1")
+
+    def sample(self, rng: random.Random) -> float:
+        delay = self.median_s * rng.lognormvariate(0.0, self.sigma)
+        if rng.random() < self.straggler_rate:
+            delay += self.straggler_s
+        return delay
+
+
+def _seeded(rng: Optional[random.Random], seed: str) -> random.Random:
+    if rng is None:
+        return random.Random(seed)
+    rng.seed(seed)
+    return rng
+
+
+_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
 class MockModel:
     """Deterministic mock model that simulates strong or weak proposers."""
 
@@ -33,14 +122,40 @@ class MockModel:
         scripted_outcomes: Optional[Dict[str, List[bool]]] = None,
         scripted_final_answers: Optional[Dict[str, List[str]]] = None,
         seed: int = 13,
+        token_latency_s: float = 0.0,
+        latency: Optional[LatencyModel] = None,
+        rng_mode: str = "mersenne",
     ) -> None:
         if not 0.0 <= strength <= 1.0:
             raise ValueError("strength must be between 0 and 1")
+        if rng_mode not in RNG_MODES:
+            raise ValueError(f"rng_mode must be one of {RNG_MODES}")
+        if token_latency_s < 0:
+            raise ValueError("token_latency_s must be non-negative")
         self.name = name
         self.strength = strength
         self.scripted_outcomes = scripted_outcomes or {}
         self.scripted_final_answers = scripted_final_answers or {}
         self.seed = seed
+        self.token_latency_s = token_latency_s
+        self.latency = latency
+        self.rng_mode = rng_mode
+        self._latency_draws = 0
+        self._stream_keys: Dict[tuple[str, float], int] = {}
+
+    def config_fingerprint(self) -> str:
+        """Stable digest of everything that influences generated samples."""
+        config = {
+            "name": self.name,
+            "strength": self.strength,
+            "seed": self.seed,
+            "scripted_outcomes": self.scripted_outcomes,
+            "scripted_final_answers": self.scripted_final_answers,
+        }
+        if self.rng_mode != "mersenne":
+            config["rng_mode"] = self.rng_mode
+        encoded = json.dumps(config, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:16]
 
     def generate(
         self,
@@ -49,55 +164,217 @@ class MockModel:
         sample_index: int,
         temperature: float = 0.7,
     ) -> Candidate:
-        prompt_id = prompt["id"]
-        gold_answer = prompt["answer"]
-        distractors: Iterable[str] = prompt.get("distractors", [])
+        tracing.count("moa_samples_total", model=self.name)
+        with tracing.span("proposer.generate", model=self.name):
+            prompt_id = prompt["id"]
+            gold_answer = prompt["answer"]
+            distractors: Iterable[str] = prompt.get("distractors", [])
 
-        final_answer = self._scripted_answer(prompt_id, sample_index)
-        if final_answer is not None:
-            correct = final_answer == gold_answer
-        else:
-            scripted = self._scripted_outcome(prompt_id, sample_index)
-            if scripted is None:
-                rng = random.Random(
-                    f"{self.seed}:{self.name}:{prompt_id}:{sample_index}:{temperature}"
-                )
-                correct = rng.random() < self.strength
+            final_answer = self._draw_answer(
+                prompt_id, gold_answer, list(distractors), sample_index, temperature
+            )
+            if final_answer == gold_answer:
+                reasoning = self._build_correct_reasoning(prompt, final_answer)
             else:
-                correct = scripted
-            if correct:
-                final_answer = gold_answer
+                reasoning = self._build_incorrect_reasoning(prompt, final_answer)
+            return self._candidate(
+                prompt_id,
+                sample_index,
+                final_answer,
+                gold_answer,
+                f"{reasoning}\nFinal Answer: {final_answer}",
+                {"temperature": f"{temperature:.2f}"},
+            )
+
+    def generate_batch(
+        self,
+        prompts: Sequence[Dict[str, str]],
+        sample_indices: Sequence[int],
+        *,
+        temperature: float = 0.7,
+    ) -> List[Candidate]:
+        """Generate the full prompts x sample_indices grid, prompt-major.
+
+        Produces exactly the candidates ``generate`` would, but reuses one RNG
+        instance and builds each distinct reasoning text once per prompt.
+        """
+        with tracing.span("proposer.generate_batch", model=self.name):
+            candidates = self._generate_batch(prompts, sample_indices, temperature)
+        tracing.count("moa_samples_total", len(candidates), model=self.name)
+        return candidates
+
+    def _generate_batch(
+        self,
+        prompts: Sequence[Dict[str, str]],
+        sample_indices: Sequence[int],
+        temperature: float,
+    ) -> List[Candidate]:
+        rng: Optional[random.Random] = None
+        temperature_label = f"{temperature:.2f}"
+        candidates: List[Candidate] = []
+        for prompt in prompts:
+            prompt_id = prompt["id"]
+            gold_answer = prompt["answer"]
+            distractors = list(prompt.get("distractors", []))
+            texts: Dict[str, str] = {}
+            if self.rng_mode == "counter":
+                answers = self._draw_answers_counter(
+                    prompt_id, gold_answer, distractors, sample_indices, temperature
+                )
             else:
-                rng = random.Random(
-                    f"miss:{self.seed}:{self.name}:{prompt_id}:{sample_index}:{temperature}"
+                if rng is None:
+                    rng = random.Random(0)
+                answers = [
+                    self._draw_answer(prompt_id, gold_answer, distractors, index, temperature, rng)
+                    for index in sample_indices
+                ]
+            for sample_index, final_answer in zip(sample_indices, answers):
+                text = texts.get(final_answer)
+                if text is None:
+                    if final_answer == gold_answer:
+                        reasoning = self._build_correct_reasoning(prompt, final_answer)
+                    else:
+                        reasoning = self._build_incorrect_reasoning(prompt, final_answer)
+                    text = texts[final_answer] = f"{reasoning}\nFinal Answer: {final_answer}"
+                candidates.append(
+                    self._candidate(
+                        prompt_id,
+                        sample_index,
+                        final_answer,
+                        gold_answer,
+                        text,
+                        {"temperature": temperature_label},
+                    )
                 )
-                fallback_answers = list(distractors) or [str(int(gold_answer) + 1)]
-                final_answer = rng.choice(fallback_answers)
+        return candidates
+
+    async def astream(
+        self,
+        *,
+        prompt: Dict[str, str],
+        sample_index: int,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[str]:
+        """Yield the sample's text one whitespace-delimited token at a time.
+
+        Each token is delayed by ``token_latency_s`` to simulate decoding. The
+        stream ends with a newline, as chat models end their last line, so the
+        ``Final Answer:`` line is complete before the stream is exhausted.
+        """
+        text = self.generate(prompt=prompt, sample_index=sample_index, temperature=temperature).text
+        for token in _TOKEN_PATTERN.findall(text + "\n"):
+            await asyncio.sleep(self.token_latency_s)
+            yield token
+
+    def _draw_answer(
+        self,
+        prompt_id: str,
+        gold_answer: str,
+        distractors: List[str],
+        sample_index: int,
+        temperature: float,
+        rng: Optional[random.Random] = None,
+    ) -> str:
+        final_answer = self._scripted_answer(prompt_id, sample_index)
+        if final_answer is not None:
+            return final_answer
+        if self.rng_mode == "counter":
+            return self._draw_answers_counter(
+                prompt_id, gold_answer, distractors, [sample_index], temperature
+            )[0]
+        scripted = self._scripted_outcome(prompt_id, sample_index)
+        if scripted is None:
+            rng = _seeded(rng, f"{self.seed}:{self.name}:{prompt_id}:{sample_index}:{temperature}")
+            correct = rng.random() < self.strength
+        else:
+            correct = scripted
+        if correct:
+            return gold_answer
+        rng = _seeded(rng, f"miss:{self.seed}:{self.name}:{prompt_id}:{sample_index}:{temperature}")
+        fallback_answers = distractors or [str(int(gold_answer) + 1)]
+        return rng.choice(fallback_answers)
 
-        if final_answer is None:
-            raise RuntimeError("final_answer could not be determined")
+    def _draw_answers_counter(
+        self,
+        prompt_id: str,
+        gold_answer: str,
+        distractors: List[str],
+        sample_indices: Sequence[int],
+        temperature: float,
+    ) -> List[str]:
+        """Counter-based draws: sample ``i`` reads counters ``2i`` (correct?) and ``2i+1`` (miss)."""
+        key = self._stream_keys.get((prompt_id, temperature))
+        if key is None:
+            if len(self._stream_keys) >= 4096:
+                self._stream_keys.clear()
+            key = counter_rng.stream_key(self.seed, self.name, prompt_id, temperature)
+            self._stream_keys[(prompt_id, temperature)] = key
+        draws = counter_rng.uniforms(key, [2 * index for index in sample_indices])
+        answers: List[str] = []
+        for sample_index, draw in zip(sample_indices, draws):
+            final_answer = self._scripted_answer(prompt_id, sample_index)
+            if final_answer is None:
+                scripted = self._scripted_outcome(prompt_id, sample_index)
+                correct = draw < self.strength if scripted is None else scripted
+                if correct:
+                    final_answer = gold_answer
+                else:
+                    fallback_answers = distractors or [str(int(gold_answer) + 1)]
+                    miss = counter_rng.uniform(key, 2 * sample_index + 1)
+                    final_answer = fallback_answers[int(miss * len(fallback_answers))]
+            answers.append(final_answer)
+        return answers
 
+    def answer_confidence(self, final_answer: str, gold_answer: str) -> float:
+        """Self-reported confidence attached to a sample with ``final_answer``."""
         if final_answer == gold_answer:
             confidence = 0.85 + 0.1 * (self.strength - 0.5)
-            reasoning = self._build_correct_reasoning(prompt, final_answer)
-            is_correct = True
         else:
             confidence = 0.35 + 0.2 * (self.strength - 0.5)
-            reasoning = self._build_incorrect_reasoning(prompt, final_answer)
-            is_correct = False
+        return max(0.0, min(confidence, 0.99))
 
-        text = f"{reasoning}\nFinal Answer: {final_answer}"
+    def _candidate(
+        self,
+        prompt_id: str,
+        sample_index: int,
+        final_answer: str,
+        gold_answer: str,
+        text: str,
+        metadata: Dict[str, str],
+    ) -> Candidate:
         return Candidate(
             prompt_id=prompt_id,
             model_name=self.name,
             sample_index=sample_index,
             text=text,
             final_answer=final_answer,
-            confidence=max(0.0, min(confidence, 0.99)),
-            is_correct=is_correct,
-            metadata={"temperature": f"{temperature:.2f}"},
+            confidence=self.answer_confidence(final_answer, gold_answer),
+            is_correct=final_answer == gold_answer,
+            metadata=metadata,
         )
 
+    async def agenerate(
+        self,
+        *,
+        prompt: Dict[str, str],
+        sample_index: int,
+        temperature: float = 0.7,
+    ) -> Candidate:
+        """Like :meth:`generate`, after sleeping for a draw from ``latency``.
+
+        Every call draws a fresh latency, keyed on the model name and a
+        per-model call counter: repeated calls for the same sample (hedges, or
+        a load test replaying a prompt) sleep independently but return the
+        same candidate.
+        """
+        if self.latency is not None:
+            draw = self._latency_draws
+            self._latency_draws += 1
+            key = f"{self.seed}:{self.name}:latency:{prompt['id']}:{sample_index}:{draw}"
+            rng = random.Random(key)
+            await asyncio.sleep(self.latency.sample(rng))
+        return self.generate(prompt=prompt, sample_index=sample_index, temperature=temperature)
+
     def _scripted_outcome(self, prompt_id: str, sample_index: int) -> Optional[bool]:
         outcomes = self.scripted_outcomes.get(prompt_id)
         if outcomes is None:
@@ -129,4 +406,4 @@ class MockModel:
         )
 
 
-__all__ = ["Candidate", "MockModel"]
+__all__ = ["BatchProposer", "Candidate", "LatencyModel", "MockModel", "Proposer"]
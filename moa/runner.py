@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence
+
+from . import tracing
+from .aggregation import AggregationResult, AggregationSpec, aggregate_flat, aggregate_many
+from .dataset import PromptDataset
+from .eval import EvaluationResult, evaluate, exact_match
+from .fingerprint import PromptIndex
+from .generation import GenerationRequest, HedgePolicy, run_generation
+from .models import Candidate, Proposer
+from .sampling import AdaptiveSampler, SamplingReport
+
+BASELINE = "Single Strong Sample"
+MIXED_MOA = "Mixed-MoA (majority)"
+SELF_MOA = "Self-MoA (majority)"
+SELF_MOA_SEQ = "Self-MoA-Seq"
+STRATEGIES = (BASELINE, MIXED_MOA, SELF_MOA, SELF_MOA_SEQ)
+
+
+class PipelineModels(Protocol):
+    strong: Proposer
+
+    def mixed(self) -> List[Proposer]:
+        ...
+
+
+@dataclass
+class RunConfig:
+    self_samples: int = 4
+    sequential_window: int = 2
+    temperature: float = 0.7
+    max_concurrency: int = 8
+    adaptive: bool = False
+    adaptive_confidence: Optional[float] = None
+    hedge_percentile: Optional[float] = None
+    prompt_deadline_s: Optional[float] = None
+    dedup: bool = False
+    dedup_threshold: float = 0.8
+    dedup_cache_size: int = 4096
+
+
+@dataclass
+class PromptRecord:
+    prompt: Dict[str, str]
+    base: Candidate
+    mixed: List[Candidate]
+    self_moa: List[Candidate]
+    mixed_result: AggregationResult
+    self_result: AggregationResult
+    seq_result: AggregationResult
+    sampling: Optional[SamplingReport] = None
+    duplicate_of: Optional[str] = None
+
+    @property
+    def prompt_id(self) -> str:
+        return self.prompt["id"]
+
+    @property
+    def reference(self) -> str:
+        return self.prompt["answer"]
+
+    @property
+    def generation_calls(self) -> int:
+        return 1 + len(self.mixed) + len(self.self_moa)
+
+    def predictions(self) -> Dict[str, str]:
+        return {
+            BASELINE: self.base.final_answer,
+            MIXED_MOA: self.mixed_result.final_answer,
+            SELF_MOA: self.self_result.final_answer,
+            SELF_MOA_SEQ: self.seq_result.final_answer,
+        }
+
+
+@dataclass
+class RunReport:
+    records: List[PromptRecord] = field(default_factory=list)
+    evaluations: Dict[str, EvaluationResult] = field(
+        default_factory=lambda: {name: EvaluationResult(total=0, correct=0) for name in STRATEGIES}
+    )
+
+    def merge(self, other: "RunReport") -> None:
+        self.records.extend(other.records)
+        for name, result in other.evaluations.items():
+            self.evaluations[name] = self.evaluations[name] + result
+
+    def predictions(self, strategy: str) -> List[tuple[str, str]]:
+        return [(record.predictions()[strategy], record.reference) for record in self.records]
+
+    def dedup_summary(self) -> tuple[int, int]:
+        """(duplicate prompts, proposer calls they reused)."""
+        duplicates = [record for record in self.records if record.duplicate_of is not None]
+        return len(duplicates), sum(record.generation_calls for record in duplicates)
+
+
+def iter_prompts(path: Path) -> Iterator[Dict[str, str]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            yield json.loads(line)
+
+
+def evaluate_prompts(
+    prompts: Sequence[Dict[str, str]],
+    models: PipelineModels,
+    config: RunConfig,
+    *,
+    index: Optional[PromptIndex] = None,
+) -> List[PromptRecord]:
+    """Generate every candidate for ``prompts`` in one concurrent fan-out and aggregate them.
+
+    With ``config.adaptive`` the Self-MoA samples are drawn per prompt by an
+    :class:`AdaptiveSampler` instead of being fanned out up front.
+
+    ``config.hedge_percentile`` duplicates proposer calls slower than that
+    latency percentile. With ``config.prompt_deadline_s`` the Mixed-MoA and
+    Self-MoA samples still outstanding at the deadline are dropped and their
+    aggregation is marked ``partial``; the baseline sample is always awaited
+    and stands in when no sample of a strategy arrived.
+
+    With ``config.dedup`` each prompt is first looked up in ``index`` (a
+    fresh :class:`PromptIndex` unless one is shared across calls); exact and
+    near duplicates of an earlier prompt reuse its candidates and results
+    instead of being generated again. The index keeps the records of the
+    ``config.dedup_cache_size`` most recently reused prompts; a duplicate of
+    an evicted one is generated again.
+    """
+    if config.dedup:
+        if index is None:
+            index = _dedup_index(config)
+        return _evaluate_deduplicated(prompts, models, config, index)
+    mixed_models = models.mixed()
+    sampler = None
+    if config.adaptive:
+        sampler = AdaptiveSampler(
+            models.strong, budget=config.self_samples, confidence=config.adaptive_confidence
+        )
+    fanned_self_samples = 0 if sampler is not None else config.self_samples
+    temperature = config.temperature
+    deadline = config.prompt_deadline_s
+    hedge = None
+    if config.hedge_percentile is not None:
+        hedge = HedgePolicy(percentile=config.hedge_percentile)
+
+    requests: List[GenerationRequest] = []
+    for prompt in prompts:
+        requests.append(GenerationRequest(models.strong, prompt, 0, temperature))
+        requests.extend(
+            GenerationRequest(m, prompt, 0, temperature, deadline_s=deadline) for m in mixed_models
+        )
+        requests.extend(
+            GenerationRequest(models.strong, prompt, i, temperature, deadline_s=deadline)
+            for i in range(fanned_self_samples)
+        )
+    with tracing.span("generation", prompts=len(prompts), requests=len(requests)):
+        candidates = run_generation(requests, max_concurrency=config.max_concurrency, hedge=hedge)
+
+    self_specs = [
+        AggregationSpec(SELF_MOA),
+        AggregationSpec(
+            f"{SELF_MOA_SEQ} (window={config.sequential_window})",
+            window_size=config.sequential_window,
+        ),
+    ]
+    stride = 1 + len(mixed_models) + fanned_self_samples
+    records: List[PromptRecord] = []
+    for prompt, offset in zip(prompts, range(0, len(candidates), stride)):
+        chunk = candidates[offset : offset + stride]
+        base = chunk[0]
+        assert base is not None
+        mixed, mixed_partial = _arrived(chunk[1 : 1 + len(mixed_models)], base)
+        self_moa, self_partial = _arrived(chunk[1 + len(mixed_models) :], base)
+        sampling = None
+        if sampler is not None:
+            with tracing.span("prompt.adaptive_sampling", prompt_id=prompt["id"]):
+                self_moa, sampling = sampler.sample(prompt, temperature=temperature)
+        with tracing.span("prompt.aggregate", prompt_id=prompt["id"]):
+            self_result, seq_result = aggregate_many(self_moa, self_specs)
+            record = PromptRecord(
+                prompt=prompt,
+                base=base,
+                mixed=mixed,
+                self_moa=self_moa,
+                mixed_result=aggregate_flat(mixed, strategy_name=MIXED_MOA),
+                self_result=self_result,
+                seq_result=seq_result,
+                sampling=sampling,
+            )
+        record.mixed_result.partial = mixed_partial
+        record.self_result.partial = record.seq_result.partial = self_partial
+        records.append(record)
+    return records
+
+
+def _evaluate_deduplicated(
+    prompts: Sequence[Dict[str, str]],
+    models: PipelineModels,
+    config: RunConfig,
+    index: PromptIndex,
+) -> List[PromptRecord]:
+    matches = [index.match(prompt) for prompt in prompts]
+    canonical = {prompt["id"] for prompt, match in zip(prompts, matches) if match is None}
+    # Look earlier prompts up before this batch's records can evict them.
+    earlier = {
+        match.canonical_id: index.attached(match.canonical_id)
+        for match in matches
+        if match is not None and match.canonical_id not in canonical
+    }
+    evicted = {prompt_id for prompt_id, record in earlier.items() if record is None}
+    fresh = [
+        prompt
+        for prompt, match in zip(prompts, matches)
+        if match is None or match.canonical_id in evicted
+    ]
+    with tracing.span("dedup", prompts=len(prompts), fresh=len(fresh)):
+        evaluated = {
+            record.prompt_id: record
+            for record in evaluate_prompts(fresh, models, replace(config, dedup=False))
+        }
+    for prompt_id in canonical:
+        index.attach(prompt_id, evaluated[prompt_id])
+    records: List[PromptRecord] = []
+    for prompt, match in zip(prompts, matches):
+        if match is None or match.canonical_id in evicted:
+            records.append(evaluated[prompt["id"]])
+        else:
+            source = evaluated.get(match.canonical_id) or earlier[match.canonical_id]
+            records.append(_reuse_record(source, prompt))
+    return records
+
+
+def _dedup_index(config: RunConfig) -> PromptIndex:
+    return PromptIndex(threshold=config.dedup_threshold, max_attached=config.dedup_cache_size)
+
+
+def _reuse_record(source: PromptRecord, prompt: Dict[str, str]) -> PromptRecord:
+    prompt_id = prompt["id"]
+
+    def relabel(cand: Candidate) -> Candidate:
+        is_correct = cand.is_correct
+        if is_correct is not None:
+            is_correct = exact_match(cand.final_answer, prompt["answer"])
+        return replace(cand, prompt_id=prompt_id, is_correct=is_correct)
+
+    sampling = source.sampling
+    return PromptRecord(
+        prompt=prompt,
+        base=relabel(source.base),
+        mixed=[relabel(cand) for cand in source.mixed],
+        self_moa=[relabel(cand) for cand in source.self_moa],
+        mixed_result=replace(source.mixed_result, prompt_id=prompt_id),
+        self_result=replace(source.self_result, prompt_id=prompt_id),
+        seq_result=replace(source.seq_result, prompt_id=prompt_id),
+        sampling=replace(sampling, prompt_id=prompt_id) if sampling is not None else None,
+        duplicate_of=source.prompt_id,
+    )
+
+
+def _arrived(
+    candidates: Sequence[Optional[Candidate]], fallback: Candidate
+) -> tuple[List[Candidate], bool]:
+    arrived = [cand for cand in candidates if cand is not None]
+    partial = len(arrived) < len(candidates)
+    if partial and not arrived:
+        arrived = [fallback]
+    return arrived, partial
+
+
+def build_report(records: List[PromptRecord]) -> RunReport:
+    report = RunReport(records=records)
+    for name in STRATEGIES:
+        report.evaluations[name] = evaluate(report.predictions(name))
+    return report
+
+
+def iter_evaluated(
+    prompts: Iterable[Dict[str, str]],
+    models: PipelineModels,
+    config: RunConfig,
+    *,
+    batch_size: int = 64,
+) -> Iterator[PromptRecord]:
+    """Evaluate a prompt stream in batches, yielding records as each batch finishes.
+
+    With ``config.dedup`` one :class:`PromptIndex` spans all batches.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    index = _dedup_index(config) if config.dedup else None
+    for batch in _shards(prompts, batch_size):
+        yield from evaluate_prompts(batch, models, config, index=index)
+
+
+def iter_sharded(
+    prompts: Iterable[Dict[str, str]],
+    models_factory: Callable[[], PipelineModels],
+    config: RunConfig,
+    *,
+    workers: int,
+    shard_size: int = 64,
+) -> Iterator[RunReport]:
+    """Evaluate a prompt stream across a process pool, yielding shard reports in input order.
+
+    Prompts are consumed lazily in shards of ``shard_size`` and at most
+    ``2 * workers`` shards are in flight, so memory stays bounded for large
+    JSONL files. ``models_factory`` must be picklable (a module-level
+    function); each worker builds its models once. Deduplication, if
+    enabled, only spans a shard. A :class:`PromptDataset` is split into
+    index-range views instead, so workers parse their own prompts and
+    nothing but offsets crosses the process boundary.
+    """
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+    if shard_size <= 0:
+        raise ValueError("shard_size must be positive")
+
+    shards: Iterable[Sequence[Dict[str, str]]]
+    if isinstance(prompts, PromptDataset):
+        count = -(-len(prompts) // shard_size)
+        shards = (prompts.shard(index, count) for index in range(count))
+    else:
+        shards = _shards(prompts, shard_size)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(models_factory,)
+    ) as pool:
+        pending: List[Future] = []
+        for shard in shards:
+            pending.append(pool.submit(_run_shard, shard, config))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def run_sharded(
+    prompts: Iterable[Dict[str, str]],
+    models_factory: Callable[[], PipelineModels],
+    config: RunConfig,
+    *,
+    workers: int,
+    shard_size: int = 64,
+) -> RunReport:
+    """Merge :func:`iter_sharded`; the result is identical to a single-process run."""
+    report = RunReport()
+    for shard_report in iter_sharded(
+        prompts, models_factory, config, workers=workers, shard_size=shard_size
+    ):
+        report.merge(shard_report)
+    return report
+
+
+_WORKER_MODELS: Optional[PipelineModels] = None
+
+
+def _init_worker(models_factory: Callable[[], PipelineModels]) -> None:
+    global _WORKER_MODELS
+    _WORKER_MODELS = models_factory()
+
+
+def _run_shard(prompts: Sequence[Dict[str, str]], config: RunConfig) -> RunReport:
+    assert _WORKER_MODELS is not None
+    return build_report(evaluate_prompts(list(prompts), _WORKER_MODELS, config))
+
+
+def _shards(prompts: Iterable[Dict[str, str]], shard_size: int) -> Iterator[List[Dict[str, str]]]:
+    iterator = iter(prompts)
+    while True:
+        shard = list(islice(iterator, shard_size))
+        if not shard:
+            return
+        yield shard
+
+
+__all__ = [
+    "BASELINE",
+    "MIXED_MOA",
+    "PipelineModels",
+    "PromptRecord",
+    "RunConfig",
+    "RunReport",
+    "SELF_MOA",
+    "SELF_MOA_SEQ",
+    "STRATEGIES",
+    "build_report",
+    "evaluate_prompts",
+    "iter_evaluated",
+    "iter_prompts",
+    "iter_sharded",
+    "run_sharded",
+]
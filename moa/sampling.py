@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .aggregation import extract_final_answer
+from .models import Candidate, MockModel
+
+
+@dataclass
+class SamplingReport:
+    prompt_id: str
+    budget: int
+    samples_drawn: int
+    stop_reason: str
+    leading_answer: str
+
+    @property
+    def samples_saved(self) -> int:
+        return self.budget - self.samples_drawn
+
+
+class AdaptiveSampler:
+    """Draws Self-MoA samples until the majority vote is settled.
+
+    Sampling stops as soon as the leading answer is ahead of the runner-up by
+    more than the remaining budget, which guarantees the same winner as drawing
+    the full budget. When ``confidence`` is set, sampling may also stop once a
+    one-sided sign test between the top two answers rejects a tie at that
+    level; this is cheaper but can, rarely, pick a different winner.
+    """
+
+    def __init__(
+        self,
+        model: MockModel,
+        *,
+        budget: int,
+        min_samples: int = 1,
+        confidence: Optional[float] = None,
+    ) -> None:
+        if budget <= 0:
+            raise ValueError("budget must be positive")
+        if not 1 <= min_samples <= budget:
+            raise ValueError("min_samples must be between 1 and budget")
+        if confidence is not None and not 0.5 < confidence < 1.0:
+            raise ValueError("confidence must be between 0.5 and 1")
+        self.model = model
+        self.budget = budget
+        self.min_samples = min_samples
+        self.confidence = confidence
+
+    def sample(
+        self, prompt: Dict[str, str], *, temperature: float = 0.7
+    ) -> Tuple[List[Candidate], SamplingReport]:
+        candidates: List[Candidate] = []
+        votes: Counter = Counter()
+        reason = "budget"
+        for sample_index in range(self.budget):
+            cand = self.model.generate(
+                prompt=prompt, sample_index=sample_index, temperature=temperature
+            )
+            candidates.append(cand)
+            votes[extract_final_answer(cand)] += 1
+            if len(candidates) < self.min_samples or len(candidates) == self.budget:
+                continue
+            stop = self._stop_reason(votes, remaining=self.budget - len(candidates))
+            if stop is not None:
+                reason = stop
+                break
+
+        report = SamplingReport(
+            prompt_id=prompt["id"],
+            budget=self.budget,
+            samples_drawn=len(candidates),
+            stop_reason=reason,
+            leading_answer=votes.most_common(1)[0][0],
+        )
+        return candidates, report
+
+    def _stop_reason(self, votes: Counter, *, remaining: int) -> Optional[str]:
+        top = votes.most_common(2)
+        leader = top[0][1]
+        runner_up = top[1][1] if len(top) > 1 else 0
+        if leader - runner_up > remaining:
+            return "decided"
+        if self.confidence is not None and leader > runner_up:
+            if _sign_test_p_value(leader, runner_up) <= 1.0 - self.confidence:
+                return "confident"
+        return None
+
+
+def _sign_test_p_value(leader: int, runner_up: int) -> float:
+    trials = leader + runner_up
+    tail = sum(math.comb(trials, k) for k in range(leader, trials + 1))
+    return tail / 2**trials
+
+
+__all__ = ["AdaptiveSampler", "SamplingReport"]
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .generation import GenerationRequest
+from .models import Candidate
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised for requests that would push spend past the scheduler budget."""
+
+
+@dataclass
+class ModelQuota:
+    requests_per_second: Optional[float] = None
+    burst: int = 1
+    max_concurrency: Optional[int] = None
+    cost_per_call: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.requests_per_second is not None and self.requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        if self.burst <= 0:
+            raise ValueError("burst must be positive")
+        if self.max_concurrency is not None and self.max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        if self.cost_per_call < 0:
+            raise ValueError("cost_per_call must be non-negative")
+
+
+@dataclass
+class LaneStats:
+    calls: int = 0
+    rejected: int = 0
+    queued_s: float = 0.0
+    executing_s: float = 0.0
+    cost: float = 0.0
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: int, *, now: float) -> None:
+        self.rate = rate
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1.0
+
+
+@dataclass
+class _Lane:
+    quota: ModelQuota
+    bucket: Optional[TokenBucket]
+    waiting: List[Tuple[int, int, "asyncio.Future[float]"]] = field(default_factory=list)
+    active: int = 0
+    stats: LaneStats = field(default_factory=LaneStats)
+
+    def has_capacity(self) -> bool:
+        limit = self.quota.max_concurrency
+        return limit is None or self.active < limit
+
+
+class ProposerScheduler:
+    """Dispatches proposer calls under per-model rate, concurrency and cost limits.
+
+    Every model gets a lane with an optional token bucket
+    (``requests_per_second`` with ``burst``) and concurrency cap. A single
+    dispatcher grants the lowest ``priority`` value among the lane heads that
+    are allowed to run, so urgent prompts overtake bulk work without any
+    model being throttled by its provider. Spend is reserved when a call is
+    granted; calls that would exceed ``budget`` fail with
+    :class:`BudgetExceededError`. Per-model time spent queued and executing is
+    tracked in :attr:`stats`.
+    """
+
+    def __init__(
+        self,
+        quotas: Mapping[str, ModelQuota],
+        *,
+        default_quota: Optional[ModelQuota] = None,
+        max_concurrency: Optional[int] = None,
+        budget: Optional[float] = None,
+    ) -> None:
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self.quotas = dict(quotas)
+        self.default_quota = default_quota or ModelQuota()
+        self.max_concurrency = max_concurrency
+        self.budget = budget
+        self.spent = 0.0
+        self._lanes: Dict[str, _Lane] = {}
+        self._active = 0
+        self._seq = itertools.count()
+        self._cond: Optional[asyncio.Condition] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    @property
+    def stats(self) -> Dict[str, LaneStats]:
+        return {name: lane.stats for name, lane in self._lanes.items()}
+
+    def totals(self) -> LaneStats:
+        total = LaneStats()
+        for lane in self._lanes.values():
+            total.calls += lane.stats.calls
+            total.rejected += lane.stats.rejected
+            total.queued_s += lane.stats.queued_s
+            total.executing_s += lane.stats.executing_s
+            total.cost += lane.stats.cost
+        return total
+
+    async def submit(self, request: GenerationRequest, *, priority: int = 0) -> Candidate:
+        loop = asyncio.get_running_loop()
+        cond = self._condition()
+        lane = self._lane(request.proposer.name, loop.time())
+        ticket: "asyncio.Future[float]" = loop.create_future()
+        enqueued = loop.time()
+        async with cond:
+            heapq.heappush(lane.waiting, (priority, next(self._seq), ticket))
+            cond.notify_all()
+        self._ensure_dispatcher()
+
+        try:
+            started = await ticket
+        except asyncio.CancelledError:
+            # A grant can land just before the cancellation; hand its slot back.
+            async with cond:
+                if ticket.done() and not ticket.cancelled() and ticket.exception() is None:
+                    self._release(lane)
+                else:
+                    self._withdraw(lane, ticket)
+                cond.notify_all()
+            raise
+        lane.stats.queued_s += started - enqueued
+        try:
+            return await request.proposer.agenerate(
+                prompt=request.prompt,
+                sample_index=request.sample_index,
+                temperature=request.temperature,
+            )
+        finally:
+            lane.stats.executing_s += loop.time() - started
+            async with cond:
+                self._release(lane)
+                cond.notify_all()
+
+    async def run(
+        self,
+        requests: Sequence[GenerationRequest],
+        *,
+        priorities: Optional[Sequence[int]] = None,
+    ) -> List[Candidate]:
+        """Submit every request and return candidates in request order."""
+        if priorities is not None and len(priorities) != len(requests):
+            raise ValueError("priorities must match requests")
+        ranks = priorities if priorities is not None else [0] * len(requests)
+        return list(
+            await asyncio.gather(
+                *(self.submit(request, priority=rank) for request, rank in zip(requests, ranks))
+            )
+        )
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def _lane(self, name: str, now: float) -> _Lane:
+        lane = self._lanes.get(name)
+        if lane is None:
+            quota = self.quotas.get(name, self.default_quota)
+            bucket = None
+            if quota.requests_per_second is not None:
+                bucket = TokenBucket(quota.requests_per_second, quota.burst, now=now)
+            lane = self._lanes[name] = _Lane(quota=quota, bucket=bucket)
+        return lane
+
+    def _release(self, lane: _Lane) -> None:
+        lane.active -= 1
+        self._active -= 1
+
+    @staticmethod
+    def _withdraw(lane: _Lane, ticket: "asyncio.Future[float]") -> None:
+        entries = [entry for entry in lane.waiting if entry[2] is not ticket]
+        if len(entries) != len(lane.waiting):
+            heapq.heapify(entries)
+            lane.waiting[:] = entries
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        cond = self._condition()
+        loop = asyncio.get_running_loop()
+        async with cond:
+            while any(lane.waiting for lane in self._lanes.values()):
+                if self._grant_next(loop.time()):
+                    continue
+                timeout = self._next_refill(loop.time())
+                try:
+                    await asyncio.wait_for(cond.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    def _grant_next(self, now: float) -> bool:
+        if self.max_concurrency is not None and self._active >= self.max_concurrency:
+            return False
+        best: Optional[_Lane] = None
+        for lane in self._lanes.values():
+            while lane.waiting and lane.waiting[0][2].cancelled():
+                heapq.heappop(lane.waiting)
+            if not lane.waiting or not lane.has_capacity():
+                continue
+            if lane.bucket is not None and lane.bucket.wait_time(now) > 0:
+                continue
+            if best is None or lane.waiting[0][:2] < best.waiting[0][:2]:
+                best = lane
+        if best is None:
+            return False
+
+        _, _, ticket = heapq.heappop(best.waiting)
+        cost = best.quota.cost_per_call
+        if self.budget is not None and self.spent + cost > self.budget:
+            best.stats.rejected += 1
+            ticket.set_exception(
+                BudgetExceededError(
+                    f"call would spend {self.spent + cost:.4f} of budget {self.budget:.4f}"
+                )
+            )
+            return True
+        if best.bucket is not None:
+            best.bucket.take(now)
+        best.active += 1
+        self._active += 1
+        self.spent += cost
+        best.stats.calls += 1
+        best.stats.cost += cost
+        ticket.set_result(now)
+        return True
+
+    def _next_refill(self, now: float) -> Optional[float]:
+        waits = [
+            lane.bucket.wait_time(now)
+            for lane in self._lanes.values()
+            if lane.waiting and lane.bucket is not None and lane.has_capacity()
+        ]
+        positive = [wait for wait in waits if wait > 0]
+        return min(positive) if positive else None
+
+
+__all__ = [
+    "BudgetExceededError",
+    "LaneStats",
+    "ModelQuota",
+    "ProposerScheduler",
+    "TokenBucket",
+]
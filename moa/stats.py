@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from .eval import normalize_answer
+
+try:  # NumPy is optional; every function has a pure-Python fallback.
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+
+@dataclass
+class ConfidenceInterval:
+    estimate: float
+    low: float
+    high: float
+    confidence: float
+    resamples: int
+
+    def format(self) -> str:
+        return f"[{self.low:.2f}, {self.high:.2f}]"
+
+
+@dataclass
+class PairedComparison:
+    strategy_a: str
+    strategy_b: str
+    difference: float
+    interval: ConfidenceInterval
+    p_value: float
+
+    @property
+    def significant(self) -> bool:
+        return self.p_value < 1.0 - self.interval.confidence
+
+
+def correctness(predictions: Sequence[str], references: Sequence[str]) -> Sequence[int]:
+    """Per-prompt 0/1 exact-match flags (a NumPy array when NumPy is available)."""
+    if len(predictions) != len(references):
+        raise ValueError("predictions and references must have the same length")
+    if np is not None:
+        preds = np.char.lower(np.char.strip(np.asarray(predictions, dtype=str)))
+        refs = np.char.lower(np.char.strip(np.asarray(references, dtype=str)))
+        return (preds == refs).astype(np.int8)
+    return [
+        int(normalize_answer(pred) == normalize_answer(ref))
+        for pred, ref in zip(predictions, references)
+    ]
+
+
+def pairs_correctness(pairs: Sequence[tuple[str, str]]) -> Sequence[int]:
+    return correctness([pred for pred, _ in pairs], [ref for _, ref in pairs])
+
+
+def bootstrap_accuracy(
+    correct: Sequence[int],
+    *,
+    resamples: int = 2000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> ConfidenceInterval:
+    """Percentile bootstrap interval for accuracy.
+
+    Resampling n prompts with replacement makes the resampled correct count
+    Binomial(n, accuracy), so each resample is one binomial draw, O(1)
+    instead of O(n), with or without NumPy.
+    """
+    _check_bootstrap_args(resamples, confidence)
+    total = len(correct)
+    if total == 0:
+        return ConfidenceInterval(0.0, 0.0, 0.0, confidence, resamples)
+    hits = int(sum(correct))
+    estimate = hits / total
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        draws = rng.binomial(total, estimate, size=resamples) / total
+        stats = sorted(draws.tolist())
+    else:
+        rng_py = random.Random(seed)
+        stats = sorted(_binomial(rng_py, total, estimate) / total for _ in range(resamples))
+    low, high = _percentiles(stats, confidence)
+    return ConfidenceInterval(estimate, low, high, confidence, resamples)
+
+
+def paired_bootstrap(
+    correct_a: Sequence[int],
+    correct_b: Sequence[int],
+    *,
+    strategy_a: str = "A",
+    strategy_b: str = "B",
+    resamples: int = 2000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> PairedComparison:
+    """Paired bootstrap of accuracy(B) - accuracy(A) over the same prompts.
+
+    Only prompts where exactly one strategy is right move the difference, so
+    prompts fall into three cells (only A right, only B right, agree) and a
+    resample is a single multinomial draw over the cell counts.
+    """
+    _check_bootstrap_args(resamples, confidence)
+    if len(correct_a) != len(correct_b):
+        raise ValueError("paired comparison requires predictions for the same prompts")
+    total = len(correct_a)
+    if total == 0:
+        interval = ConfidenceInterval(0.0, 0.0, 0.0, confidence, resamples)
+        return PairedComparison(strategy_a, strategy_b, 0.0, interval, 1.0)
+
+    if np is not None:
+        flags_a = np.asarray(correct_a, dtype=bool)
+        flags_b = np.asarray(correct_b, dtype=bool)
+        only_a = int(np.count_nonzero(flags_a & ~flags_b))
+        only_b = int(np.count_nonzero(flags_b & ~flags_a))
+    else:
+        only_a = sum(1 for a, b in zip(correct_a, correct_b) if a and not b)
+        only_b = sum(1 for a, b in zip(correct_a, correct_b) if b and not a)
+    difference = (only_b - only_a) / total
+    cells = [only_a, only_b, total - only_a - only_b]
+    weights = [count / total for count in cells]
+
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        counts = rng.multinomial(total, weights, size=resamples)
+        stats = sorted(((counts[:, 1] - counts[:, 0]) / total).tolist())
+    else:
+        rng_py = random.Random(seed)
+        stats = []
+        for _ in range(resamples):
+            drawn = _multinomial(rng_py, total, weights)
+            stats.append((drawn[1] - drawn[0]) / total)
+        stats.sort()
+
+    low, high = _percentiles(stats, confidence)
+    at_or_below = sum(1 for value in stats if value <= 0.0) / resamples
+    at_or_above = sum(1 for value in stats if value >= 0.0) / resamples
+    p_value = min(1.0, 2.0 * min(at_or_below, at_or_above))
+    interval = ConfidenceInterval(difference, low, high, confidence, resamples)
+    return PairedComparison(strategy_a, strategy_b, difference, interval, p_value)
+
+
+def _check_bootstrap_args(resamples: int, confidence: float) -> None:
+    if resamples <= 0:
+        raise ValueError("resamples must be positive")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be between 0 and 1")
+
+
+def _multinomial(rng: random.Random, n: int, weights: Sequence[float]) -> List[int]:
+    """Category counts of ``n`` draws, as one conditional binomial per category."""
+    counts = []
+    mass = 1.0
+    for weight in weights[:-1]:
+        drawn = _binomial(rng, n, weight / mass) if mass > 0 else 0
+        counts.append(drawn)
+        n -= drawn
+        mass -= weight
+    counts.append(n)
+    return counts
+
+
+def _binomial(rng: random.Random, n: int, p: float) -> int:
+    """Binomial(n, p) in O(1) expected time, as ``random.binomialvariate`` (3.12+).
+
+    Small means use Devroye's geometric method; the rest use Hörmann's BTRS
+    transformed rejection with squeeze.
+    """
+    if p <= 0.0 or n <= 0:
+        return 0
+    if p >= 1.0:
+        return n
+    if p > 0.5:
+        return n - _binomial(rng, n, 1.0 - p)
+    if n * p < 10.0:
+        drawn = trials = 0
+        log_q = math.log(1.0 - p)
+        while True:
+            trials += math.floor(math.log(1.0 - rng.random()) / log_q) + 1
+            if trials > n:
+                return drawn
+            drawn += 1
+
+    spq = math.sqrt(n * p * (1.0 - p))
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    vr = 0.92 - 4.2 / b
+    alpha = (2.83 + 5.1 / b) * spq
+    lpq = math.log(p / (1.0 - p))
+    mode = math.floor((n + 1) * p)
+    h = math.lgamma(mode + 1) + math.lgamma(n - mode + 1)
+    while True:
+        u = rng.random() - 0.5
+        us = 0.5 - abs(u)
+        k = math.floor((2.0 * a / us + b) * u + c)
+        if k < 0 or k > n:
+            continue
+        v = rng.random()
+        if us >= 0.07 and v <= vr:
+            return k
+        v *= alpha / (a / (us * us) + b)
+        if v <= 0.0 or math.log(v) <= h - math.lgamma(k + 1) - math.lgamma(n - k + 1) + (k - mode) * lpq:
+            return k
+
+
+def _percentiles(sorted_stats: List[float], confidence: float) -> tuple[float, float]:
+    alpha = (1.0 - confidence) / 2.0
+    last = len(sorted_stats) - 1
+    return (
+        sorted_stats[int(alpha * last)],
+        sorted_stats[int(round((1.0 - alpha) * last))],
+    )
+
+
+__all__ = [
+    "ConfidenceInterval",
+    "PairedComparison",
+    "bootstrap_accuracy",
+    "correctness",
+    "pairs_correctness",
+    "paired_bootstrap",
+]
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Protocol, Tuple, runtime_checkable
+
+from . import tracing
+from .aggregation import AggregationResult, IncrementalAggregator
+from .models import Candidate
+
+FINAL_ANSWER_PATTERN = re.compile(r"Final Answer:[ \t]*(\S[^\n]*?)[ \t]*$")
+
+
+@runtime_checkable
+class StreamingProposer(Protocol):
+    """Proposer that yields a sample's text incrementally.
+
+    A proposer may also define ``answer_confidence(final_answer, gold_answer)``
+    to score streamed samples like its own candidates; otherwise they get 0.5.
+    """
+
+    name: str
+
+    def astream(
+        self,
+        *,
+        prompt: Dict[str, str],
+        sample_index: int,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[str]:
+        ...
+
+
+class StreamingAnswerExtractor:
+    """Detects the ``Final Answer:`` line in text that arrives in chunks.
+
+    An answer is reported as soon as its line is terminated by a newline;
+    :meth:`finish` settles a trailing, unterminated line at end of stream, so
+    multi-word answers are never cut at a chunk boundary.
+    """
+
+    def __init__(self) -> None:
+        self.answer: Optional[str] = None
+        self._chunks: List[str] = []
+        self._line = ""
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> Optional[str]:
+        self._chunks.append(chunk)
+        if self.answer is not None:
+            return self.answer
+        self._line += chunk
+        *complete, self._line = self._line.split("\n")
+        for line in complete:
+            self.answer = self._match(line)
+            if self.answer is not None:
+                return self.answer
+        return None
+
+    def finish(self) -> Optional[str]:
+        if self.answer is None:
+            self.answer = self._match(self._line)
+        return self.answer
+
+    @staticmethod
+    def _match(line: str) -> Optional[str]:
+        found = FINAL_ANSWER_PATTERN.search(line)
+        return found.group(1) if found else None
+
+
+@dataclass
+class StreamReport:
+    prompt_id: str
+    streams: int
+    completed: int
+    cancelled: int
+    tokens_received: int
+    time_to_answer_s: float
+    stop_reason: str
+
+    @property
+    def streams_saved(self) -> int:
+        return self.cancelled
+
+
+async def stream_self_moa(
+    proposer: StreamingProposer,
+    prompt: Dict[str, str],
+    *,
+    samples: int,
+    strategy_name: str,
+    temperature: float = 0.7,
+    early_stop: bool = True,
+) -> Tuple[List[Candidate], AggregationResult, StreamReport]:
+    """Stream ``samples`` Self-MoA samples concurrently and vote as answers arrive.
+
+    Each stream is closed as soon as its ``Final Answer:`` line is seen. With
+    ``early_stop`` the remaining streams are cancelled once the leader is
+    ahead of the runner-up by more than the number of unfinished streams,
+    which cannot change the majority winner. Candidates are returned in
+    sample-index order.
+    """
+    if samples <= 0:
+        raise ValueError("samples must be positive")
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    tokens = [0] * samples
+    aggregator = IncrementalAggregator(strategy_name=strategy_name)
+    tasks = {
+        loop.create_task(
+            _consume(proposer, prompt, index, temperature, tokens), name=f"stream-{index}"
+        ): index
+        for index in range(samples)
+    }
+    pending = set(tasks)
+    stop_reason = "complete"
+    with tracing.span("stream.self_moa", prompt_id=prompt["id"], model=proposer.name):
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=tasks.__getitem__):
+                    aggregator.add(task.result())
+                if early_stop and pending and aggregator.margin() > len(pending):
+                    stop_reason = "decided"
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    elapsed = loop.time() - started
+
+    candidates = sorted(
+        (task.result() for task in tasks if task not in pending),
+        key=lambda cand: cand.sample_index,
+    )
+    report = StreamReport(
+        prompt_id=prompt["id"],
+        streams=samples,
+        completed=len(candidates),
+        cancelled=len(pending),
+        tokens_received=sum(tokens),
+        time_to_answer_s=elapsed,
+        stop_reason=stop_reason,
+    )
+    tracing.count("moa_stream_tokens_total", sum(tokens), model=proposer.name)
+    tracing.count("moa_streams_cancelled_total", len(pending), model=proposer.name)
+    return candidates, aggregator.result(), report
+
+
+async def _consume(
+    proposer: StreamingProposer,
+    prompt: Dict[str, str],
+    sample_index: int,
+    temperature: float,
+    tokens: List[int],
+) -> Candidate:
+    extractor = StreamingAnswerExtractor()
+    stream = proposer.astream(prompt=prompt, sample_index=sample_index, temperature=temperature)
+    try:
+        async for chunk in stream:
+            tokens[sample_index] += 1
+            if extractor.feed(chunk) is not None:
+                break
+    finally:
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    answer = extractor.finish() or ""
+    score = getattr(proposer, "answer_confidence", None)
+    return Candidate(
+        prompt_id=prompt["id"],
+        model_name=proposer.name,
+        sample_index=sample_index,
+        text=extractor.text,
+        final_answer=answer,
+        confidence=score(answer, prompt["answer"]) if score is not None else 0.5,
+        metadata={"streamed": "true"},
+    )
+
+
+__all__ = [
+    "FINAL_ANSWER_PATTERN",
+    "StreamReport",
+    "StreamingAnswerExtractor",
+    "StreamingProposer",
+    "stream_self_moa",
+]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from . import tracing
+from .aggregation import IncrementalAggregator
+from .eval import exact_match
+from .generation import AsyncProposer, GenerationRequest, run_generation
+from .runner import SELF_MOA, SELF_MOA_SEQ
+
+
+@dataclass
+class SweepPoint:
+    strategy: str
+    samples: int
+    window: Optional[int]
+    correct: int
+    total: int
+
+    @property
+    def accuracy(self) -> float:
+        if self.total == 0:
+            return 0.0
+        return self.correct / self.total
+
+    @property
+    def cost(self) -> int:
+        """Proposer calls of a standalone run that scores this configuration.
+
+        Such a run scores flat and windowed voting over the same samples, so
+        the flat point shares it with the windowed points at its sample count.
+        """
+        return self.samples * self.total
+
+    @property
+    def label(self) -> str:
+        if self.window is None:
+            return f"{self.strategy} (samples={self.samples})"
+        return f"{self.strategy} (samples={self.samples}, window={self.window})"
+
+
+@dataclass
+class SweepResult:
+    points: List[SweepPoint]
+    calls_made: int
+
+    @property
+    def standalone_calls(self) -> int:
+        """Proposer calls of the fewest standalone runs that score every point."""
+        runs = {(p.samples, p.window): p.cost for p in self.points if p.window is not None}
+        windowed = {samples for samples, _ in runs}
+        runs.update(
+            ((p.samples, None), p.cost)
+            for p in self.points
+            if p.window is None and p.samples not in windowed
+        )
+        return sum(runs.values())
+
+    @property
+    def calls_saved(self) -> int:
+        return self.standalone_calls - self.calls_made
+
+    def pareto_frontier(self) -> List[SweepPoint]:
+        """Points no other point beats on both cost and accuracy, cheapest first."""
+        frontier: List[SweepPoint] = []
+        for point in sorted(self.points, key=lambda p: (p.cost, -p.accuracy)):
+            if not frontier or point.accuracy > frontier[-1].accuracy:
+                frontier.append(point)
+        return frontier
+
+
+def sweep_self_moa(
+    prompts: Sequence[Dict[str, str]],
+    proposer: AsyncProposer,
+    *,
+    sample_grid: Sequence[int],
+    window_grid: Sequence[int],
+    temperature: float = 0.7,
+    max_concurrency: int = 8,
+) -> SweepResult:
+    """Score every (samples, window, strategy) combination from one generation pass.
+
+    A run with ``n`` samples sees exactly the first ``n`` samples of a run with
+    more, so ``max(sample_grid)`` samples are drawn once per prompt and each
+    grid point is read off incremental aggregators as the prefix grows.
+    """
+    if not sample_grid or min(sample_grid) <= 0:
+        raise ValueError("sample_grid must contain positive sample counts")
+    if any(window <= 0 for window in window_grid):
+        raise ValueError("window_grid must contain positive window sizes")
+    checkpoints = sorted(set(sample_grid))
+    windows = sorted(set(window_grid))
+    max_samples = checkpoints[-1]
+
+    requests = [
+        GenerationRequest(proposer, prompt, sample_index, temperature)
+        for prompt in prompts
+        for sample_index in range(max_samples)
+    ]
+    with tracing.span("sweep.generation", prompts=len(prompts), requests=len(requests)):
+        candidates = run_generation(requests, max_concurrency=max_concurrency)
+
+    correct: Dict[tuple[str, int, Optional[int]], int] = {}
+    for offset, prompt in zip(range(0, len(candidates), max_samples), prompts):
+        flat = IncrementalAggregator(strategy_name=SELF_MOA)
+        sequential = {
+            window: IncrementalAggregator(strategy_name=SELF_MOA_SEQ, window_size=window)
+            for window in windows
+        }
+        next_checkpoint = 0
+        for count, cand in enumerate(candidates[offset : offset + max_samples], start=1):
+            assert cand is not None
+            flat.add(cand)
+            for aggregator in sequential.values():
+                aggregator.add(cand)
+            if count != checkpoints[next_checkpoint]:
+                continue
+            next_checkpoint += 1
+            keyed = [((SELF_MOA, count, None), flat)]
+            keyed.extend(((SELF_MOA_SEQ, count, w), agg) for w, agg in sequential.items())
+            for key, aggregator in keyed:
+                hit = exact_match(aggregator.leader or "", prompt["answer"])
+                correct[key] = correct.get(key, 0) + int(hit)
+
+    points = [
+        SweepPoint(strategy, samples, window, correct.get((strategy, samples, window), 0), len(prompts))
+        for strategy, samples, window in _grid(checkpoints, windows)
+    ]
+    return SweepResult(points=points, calls_made=len(requests))
+
+
+def format_sweep_table(result: SweepResult) -> List[str]:
+    frontier = {id(point) for point in result.pareto_frontier()}
+    lines = [
+        "| Configuration | Accuracy | Proposer Calls | Pareto |",
+        "| --- | --- | --- | --- |",
+    ]
+    for point in sorted(result.points, key=lambda p: (p.cost, p.strategy, p.window or 0)):
+        marker = "★" if id(point) in frontier else ""
+        lines.append(f"| {point.label} | {point.accuracy:.2f} | {point.cost} | {marker} |")
+    lines.append(
+        f"\nSweep made {result.calls_made} proposer calls instead of"
+        f" {result.standalone_calls} ({result.calls_saved} saved)."
+    )
+    return lines
+
+
+def _grid(checkpoints: Sequence[int], windows: Sequence[int]) -> List[tuple[str, int, Optional[int]]]:
+    grid: List[tuple[str, int, Optional[int]]] = []
+    for samples in checkpoints:
+        grid.append((SELF_MOA, samples, None))
+        grid.extend((SELF_MOA_SEQ, samples, window) for window in windows)
+    return grid
+
+
+__all__ = ["SweepPoint", "SweepResult", "format_sweep_table", "sweep_self_moa"]
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from array import array
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .models import Candidate
+
+TextLoader = Callable[[str, str, int], str]
+_T = TypeVar("_T", bound=Hashable)
+
+
+class _Interner(Generic[_T]):
+    __slots__ = ("values", "codes")
+
+    def __init__(self) -> None:
+        self.values: List[_T] = []
+        self.codes: Dict[_T, int] = {}
+
+    def code(self, value: _T) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class CandidateTable:
+    """Columnar store of candidates holding only what aggregation needs.
+
+    Answers, model names, prompt ids and metadata are interned into integer codes;
+    confidences, sample indices and correctness flags live in ``array``
+    columns. Reasoning text is kept only when ``keep_text`` is set, otherwise
+    it is fetched on demand through ``text_loader(prompt_id, model_name,
+    sample_index)``.
+    """
+
+    __slots__ = (
+        "keep_text",
+        "text_loader",
+        "_answers",
+        "_models",
+        "_prompts",
+        "answer_codes",
+        "model_codes",
+        "prompt_codes",
+        "confidences",
+        "sample_indices",
+        "_correct",
+        "_texts",
+        "_metadata",
+        "_metadata_codes",
+    )
+
+    def __init__(self, *, keep_text: bool = False, text_loader: Optional[TextLoader] = None) -> None:
+        self.keep_text = keep_text
+        self.text_loader = text_loader
+        self._answers: _Interner[str] = _Interner()
+        self._models: _Interner[str] = _Interner()
+        self._prompts: _Interner[str] = _Interner()
+        self._metadata: _Interner[Tuple[Tuple[str, str], ...]] = _Interner()
+        self.answer_codes = array("i")
+        self.model_codes = array("i")
+        self.prompt_codes = array("i")
+        self.confidences = array("d")
+        self.sample_indices = array("q")
+        self._correct = array("b")
+        self._texts: Optional[List[str]] = [] if keep_text else None
+        self._metadata_codes = array("i")
+
+    @classmethod
+    def from_candidates(
+        cls,
+        candidates: Iterable[Candidate],
+        *,
+        keep_text: bool = False,
+        text_loader: Optional[TextLoader] = None,
+    ) -> "CandidateTable":
+        table = cls(keep_text=keep_text, text_loader=text_loader)
+        for cand in candidates:
+            table.append(cand)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.answer_codes)
+
+    def __iter__(self) -> Iterator[Candidate]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def __getitem__(self, row: int) -> Candidate:
+        if row < 0:
+            row += len(self)
+        correct = self._correct[row]
+        return Candidate(
+            prompt_id=self.prompt_id(row),
+            model_name=self.model_name(row),
+            sample_index=self.sample_indices[row],
+            text=self.text(row),
+            final_answer=self.answer(row),
+            confidence=self.confidences[row],
+            is_correct=None if correct < 0 else bool(correct),
+            metadata=dict(self._metadata.values[self._metadata_codes[row]]),
+        )
+
+    @property
+    def answer_values(self) -> List[str]:
+        return self._answers.values
+
+    @property
+    def model_values(self) -> List[str]:
+        return self._models.values
+
+    def append(self, cand: Candidate) -> None:
+        self.answer_codes.append(self._answers.code(cand.final_answer))
+        self.model_codes.append(self._models.code(cand.model_name))
+        self.prompt_codes.append(self._prompts.code(cand.prompt_id))
+        self.confidences.append(cand.confidence)
+        self.sample_indices.append(cand.sample_index)
+        self._correct.append(-1 if cand.is_correct is None else int(cand.is_correct))
+        if self._texts is not None:
+            self._texts.append(cand.text)
+        self._metadata_codes.append(self._metadata.code(tuple(sorted(cand.metadata.items()))))
+
+    def extend(self, candidates: Iterable[Candidate]) -> None:
+        for cand in candidates:
+            self.append(cand)
+
+    def answer(self, row: int) -> str:
+        return self._answers.values[self.answer_codes[row]]
+
+    def model_name(self, row: int) -> str:
+        return self._models.values[self.model_codes[row]]
+
+    def prompt_id(self, row: int) -> str:
+        return self._prompts.values[self.prompt_codes[row]]
+
+    def short_label(self, row: int) -> str:
+        return f"{self.model_name(row)}#{self.sample_indices[row]}"
+
+    def text(self, row: int) -> str:
+        if self._texts is not None:
+            return self._texts[row]
+        if self.text_loader is not None:
+            return self.text_loader(self.prompt_id(row), self.model_name(row), self.sample_indices[row])
+        return ""
+
+    def to_candidates(self) -> List[Candidate]:
+        return list(self)
+
+
+__all__ = ["CandidateTable", "TextLoader"]
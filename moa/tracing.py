@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.00001,
+    0.00005,
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+DEFAULT_MARGIN_BUCKETS: Tuple[float, ...] = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+@dataclass
+class Span:
+    name: str
+    attrs: Dict[str, str]
+    start: float = 0.0
+    end: float = 0.0
+    thread_id: int = 0
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def set(self, **attrs: object) -> None:
+        self.attrs.update({key: str(value) for key, value in attrs.items()})
+
+    def __enter__(self) -> "Span":
+        self.thread_id = threading.get_ident()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.end = time.perf_counter()
+        for hook in list(_hooks):
+            hook.on_span(self)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs: object) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class TraceHook(Protocol):
+    """Receives finished spans, counter increments and observations."""
+
+    def on_span(self, span: Span) -> None:
+        ...
+
+    def on_count(self, name: str, amount: float, labels: LabelSet) -> None:
+        ...
+
+    def on_observe(self, name: str, value: float, labels: LabelSet) -> None:
+        ...
+
+
+_hooks: List[TraceHook] = []
+
+
+def register_hook(hook: TraceHook) -> None:
+    _hooks.append(hook)
+
+
+def unregister_hook(hook: TraceHook) -> None:
+    _hooks.remove(hook)
+
+
+def enabled() -> bool:
+    return bool(_hooks)
+
+
+def span(name: str, **attrs: object) -> Span | _NoopSpan:
+    """Context manager timing a pipeline stage; a shared no-op when no hook is registered."""
+    if not _hooks:
+        return _NOOP_SPAN
+    return Span(name, {key: str(value) for key, value in attrs.items()})
+
+
+def count(name: str, amount: float = 1, **labels: object) -> None:
+    if not _hooks:
+        return
+    label_set = _label_set(labels)
+    for hook in list(_hooks):
+        hook.on_count(name, amount, label_set)
+
+
+def observe(name: str, value: float, **labels: object) -> None:
+    if not _hooks:
+        return
+    label_set = _label_set(labels)
+    for hook in list(_hooks):
+        hook.on_observe(name, value, label_set)
+
+
+@dataclass
+class Histogram:
+    buckets: Sequence[float]
+    counts: List[int] = field(default_factory=list)
+    total: float = 0.0
+    samples: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def add(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.samples += 1
+
+
+class MetricsCollector:
+    """Aggregates spans and metrics into counters and histograms.
+
+    Span durations land in ``moa_span_seconds{span=...}``; observations named
+    in ``buckets`` use those bucket bounds, everything else uses latency
+    buckets.
+    """
+
+    def __init__(self, *, buckets: Optional[Mapping[str, Sequence[float]]] = None) -> None:
+        self._buckets: Dict[str, Sequence[float]] = {"moa_vote_margin": DEFAULT_MARGIN_BUCKETS}
+        self._buckets.update(buckets or {})
+        self.counters: Dict[Tuple[str, LabelSet], float] = {}
+        self.histograms: Dict[Tuple[str, LabelSet], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def on_span(self, span: Span) -> None:
+        labels = {key: value for key, value in span.attrs.items() if key in ("model", "strategy")}
+        labels["span"] = span.name
+        self.on_observe("moa_span_seconds", span.duration, _label_set(labels))
+
+    def on_count(self, name: str, amount: float, labels: LabelSet) -> None:
+        with self._lock:
+            key = (name, labels)
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def on_observe(self, name: str, value: float, labels: LabelSet) -> None:
+        with self._lock:
+            key = (name, labels)
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(
+                    self._buckets.get(name, DEFAULT_LATENCY_BUCKETS)
+                )
+            histogram.add(value)
+
+    def counter(self, name: str, **labels: object) -> float:
+        return self.counters.get((name, _label_set(labels)), 0)
+
+    def histogram(self, name: str, **labels: object) -> Optional[Histogram]:
+        return self.histograms.get((name, _label_set(labels)))
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f"# TYPE {name} counter")
+                for (metric, labels), value in sorted(self.counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), hist in sorted(self.histograms.items(), key=lambda x: x[0]):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket_count in zip(hist.buckets, hist.counts):
+                        cumulative += bucket_count
+                        bucket_labels = labels + (("le", f"{bound:g}"),)
+                        lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                    inf_labels = labels + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_format_labels(inf_labels)} {hist.samples}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {hist.total:g}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {hist.samples}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_prometheus(), encoding="utf-8")
+
+
+class JsonTraceRecorder:
+    """Records spans and writes them in the Chrome trace-event JSON format."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def on_span(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def on_count(self, name: str, amount: float, labels: LabelSet) -> None:
+        pass
+
+    def on_observe(self, name: str, value: float, labels: LabelSet) -> None:
+        pass
+
+    def to_json(self) -> Dict[str, object]:
+        events = [
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": (span.start - self._origin) * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": 0,
+                "tid": span.thread_id,
+                "args": span.attrs,
+            }
+            for span in sorted(self.spans, key=lambda s: s.start)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_json()), encoding="utf-8")
+
+
+def _label_set(labels: Mapping[str, object]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return "{" + inner + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+__all__ = [
+    "Histogram",
+    "JsonTraceRecorder",
+    "MetricsCollector",
+    "Span",
+    "TraceHook",
+    "count",
+    "enabled",
+    "observe",
+    "register_hook",
+    "span",
+    "unregister_hook",
+]
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+
+import pytest
+
+from moa.models import MockModel
+
+
+@dataclass
+class DemoModels:
+    strong: MockModel
+    medium: MockModel
+
+    def mixed(self):
+        return [self.strong, self.medium]
+
+
+def build_demo_models():
+    return DemoModels(strong=MockModel("Strong", 0.8), medium=MockModel("Medium", 0.4))
+
+
+@pytest.fixture
+def demo_models():
+    """Factory for fresh demo models; module-level, so it pickles for ``run_sharded``."""
+    return build_demo_models
+
+
+@pytest.fixture
+def demo_prompts():
+    return [
+        {"id": f"p{i}", "question": "q", "answer": str(i), "distractors": [str(i + 1), str(i + 2)]}
+        for i in range(10)
+    ]
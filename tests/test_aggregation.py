@@ -1,4 +1,16 @@
-from moa.aggregation import aggregate_flat, aggregate_sequential
+import dataclasses
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from moa.aggregation import (
+    AggregationSpec,
+    IncrementalAggregator,
+    aggregate_bounded,
+    aggregate_flat,
+    aggregate_hierarchical,
+    aggregate_many,
+    aggregate_sequential,
+)
 from moa.models import Candidate
 
 
@@ -35,3 +47,119 @@ def test_sequential_counts_votes_across_windows():
     assert result.final_answer == "7"
     assert result.vote_counts["7"] == 3
     assert "A#0" in result.supporting_models
+
+
+def test_incremental_matches_batch_aggregators_at_every_prefix():
+    answers = ["9", "7", "7", "9", "5", "9", "7"]
+    candidates = [
+        make_candidate("p", f"M{i % 2}", i, answer, 0.3 + 0.1 * i)
+        for i, answer in enumerate(answers)
+    ]
+    flat = IncrementalAggregator(strategy_name="flat")
+    seq = IncrementalAggregator(strategy_name="seq", window_size=3)
+    for n, cand in enumerate(candidates, start=1):
+        flat.add(cand)
+        seq.add(cand)
+        assert flat.result() == aggregate_flat(candidates[:n], strategy_name="flat")
+        assert seq.result() == aggregate_sequential(
+            candidates[:n], window_size=3, strategy_name="seq"
+        )
+    assert seq.window_votes(1)["9"] == 2
+
+
+def test_incremental_sequential_is_insensitive_to_arrival_order():
+    candidates = [
+        make_candidate("p", "A", 0, "7", 0.5),
+        make_candidate("p", "A", 1, "9", 0.6),
+        make_candidate("p", "A", 2, "9", 0.4),
+        make_candidate("p", "A", 3, "7", 0.7),
+    ]
+    seq = IncrementalAggregator(strategy_name="seq", window_size=2)
+    seq.extend(reversed(candidates))
+    assert seq.result() == aggregate_sequential(candidates, window_size=2, strategy_name="seq")
+
+
+def test_hierarchical_matches_sequential_and_reports_depth():
+    answers = ["7", "9", "7", "5", "9", "7", "7", "9", "5", "7", "9"] * 3
+    candidates = [
+        make_candidate("p", "A", i, answer, 0.2 + (i % 5) / 10)
+        for i, answer in enumerate(answers)
+    ]
+    seq = aggregate_sequential(candidates, window_size=3, strategy_name="seq")
+    tree = aggregate_hierarchical(candidates, fan_in=3, strategy_name="tree")
+    assert tree.final_answer == seq.final_answer
+    assert tree.vote_counts == seq.vote_counts
+    assert tree.supporting_models == seq.supporting_models
+    assert "through 4 layers with fan-in 3" in tree.rationale
+
+    flat_tree = aggregate_hierarchical(candidates, fan_in=3, max_depth=2, strategy_name="tree")
+    assert "through 2 layers" in flat_tree.rationale
+
+    bounded = aggregate_hierarchical(
+        candidates, fan_in=4, keep_answers=2, keep_supporters=2, strategy_name="tree"
+    )
+    assert bounded.final_answer == "7"
+    assert len(bounded.supporting_models) == 2
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        pooled = aggregate_hierarchical(candidates, fan_in=3, strategy_name="tree", executor=pool)
+    assert pooled == tree
+
+
+def test_aggregate_many_matches_single_strategy_aggregators():
+    answers = ["9", "7", "7", "9", "5", "9", "7", "5"]
+    order = [5, 0, 7, 2, 1, 4, 6, 3]
+    candidates = [
+        make_candidate("p", f"M{i % 3}", i, answers[i], 0.2 + 0.1 * (i % 4)) for i in order
+    ]
+    specs = [
+        AggregationSpec("flat"),
+        AggregationSpec("seq2", window_size=2),
+        AggregationSpec("seq3", window_size=3),
+        AggregationSpec("weighted", weighted=True),
+    ]
+    flat, seq2, seq3, weighted = aggregate_many(candidates, specs)
+    assert flat == aggregate_flat(candidates, strategy_name="flat")
+    assert seq2 == aggregate_sequential(candidates, window_size=2, strategy_name="seq2")
+    assert seq3 == aggregate_sequential(candidates, window_size=3, strategy_name="seq3")
+    assert seq2.supporting_models is seq3.supporting_models
+    expected = {}
+    for cand in candidates:
+        expected[cand.final_answer] = expected.get(cand.final_answer, 0.0) + cand.confidence
+    assert weighted.vote_counts == {answer: round(w, 4) for answer, w in expected.items()}
+    assert weighted.final_answer == max(expected, key=expected.get)
+
+
+def test_bounded_aggregation_keeps_top_k_and_renders_lazily():
+    answers = ["7", "9", "7", "5", "7", "9", "7"]
+    candidates = [
+        make_candidate("p", f"M{i}", i, answer, 0.1 * (i % 4)) for i, answer in enumerate(answers)
+    ]
+    full = aggregate_flat(candidates, strategy_name="bounded")
+    assert aggregate_bounded(iter(candidates), strategy_name="bounded", top_k=10) == full
+
+    result = aggregate_bounded(iter(candidates), strategy_name="bounded", top_k=2)
+    assert result._rationale is None
+    assert result.supporting_models == full.supporting_models[:2]
+    assert result.vote_counts == full.vote_counts
+    assert result.rationale.endswith(f"{', '.join(full.supporting_models[:2])}, +2 more.")
+
+
+def test_bounded_results_pickle_and_replace():
+    candidates = [make_candidate("p", "M", i, str(i % 3), 0.5) for i in range(9)]
+    result = aggregate_bounded(candidates, strategy_name="bounded", top_k=1)
+    restored = pickle.loads(pickle.dumps(result))
+    assert restored == result and restored.rationale == result.rationale
+    flagged = dataclasses.replace(result, partial=True)
+    assert flagged.partial and flagged.rationale == result.rationale
+
+
+def test_bounded_aggregation_sketch_tracks_heavy_hitters():
+    candidates = []
+    for i in range(600):
+        answer = "42" if i % 3 == 0 else f"tail-{i}"
+        candidates.append(make_candidate("p", "A", i, answer, 0.5))
+    result = aggregate_bounded(candidates, strategy_name="sketch", max_answers=16)
+    assert result.final_answer == "42"
+    assert len(result.vote_counts) == 16
+    assert 200 <= result.vote_counts["42"] <= 200 + 600 // 16
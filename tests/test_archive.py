@@ -0,0 +1,92 @@
+import pytest
+
+from moa.archive import ArchiveWriter, RunArchive, RunStore, flipped_prompts
+from moa.runner import MIXED_MOA, SELF_MOA, RunConfig, evaluate_prompts
+
+
+@pytest.fixture
+def run_records(demo_models, demo_prompts):
+    def run(strength=None):
+        models = demo_models()
+        if strength is not None:
+            models.strong.strength = models.medium.strength = strength
+        return evaluate_prompts(demo_prompts, models, RunConfig(self_samples=3, adaptive=True))
+
+    return run
+
+
+def test_archive_round_trips_records_across_chunks(tmp_path, run_records):
+    records = run_records()
+    with ArchiveWriter(tmp_path / "run.moar", chunk_rows=3, metadata={"note": "x"}) as writer:
+        for record in records:
+            writer.append(record)
+    run = RunArchive(tmp_path / "run.moar")
+    assert run.run_id == "run" and run.metadata == {"note": "x"} and len(run) == len(records)
+    assert run.models == ["Strong", "Medium"]
+    assert list(run.records()) == records
+    assert run.column("prompts", "prompt_id", 4, 7) == ["p4", "p5", "p6"]
+    assert run.prompt_row("p8") == 8
+    lean = list(run.records(texts=False))
+    assert [r.predictions() for r in lean] == [r.predictions() for r in records]
+    assert {c.text for r in lean for c in r.self_moa} == {""}
+    correct = sum(record.self_result.final_answer == record.reference for record in records)
+    assert run.accuracy(SELF_MOA).correct == correct
+
+
+def test_prompt_row_decompresses_one_bucket_per_lookup(tmp_path, run_records):
+    records = run_records()
+    with ArchiveWriter(tmp_path / "run.moar", chunk_rows=3) as writer:
+        for record in records:
+            writer.append(record)
+    with RunArchive(tmp_path / "run.moar") as run:
+        assert run.prompt_row("p5") == 5 and len(run._prompt_rows) == 1
+        assert [run.prompt_row(r.prompt_id) for r in records] == list(range(len(records)))
+        assert len(run._prompt_rows) == 4
+        with pytest.raises(KeyError):
+            run.prompt_row("missing")
+
+
+def test_failed_write_leaves_no_archive(tmp_path, run_records):
+    with pytest.raises(RuntimeError):
+        with ArchiveWriter(tmp_path / "run.moar") as writer:
+            writer.append(run_records()[0])
+            raise RuntimeError("boom")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_truncated_archive_is_rejected(tmp_path, run_records):
+    path = tmp_path / "run.moar"
+    with ArchiveWriter(path) as writer:
+        writer.append(run_records()[0])
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError, match="truncated"):
+        RunArchive(path)
+
+
+def test_store_answers_cross_run_queries(tmp_path, run_records):
+    store = RunStore(tmp_path)
+    runs = []
+    for strength in (0.0, 1.0):
+        records = run_records(strength)
+        runs.append({r.prompt_id: r.mixed_result.final_answer == r.reference for r in records})
+        with store.writer(chunk_rows=4) as writer:
+            for record in records:
+                writer.append(record)
+    history = store.accuracy_history(last=20)
+    assert [accuracy[MIXED_MOA].correct for _, accuracy in history] == [
+        sum(run.values()) for run in runs
+    ]
+
+    before, after = store.runs()
+    flips = flipped_prompts(before, after, MIXED_MOA)
+    expected = [pid for pid, correct in runs[1].items() if correct != runs[0][pid]]
+    assert expected and [flip.prompt_id for flip in flips] == expected
+    for flip in flips:
+        (_, old, was_right), (_, new, now_right) = store.prompt_history(flip.prompt_id, MIXED_MOA)
+        assert (old, new, now_right) == (flip.before, flip.after, flip.fixed)
+        assert was_right != now_right
+    assert store.get("latest").run_id == after.run_id
+    with pytest.raises(FileNotFoundError, match="no run archive 'missing'"):
+        store.get("missing")
+    with pytest.raises(FileNotFoundError, match="no run archives"):
+        RunStore(tmp_path / "empty").get("latest")
@@ -0,0 +1,97 @@
+import sqlite3
+
+import pytest
+
+from moa.cache import CachedProposer, CandidateCache
+from moa.models import MockModel
+
+PROMPT = {"id": "p", "question": "q", "answer": "10", "distractors": ["5", "7"]}
+
+
+class CountingModel(MockModel):
+    calls = 0
+
+    def generate(self, **kwargs):
+        self.calls += 1
+        return super().generate(**kwargs)
+
+
+def test_disk_cache_serves_repeat_runs_and_only_generates_new_samples(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    first = CountingModel("Demo", strength=0.5)
+    proposer = CachedProposer(first, CandidateCache(path))
+    originals = [proposer.generate(prompt=PROMPT, sample_index=i) for i in range(3)]
+    assert first.calls == 3
+    proposer.cache.close()
+
+    second = CountingModel("Demo", strength=0.5)
+    cache = CandidateCache(path)
+    proposer = CachedProposer(second, cache)
+    rerun = [proposer.generate(prompt=PROMPT, sample_index=i) for i in range(5)]
+    assert second.calls == 2
+    assert cache.stats.disk_hits == 3
+    assert [c.final_answer for c in rerun[:3]] == [c.final_answer for c in originals]
+
+
+def test_config_change_invalidates_model_entries(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = CandidateCache(path)
+    CachedProposer(MockModel("Demo", strength=0.5), cache).generate(prompt=PROMPT, sample_index=0)
+    cache.close()
+    changed = CountingModel("Demo", strength=0.9)
+    CachedProposer(changed, CandidateCache(path)).generate(prompt=PROMPT, sample_index=0)
+    assert changed.calls == 1
+
+
+def test_memory_lru_and_disk_size_eviction(tmp_path):
+    cache = CandidateCache(tmp_path / "cache.sqlite", max_entries=2, max_disk_bytes=1200)
+    proposer = CachedProposer(MockModel("Demo", strength=0.5), cache)
+    for i in range(6):
+        proposer.generate(prompt=PROMPT, sample_index=i)
+    assert len(cache) == 2
+    assert cache.disk_bytes() <= 1200
+    assert cache.stats.evictions > 4
+
+
+def test_disk_byte_total_is_tracked_without_scanning(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = CandidateCache(path, max_disk_bytes=2000, commit_every=4)
+    proposer = CachedProposer(MockModel("Demo", strength=0.5), cache)
+    for i in range(10):
+        proposer.generate(prompt=PROMPT, sample_index=i)
+    cache.close()
+    with sqlite3.connect(str(path)) as db:
+        (actual,) = db.execute("SELECT SUM(LENGTH(payload)) FROM candidates").fetchone()
+    reopened = CandidateCache(path)
+    assert reopened.disk_bytes() == actual <= 2000
+
+
+def test_cached_candidates_are_copies():
+    proposer = CachedProposer(MockModel("Demo", strength=0.5), CandidateCache())
+    first = proposer.generate(prompt=PROMPT, sample_index=0)
+    first.final_answer = "mutated"
+    first.metadata["note"] = "x"
+    again = proposer.generate(prompt=PROMPT, sample_index=0)
+    assert again.final_answer != "mutated" and "note" not in again.metadata
+
+
+def test_batch_calls_go_through_the_cache_and_streams_are_hidden():
+    class BatchCounting(MockModel):
+        batches = []
+
+        def generate_batch(self, prompts, sample_indices, *, temperature=0.7):
+            self.batches.append(([p["id"] for p in prompts], list(sample_indices)))
+            return super().generate_batch(prompts, sample_indices, temperature=temperature)
+
+    model = BatchCounting("Demo", strength=0.5)
+    proposer = CachedProposer(model, CandidateCache())
+    other = dict(PROMPT, id="q")
+    proposer.generate(prompt=PROMPT, sample_index=1)
+    cands = proposer.generate_batch([PROMPT, other], [0, 1])
+    assert model.batches == [(["p"], [0]), (["q"], [0, 1])]
+    assert proposer.generate_batch([PROMPT, other], [0, 1]) == cands
+    assert len(model.batches) == 2
+    assert cands == model.generate_batch([PROMPT, other], [0, 1])
+    assert not hasattr(proposer, "astream")
+    with pytest.raises(AttributeError, match="bypass"):
+        proposer.astream
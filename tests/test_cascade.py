@@ -0,0 +1,42 @@
+import pytest
+
+from moa.cascade import CascadeTier, is_settled, run_cascade
+from moa.models import MockModel
+
+PROMPTS = [
+    {"id": f"p{i}", "question": "q", "answer": str(i), "distractors": [str(i + 1), str(i + 2)]}
+    for i in range(20)
+]
+
+
+def tiers():
+    cheap = [MockModel("Medium", 0.55), MockModel("Weak", 0.4)]
+    return [CascadeTier("cheap", cheap), CascadeTier("strong", [MockModel("Strong", 0.9)], samples=3)]
+
+
+def test_cascade_escalates_only_disagreeing_prompts():
+    report = run_cascade(PROMPTS, tiers())
+    assert [o.prompt_id for o in report.outcomes] == [p["id"] for p in PROMPTS]
+    escalated = [o for o in report.outcomes if o.tier == "strong"]
+    assert 0 < len(escalated) < len(PROMPTS)
+    assert report.tier_calls == {"cheap": 2 * len(PROMPTS), "strong": 3 * len(escalated)}
+    assert report.resolved["cheap"] + report.resolved["strong"] == len(PROMPTS)
+    for outcome in report.outcomes:
+        if outcome.tier == "cheap":
+            assert len(set(c.final_answer for c in outcome.candidates)) == 1
+        else:
+            assert {c.model_name for c in outcome.candidates} == {"Strong"}
+
+
+def test_confidence_threshold_forces_escalation():
+    report = run_cascade(PROMPTS, tiers(), min_confidence=1.0)
+    assert report.resolved == {"strong": len(PROMPTS)}
+
+
+def test_is_settled_thresholds():
+    model = MockModel("M", 0.5)
+    cands = [model.generate(prompt=PROMPTS[0], sample_index=i) for i in range(6)]
+    assert is_settled(cands, agreement=0.01, min_confidence=0.0)
+    assert not is_settled(cands, agreement=0.01, min_confidence=1.01)
+    with pytest.raises(ValueError):
+        run_cascade(PROMPTS, tiers(), agreement=0.0)
@@ -0,0 +1,71 @@
+import json
+import pickle
+
+import pytest
+
+from moa.dataset import PromptDataset
+from moa.runner import RunConfig, build_report, evaluate_prompts, run_sharded
+
+PROMPTS = [
+    {"id": f"p{i}", "question": f"q {i}", "answer": str(i), "distractors": [str(i + 1)]}
+    for i in range(11)
+]
+
+
+@pytest.fixture
+def jsonl(tmp_path):
+    path = tmp_path / "prompts.jsonl"
+    lines = [json.dumps(prompt) for prompt in PROMPTS]
+    lines.insert(3, "   ")
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def test_random_access_and_persisted_index(jsonl):
+    dataset = PromptDataset(jsonl)
+    assert len(dataset) == len(PROMPTS)
+    assert dataset[7] == PROMPTS[7] and dataset[-1] == PROMPTS[-1]
+    assert list(dataset[2:5]) == PROMPTS[2:5]
+    assert jsonl.with_name("prompts.jsonl.idx").exists()
+
+    reloaded = PromptDataset(jsonl)
+    assert isinstance(reloaded._index(), memoryview)
+    assert list(reloaded) == PROMPTS
+    reloaded.close()
+    assert reloaded[4] == PROMPTS[4]
+
+
+def test_views_survive_closing_in_either_order(jsonl):
+    dataset = PromptDataset(jsonl)
+    dataset.shard(0, 2).close()
+    assert dataset[3] == PROMPTS[3]
+    view = dataset[2:5]
+    dataset.close()
+    assert list(view) == PROMPTS[2:5]
+    dataset.close()
+
+
+def test_index_is_rebuilt_after_file_changes(jsonl):
+    assert len(PromptDataset(jsonl)) == len(PROMPTS)
+    with jsonl.open("a", encoding="utf-8") as handle:
+        handle.write("\n" + json.dumps({"id": "extra", "question": "q", "answer": "1"}) + "\n")
+    dataset = PromptDataset(jsonl)
+    assert len(dataset) == len(PROMPTS) + 1
+    assert dataset[-1]["id"] == "extra"
+
+
+def test_contiguous_and_strided_shards_partition_the_dataset(jsonl):
+    dataset = PromptDataset(jsonl)
+    contiguous = [dataset.shard(i, 3) for i in range(3)]
+    assert [len(shard) for shard in contiguous] == [4, 4, 3]
+    assert [p for shard in contiguous for p in shard] == PROMPTS
+    strided = [dataset.shard(i, 3, strided=True) for i in range(3)]
+    assert list(strided[1]) == PROMPTS[1::3]
+    assert list(pickle.loads(pickle.dumps(strided[2]))) == PROMPTS[2::3]
+
+
+def test_sharded_run_over_dataset_matches_single_process(jsonl, demo_models):
+    config = RunConfig(self_samples=3)
+    single = build_report(evaluate_prompts(PROMPTS, demo_models(), config))
+    sharded = run_sharded(PromptDataset(jsonl), demo_models, config, workers=2, shard_size=4)
+    assert [r.predictions() for r in sharded.records] == [r.predictions() for r in single.records]
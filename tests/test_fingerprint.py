@@ -0,0 +1,63 @@
+from moa.fingerprint import PromptIndex, exact_fingerprint
+from moa.runner import RunConfig, build_report, evaluate_prompts, iter_evaluated
+
+QUESTION = "Liam reads 12 pages a day for 5 days while on a long summer holiday. How many pages has he read?"
+
+
+def prompt(prompt_id, question, answer="60"):
+    return {"id": prompt_id, "question": question, "answer": answer, "distractors": ["50", "55"]}
+
+
+def test_exact_fingerprint_ignores_case_punctuation_and_spacing():
+    assert exact_fingerprint(prompt("a", "How  many pages?")) == exact_fingerprint(
+        prompt("b", "how many pages")
+    )
+
+
+def test_index_finds_exact_and_near_duplicates_but_not_other_numbers():
+    index = PromptIndex(threshold=0.5)
+    assert index.match(prompt("a", QUESTION)) is None
+    exact = index.match(prompt("b", QUESTION.upper()))
+    assert (exact.canonical_id, exact.kind) == ("a", "exact")
+    near = index.match(prompt("c", QUESTION.replace("long summer", "long winter")))
+    assert near.canonical_id == "a" and near.kind == "near" and near.similarity >= 0.5
+    assert index.match(prompt("d", QUESTION.replace("12", "13"))) is None
+    assert (index.stats.prompts, index.stats.duplicates) == (4, 2)
+    assert index.stats.dedup_ratio == 0.5
+
+
+def test_dedup_reuses_candidates_for_duplicate_prompts(demo_models):
+    prompts = [prompt("a", QUESTION), prompt("b", "q"), prompt("c", QUESTION + "  ")]
+    plain = evaluate_prompts(prompts, demo_models(), RunConfig(self_samples=3))
+    models = demo_models()
+    records = evaluate_prompts(prompts, models, RunConfig(self_samples=3, dedup=True))
+    assert [r.duplicate_of for r in records] == [None, None, "a"]
+    assert records[2].predictions() == plain[0].predictions()
+    assert {cand.prompt_id for cand in records[2].self_moa} == {"c"}
+    assert records[2].self_result.prompt_id == "c"
+    assert build_report(records).dedup_summary() == (1, 1 + 2 + 3)
+
+
+def test_iter_evaluated_shares_the_index_across_batches(demo_models):
+    prompts = [prompt(str(i), QUESTION) for i in range(4)]
+    config = RunConfig(self_samples=2, dedup=True)
+    records = list(iter_evaluated(prompts, demo_models(), config, batch_size=1))
+    assert [r.duplicate_of for r in records] == [None, "0", "0", "0"]
+
+
+def test_index_evicts_the_least_recently_used_attachment():
+    index = PromptIndex(max_attached=2)
+    index.attach("a", 1)
+    index.attach("b", 2)
+    assert index.attached("a") == 1
+    index.attach("c", 3)
+    assert [index.attached(key) for key in "abc"] == [1, None, 3]
+
+
+def test_duplicates_of_an_evicted_prompt_are_generated_again(demo_models):
+    prompts = [prompt("a", QUESTION), prompt("b", "q"), prompt("c", QUESTION), prompt("d", "q")]
+    config = RunConfig(self_samples=2, dedup=True, dedup_cache_size=1)
+    records = list(iter_evaluated(prompts, demo_models(), config, batch_size=1))
+    assert [r.duplicate_of for r in records] == [None, None, None, "b"]
+    plain = evaluate_prompts(prompts[:1], demo_models(), RunConfig(self_samples=2))
+    assert records[2].predictions() == plain[0].predictions()
@@ -0,0 +1,108 @@
+import asyncio
+import random
+
+from moa.generation import (
+    GenerationRequest,
+    GenerationStats,
+    HedgePolicy,
+    fan_out,
+    generate_all,
+    run_generation,
+)
+from moa.models import LatencyModel, MockModel
+
+PROMPT = {"id": "p", "question": "q", "answer": "10", "distractors": ["5", "7"]}
+
+
+class SlowModel(MockModel):
+    def __init__(self, *args, delays, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delays = delays
+        self.in_flight = 0
+        self.peak = 0
+
+    async def agenerate(self, *, prompt, sample_index, temperature=0.7):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delays[sample_index % len(self.delays)])
+        self.in_flight -= 1
+        return self.generate(prompt=prompt, sample_index=sample_index, temperature=temperature)
+
+
+def test_results_follow_request_order_despite_latency():
+    model = SlowModel("Slow", strength=0.5, delays=[0.03, 0.0, 0.01])
+    requests = fan_out([PROMPT], [model], samples=6)
+    candidates = run_generation(requests, max_concurrency=6)
+    assert [c.sample_index for c in candidates] == list(range(6))
+    expected = [model.generate(prompt=PROMPT, sample_index=i) for i in range(6)]
+    assert [c.final_answer for c in candidates] == [c.final_answer for c in expected]
+
+
+def test_per_model_limit_caps_in_flight_calls():
+    capped = SlowModel("Capped", strength=0.5, delays=[0.01])
+    free = SlowModel("Free", strength=0.5, delays=[0.01])
+    requests = fan_out([PROMPT], [capped, free], samples=5)
+    asyncio.run(generate_all(requests, max_concurrency=10, per_model_limits={"Capped": 2}))
+    assert capped.peak == 2
+    assert free.peak == 5
+
+
+def test_hedged_request_beats_straggler():
+    model = SlowModel("Slow", strength=0.5, delays=[0.2])
+    calls = []
+
+    async def agenerate(*, prompt, sample_index, temperature=0.7):
+        calls.append(sample_index)
+        await asyncio.sleep(0.2 if len(calls) == 1 else 0.0)
+        return model.generate(prompt=prompt, sample_index=sample_index, temperature=temperature)
+
+    model.agenerate = agenerate
+    stats = GenerationStats()
+    hedge = HedgePolicy(initial_delay_s=0.01)
+    candidates = run_generation(fan_out([PROMPT], [model], samples=1), hedge=hedge, stats=stats)
+    assert candidates[0].final_answer == model.generate(prompt=PROMPT, sample_index=0).final_answer
+    assert (stats.hedges, stats.hedge_wins, stats.calls) == (1, 1, 2)
+    assert "Slow" not in stats.latencies
+
+
+def test_hedge_threshold_tracks_primary_latency_only():
+    model = SlowModel("Slow", strength=0.5, delays=[0.05, 0.0])
+    stats = GenerationStats()
+    hedge = HedgePolicy(initial_delay_s=0.02)
+    run_generation(fan_out([PROMPT], [model], samples=2), hedge=hedge, stats=stats)
+    assert stats.hedges == 1 and stats.hedge_wins == 0
+    assert stats.latency_quantile("Slow", 0.99) >= 0.05
+
+
+def test_hedges_wait_for_a_free_slot():
+    model = SlowModel("Slow", strength=0.5, delays=[0.05])
+    stats = GenerationStats()
+    hedge = HedgePolicy(initial_delay_s=0.01)
+    requests = fan_out([PROMPT], [model], samples=4)
+    run_generation(requests, max_concurrency=2, hedge=hedge, stats=stats)
+    assert stats.hedges == 4
+    assert model.peak == 2
+    capped = SlowModel("Capped", strength=0.5, delays=[0.05])
+    requests = fan_out([PROMPT], [capped], samples=2)
+    asyncio.run(generate_all(requests, per_model_limits={"Capped": 1}, hedge=hedge))
+    assert capped.peak == 1
+
+
+def test_deadline_drops_late_samples():
+    model = SlowModel("Slow", strength=0.5, delays=[0.0, 0.5])
+    requests = [
+        GenerationRequest(model, PROMPT, i, deadline_s=0.05 if i else None) for i in range(4)
+    ]
+    stats = GenerationStats()
+    candidates = run_generation(requests, stats=stats)
+    assert [c is not None for c in candidates] == [True, False, True, False]
+    assert stats.deadline_misses == 2
+
+
+def test_mock_latency_model_is_seeded_per_attempt():
+    latency = LatencyModel(median_s=0.01, straggler_rate=0.5, straggler_s=1.0)
+    draws = [latency.sample(random.Random(f"13:latency:p:0:{attempt}")) for attempt in range(20)]
+    assert any(d > 1.0 for d in draws) and any(d < 0.1 for d in draws)
+    model = MockModel("Lagged", strength=0.5, latency=LatencyModel(median_s=0.001))
+    cand = asyncio.run(model.agenerate(prompt=PROMPT, sample_index=2))
+    assert cand == model.generate(prompt=PROMPT, sample_index=2)
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from moa.generation import fan_out, generate_all
+from moa.http_proposer import HttpProposer, ProposerHTTPError, RetryPolicy
+from moa.mock_server import MockModelServer
+from moa.models import MockModel
+
+PROMPT = {"id": "p", "question": "q", "answer": "10", "distractors": ["5", "7"]}
+
+
+def test_http_proposer_matches_local_model_and_reuses_connections():
+    model = MockModel("Demo", strength=0.6)
+    with MockModelServer({"Demo": model}, latency_s=0.002) as server:
+        with HttpProposer("Demo", server.base_url, pool_size=4) as proposer:
+            remote = proposer.generate_many([PROMPT], range(12))
+            batch = proposer.generate_batch([PROMPT], [0, 1, 2])
+            assert proposer.connections_opened <= 4
+    local = [model.generate(prompt=PROMPT, sample_index=i) for i in range(12)]
+    assert remote == local
+    assert batch == local[:3]
+
+
+def test_http_proposer_retries_injected_failures_and_works_with_engine():
+    model = MockModel("Demo", strength=0.6)
+    retry = RetryPolicy(max_attempts=8, backoff_s=0.001)
+    with MockModelServer({"Demo": model}, failure_rate=0.3, seed=1) as server:
+        with HttpProposer("Demo", server.base_url, retry=retry, seed=0) as proposer:
+            requests = fan_out([PROMPT], [proposer], samples=10)
+            candidates = asyncio.run(generate_all(requests, max_concurrency=4))
+            assert proposer.retries == server.failures_injected > 0
+    assert [c.final_answer for c in candidates] == [
+        model.generate(prompt=PROMPT, sample_index=i).final_answer for i in range(10)
+    ]
+
+
+def test_http_proposer_does_not_retry_client_errors():
+    with MockModelServer({}) as server:
+        with HttpProposer("Missing", server.base_url) as proposer:
+            with pytest.raises(ProposerHTTPError) as excinfo:
+                proposer.generate(prompt=PROMPT, sample_index=0)
+            assert excinfo.value.status == 404
+            assert proposer.retries == 0
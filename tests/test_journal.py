@@ -0,0 +1,57 @@
+import pytest
+
+from moa.journal import JournalMismatchError, RunJournal
+from moa.models import MockModel
+from moa.runner import RunConfig, evaluate_prompts, iter_evaluated
+
+
+class Models:
+    strong = MockModel("Strong", 0.8)
+    medium = MockModel("Medium", 0.4)
+
+    def mixed(self):
+        return [self.strong, self.medium]
+
+
+PROMPTS = [
+    {"id": f"p{i}", "question": "q", "answer": str(i), "distractors": [str(i + 1)]}
+    for i in range(5)
+]
+
+
+def test_journal_round_trips_records(tmp_path):
+    config = RunConfig(self_samples=3)
+    records = evaluate_prompts(PROMPTS, Models(), config)
+    with RunJournal(tmp_path / "run.jsonl", config=config) as journal:
+        for record in records:
+            journal.append(record)
+        restored = list(journal.records())
+    assert restored == records
+    assert [list(r.self_result.vote_counts) for r in restored] == [
+        list(r.self_result.vote_counts) for r in records
+    ]
+
+
+def test_resume_skips_completed_prompts_and_drops_torn_line(tmp_path):
+    path = tmp_path / "run.jsonl"
+    config = RunConfig(self_samples=3)
+    with RunJournal(path, config=config) as journal:
+        for record in iter_evaluated(PROMPTS[:3], Models(), config, batch_size=2):
+            journal.append(record)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"type": "prompt", "rec')
+
+    with RunJournal(path, config=config, resume=True) as journal:
+        assert journal.completed == {"p0", "p1", "p2"}
+        pending = [p for p in PROMPTS if p["id"] not in journal.completed]
+        for record in iter_evaluated(pending, Models(), config):
+            journal.append(record)
+        resumed = list(journal.records())
+    assert resumed == evaluate_prompts(PROMPTS, Models(), config)
+
+
+def test_resume_rejects_changed_config(tmp_path):
+    path = tmp_path / "run.jsonl"
+    RunJournal(path, config=RunConfig(self_samples=3)).close()
+    with pytest.raises(JournalMismatchError):
+        RunJournal(path, config=RunConfig(self_samples=4), resume=True)
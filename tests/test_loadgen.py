@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from moa.loadgen import (
+    LoadReport,
+    PromptTiming,
+    format_load_curve,
+    load_trace,
+    poisson_arrivals,
+    run_load,
+    scale_arrivals,
+)
+from moa.models import LatencyModel, MockModel
+
+PROMPTS = [
+    {"id": f"p{i}", "question": "q", "answer": str(i), "distractors": [str(i + 1)]}
+    for i in range(3)
+]
+
+
+def test_poisson_arrivals_are_seeded_and_match_the_rate():
+    arrivals = poisson_arrivals(50.0, 2000, seed=3)
+    assert arrivals == poisson_arrivals(50.0, 2000, seed=3)
+    assert all(b > a for a, b in zip(arrivals, arrivals[1:]))
+    assert len(arrivals) / arrivals[-1] == pytest.approx(50.0, rel=0.1)
+
+
+def test_trace_replay_is_relative_and_rescaled(tmp_path):
+    path = tmp_path / "trace.txt"
+    path.write_text('# arrivals\n10.0\n{"arrival_s": 12.0}\n\n11.0\n', encoding="utf-8")
+    assert load_trace(path) == [0.0, 1.0, 2.0]
+    assert scale_arrivals([0.0, 1.0, 2.0], 4.0) == [0.0, 0.25, 0.5]
+
+
+def test_open_loop_load_queues_prompts_beyond_capacity():
+    model = MockModel("Strong", 0.8, latency=LatencyModel(median_s=0.02, sigma=0.0))
+    light = run_load(PROMPTS, [model], [0.0, 0.05, 0.1], samples=2, max_concurrency=4)
+    burst = run_load(PROMPTS, [model], [0.0] * 6, samples=2, max_concurrency=2)
+    assert [t.prompt_id for t in burst.timings] == ["p0", "p1", "p2"] * 2
+    assert len(burst.results) == 6 and burst.results[0].prompt_id == "p0"
+    assert light.latency_quantile(0.99, "queued") < 0.01
+    assert burst.latency_quantile(0.99, "queued") >= 0.09
+    for timing in burst.timings:
+        assert timing.generation_s >= 0.019 and timing.aggregation_s >= 0.0
+
+
+def test_replayed_prompts_draw_fresh_latencies():
+    class RecordingLatency(LatencyModel):
+        def sample(self, rng):
+            drawn.append(super().sample(rng))
+            return drawn[-1]
+
+    drawn = []
+    latency = RecordingLatency(median_s=0.002, straggler_rate=0.3, straggler_s=0.02)
+    model = MockModel("Strong", 0.8, latency=latency)
+    run_load(PROMPTS[:1], [model], [0.03 * i for i in range(20)])
+    assert len(set(drawn)) == 20
+    assert 0 < sum(value > 0.02 for value in drawn) < 20
+
+
+def test_models_sharing_a_seed_draw_their_own_latencies():
+    class RecordingLatency(LatencyModel):
+        def sample(self, rng):
+            drawn.setdefault(id(self), []).append(super().sample(rng))
+            return drawn[id(self)][-1]
+
+    drawn = {}
+    models = [
+        MockModel(name, 0.8, latency=RecordingLatency(median_s=0.002)) for name in ("A", "B")
+    ]
+    run_load(PROMPTS[:1], models, [0.0, 0.01])
+    first, second = drawn.values()
+    assert len(first) == len(second) == 2 and not set(first) & set(second)
+
+
+def test_latency_counts_from_the_intended_arrival():
+    class BlockingModel(MockModel):
+        async def agenerate(self, **kwargs):
+            if kwargs["prompt"]["id"] == "p0":
+                time.sleep(0.1)  # stalls the event loop past the next arrival
+            return self.generate(**kwargs)
+
+    report = run_load(PROMPTS, [BlockingModel("Strong", 0.8)], [0.0, 0.02], max_concurrency=4)
+    late = report.timings[1]
+    assert late.arrival_s == pytest.approx(0.02)
+    assert late.queued_s >= 0.07
+
+
+def test_load_curve_flags_first_saturated_rate():
+    def report(rate, total_s):
+        timings = [PromptTiming(f"p{i}", i / rate, 0.0, total_s, 0.0) for i in range(10)]
+        return LoadReport(rate, timings, arrival_span_s=9 / rate, duration_s=9 / rate + total_s)
+
+    reports = [report(10.0, 0.05), report(20.0, 0.2), report(40.0, 0.5)]
+    assert reports[0].slo_attainment(0.1) == 1.0 and reports[1].slo_attainment(0.1) == 0.0
+    lines = format_load_curve(reports, slo_s=0.1)
+    assert len(lines) == 5
+    assert "saturated" not in lines[2]
+    assert lines[3].startswith("| 20 (saturated)") and "saturated" not in lines[4]
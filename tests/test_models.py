@@ -14,3 +14,45 @@ def test_scripted_final_answers_override_correctness():
     assert not cand0.is_correct
     assert cand1.final_answer == "10"
     assert cand1.is_correct
+
+
+def test_generate_batch_matches_per_call_generation():
+    prompts = [
+        {"id": f"p{i}", "question": "q", "answer": "10", "distractors": ["5", "7"]}
+        for i in range(3)
+    ]
+    model = MockModel("Demo", strength=0.6, scripted_final_answers={"p1": ["7", "10"]})
+    batch = model.generate_batch(prompts, [0, 2, 5], temperature=0.3)
+    expected = [
+        model.generate(prompt=prompt, sample_index=i, temperature=0.3)
+        for prompt in prompts
+        for i in (0, 2, 5)
+    ]
+    assert batch == expected
+
+
+def test_counter_rng_mode_is_reproducible_and_keeps_scripts():
+    prompts = [
+        {"id": f"p{i}", "question": "q", "answer": "10", "distractors": ["5", "7"]}
+        for i in range(4)
+    ]
+    model = MockModel(
+        "Demo", strength=0.6, rng_mode="counter", scripted_final_answers={"p1": ["7", "10"]}
+    )
+    twin = MockModel("Demo", strength=0.6, rng_mode="counter")
+    indices = list(range(0, 200, 7))
+    batch = model.generate_batch(prompts, indices)
+    assert batch == [
+        model.generate(prompt=prompt, sample_index=i) for prompt in prompts for i in indices
+    ]
+    assert [c.final_answer for c in batch[len(indices) : len(indices) + 2]] == ["7", "10"]
+    assert twin.generate(prompt=prompts[2], sample_index=21) == batch[2 * len(indices) + 3]
+    assert model.config_fingerprint() != MockModel("Demo", strength=0.6).config_fingerprint()
+
+
+def test_counter_rng_matches_strength_and_spreads_misses():
+    prompt = {"id": "p", "question": "q", "answer": "10", "distractors": ["5", "7"]}
+    model = MockModel("Demo", strength=0.7, rng_mode="counter")
+    answers = [c.final_answer for c in model.generate_batch([prompt], range(4000))]
+    assert abs(answers.count("10") / 4000 - 0.7) < 0.03
+    assert abs(answers.count("5") - answers.count("7")) < 120
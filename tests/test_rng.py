@@ -0,0 +1,18 @@
+import pytest
+
+from moa import rng
+from moa.rng import stream_key, uniform, uniforms
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_vectorized_uniforms_match_scalar_draws(monkeypatch, use_numpy):
+    if use_numpy and rng.np is None:
+        pytest.skip("NumPy not installed")
+    if not use_numpy:
+        monkeypatch.setattr(rng, "np", None)
+    key = stream_key(13, "Demo", "p", 0.7)
+    counters = list(range(0, 1000, 3))
+    draws = uniforms(key, counters)
+    assert draws == [uniform(key, counter) for counter in counters]
+    assert all(0.0 <= draw < 1.0 for draw in draws)
+    assert abs(sum(draws) / len(draws) - 0.5) < 0.05
@@ -0,0 +1,22 @@
+from moa.models import LatencyModel
+from moa.runner import STRATEGIES, RunConfig, build_report, evaluate_prompts, run_sharded
+
+
+def test_sharded_run_matches_single_process(demo_models, demo_prompts):
+    config = RunConfig(self_samples=5, sequential_window=2)
+    single = build_report(evaluate_prompts(demo_prompts, demo_models(), config))
+    sharded = run_sharded(iter(demo_prompts), demo_models, config, workers=2, shard_size=3)
+    assert [r.prompt_id for r in sharded.records] == [p["id"] for p in demo_prompts]
+    assert [r.predictions() for r in sharded.records] == [r.predictions() for r in single.records]
+    for name in STRATEGIES:
+        assert sharded.evaluations[name] == single.evaluations[name]
+
+
+def test_prompt_deadline_marks_partial_aggregations(demo_models, demo_prompts):
+    models = demo_models()
+    models.medium.latency = LatencyModel(median_s=1.0, sigma=0.0)
+    config = RunConfig(self_samples=3, prompt_deadline_s=0.2)
+    record = evaluate_prompts(demo_prompts[:2], models, config)[0]
+    assert [c.model_name for c in record.mixed] == ["Strong"]
+    assert record.mixed_result.partial
+    assert not record.self_result.partial and len(record.self_moa) == 3
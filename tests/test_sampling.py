@@ -0,0 +1,34 @@
+from moa.aggregation import aggregate_flat
+from moa.models import MockModel
+from moa.sampling import AdaptiveSampler
+
+PROMPT = {"id": "p", "question": "q", "answer": "12", "distractors": ["9"]}
+
+
+def test_sampler_stops_once_majority_cannot_change():
+    model = MockModel("Demo", strength=0.9, scripted_final_answers={"p": ["12"] * 8})
+    candidates, report = AdaptiveSampler(model, budget=8).sample(PROMPT)
+    assert report.samples_drawn == 5
+    assert report.samples_saved == 3
+    assert report.stop_reason == "decided"
+    full = [model.generate(prompt=PROMPT, sample_index=i) for i in range(8)]
+    assert (
+        aggregate_flat(candidates, strategy_name="a").final_answer
+        == aggregate_flat(full, strategy_name="b").final_answer
+    )
+
+
+def test_sampler_uses_full_budget_when_votes_stay_close():
+    model = MockModel(
+        "Demo", strength=0.5, scripted_final_answers={"p": ["9", "12", "9", "12"]}
+    )
+    _, report = AdaptiveSampler(model, budget=4).sample(PROMPT)
+    assert report.samples_drawn == 4
+    assert report.stop_reason == "budget"
+
+
+def test_confidence_test_can_stop_before_decision():
+    model = MockModel("Demo", strength=0.9, scripted_final_answers={"p": ["12"] * 20})
+    _, report = AdaptiveSampler(model, budget=20, confidence=0.95).sample(PROMPT)
+    assert report.stop_reason == "confident"
+    assert report.samples_drawn == 5
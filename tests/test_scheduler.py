@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from moa.generation import GenerationRequest, fan_out
+from moa.models import MockModel
+from moa.scheduler import BudgetExceededError, ModelQuota, ProposerScheduler
+
+PROMPTS = [{"id": f"p{i}", "question": "q", "answer": "10", "distractors": ["5"]} for i in range(4)]
+
+
+class SlowModel(MockModel):
+    def __init__(self, *args, delay=0.01, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.order = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def agenerate(self, *, prompt, sample_index, temperature=0.7):
+        self.order.append(prompt["id"])
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return self.generate(prompt=prompt, sample_index=sample_index, temperature=temperature)
+
+
+def test_rate_limit_and_concurrency_are_enforced():
+    fast = SlowModel("Fast", 0.5, delay=0.0)
+    capped = SlowModel("Capped", 0.5, delay=0.02)
+    scheduler = ProposerScheduler(
+        {
+            "Fast": ModelQuota(requests_per_second=100, burst=2),
+            "Capped": ModelQuota(max_concurrency=2),
+        }
+    )
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        cands = await scheduler.run(fan_out(PROMPTS[:1], [fast, capped], samples=6))
+        return cands, loop.time() - start
+
+    cands, elapsed = asyncio.run(main())
+    assert [c.model_name for c in cands] == ["Fast"] * 6 + ["Capped"] * 6
+    # 2 burst tokens then 4 more at 100/s needs at least ~40ms.
+    assert elapsed >= 0.035
+    assert capped.peak == 2
+    stats = scheduler.stats
+    assert stats["Fast"].calls == 6
+    assert stats["Fast"].queued_s > 0
+    assert stats["Capped"].executing_s >= 0.1
+
+
+def test_priority_orders_work_across_prompts():
+    model = SlowModel("Demo", 0.5, delay=0.005)
+    scheduler = ProposerScheduler({"Demo": ModelQuota(max_concurrency=1)})
+    requests = [GenerationRequest(model, prompt, 0) for prompt in PROMPTS]
+    asyncio.run(scheduler.run(requests, priorities=[3, 1, 2, 0]))
+    assert model.order == ["p3", "p1", "p2", "p0"]
+
+
+def test_budget_rejects_calls_past_the_limit():
+    model = SlowModel("Demo", 0.5, delay=0.0)
+    scheduler = ProposerScheduler({"Demo": ModelQuota(cost_per_call=0.4)}, budget=1.0)
+    requests = fan_out(PROMPTS[:1], [model], samples=3)
+    with pytest.raises(BudgetExceededError):
+        asyncio.run(scheduler.run(requests))
+    assert scheduler.stats["Demo"].calls == 2
+    assert scheduler.stats["Demo"].rejected == 1
+    assert scheduler.spent == pytest.approx(0.8)
+
+
+def test_cancellation_right_after_grant_releases_the_slot():
+    model = SlowModel("Demo", 0.5, delay=0.0)
+    scheduler = ProposerScheduler({}, max_concurrency=1)
+    grant = scheduler._grant_next
+    victims = []
+
+    def grant_then_cancel(now):
+        granted = grant(now)
+        if granted and victims and not victims[0].done():
+            victims.pop().cancel()
+        return granted
+
+    scheduler._grant_next = grant_then_cancel
+
+    async def main():
+        victim = scheduler.submit(GenerationRequest(model, PROMPTS[0], 0))
+        victims.append(asyncio.ensure_future(victim))
+        survivor = scheduler.submit(GenerationRequest(model, PROMPTS[1], 0))
+        return await asyncio.wait_for(survivor, timeout=1.0)
+
+    assert asyncio.run(main()).prompt_id == "p1"
+    assert scheduler._active == 0
+    assert model.order == ["p1"]
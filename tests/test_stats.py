@@ -0,0 +1,50 @@
+import pytest
+
+from moa import stats
+from moa.stats import bootstrap_accuracy, correctness, paired_bootstrap
+
+
+def test_correctness_normalizes_answers():
+    flags = correctness([" 12", "Nine", "7"], ["12", "nine", "8"])
+    assert list(flags) == [1, 1, 0]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_bootstrap_interval_brackets_accuracy(monkeypatch, use_numpy):
+    if use_numpy and stats.np is None:
+        pytest.skip("NumPy not installed")
+    if not use_numpy:
+        monkeypatch.setattr(stats, "np", None)
+    correct = [1] * 70 + [0] * 30
+    interval = bootstrap_accuracy(correct, resamples=400, seed=3)
+    assert interval.estimate == pytest.approx(0.7)
+    assert 0.55 < interval.low < 0.7 < interval.high < 0.85
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_paired_bootstrap_detects_consistent_improvement(monkeypatch, use_numpy):
+    if use_numpy and stats.np is None:
+        pytest.skip("NumPy not installed")
+    if not use_numpy:
+        monkeypatch.setattr(stats, "np", None)
+    baseline = [0] * 40 + [1] * 60
+    improved = [1] * 40 + [1] * 60
+    comparison = paired_bootstrap(baseline, improved, resamples=300)
+    assert comparison.difference == pytest.approx(0.4)
+    assert comparison.interval.low > 0
+    assert comparison.significant
+
+    tied = paired_bootstrap(baseline, baseline, resamples=300)
+    assert tied.difference == 0.0
+    assert not tied.significant
+
+
+def test_pure_python_bootstrap_scales_with_categories_not_prompts(monkeypatch):
+    monkeypatch.setattr(stats, "np", None)
+    correct = [1] * 600_000 + [0] * 400_000
+    interval = bootstrap_accuracy(correct, resamples=2000, seed=1)
+    assert 0.598 < interval.low < 0.6 < interval.high < 0.602
+    improved = [1] * 800_000 + [0] * 200_000
+    comparison = paired_bootstrap(correct, improved, resamples=2000, seed=1)
+    assert comparison.difference == pytest.approx(0.2)
+    assert 0.199 < comparison.interval.low < 0.2 < comparison.interval.high < 0.201
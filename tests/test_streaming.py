@@ -0,0 +1,92 @@
+import asyncio
+
+from moa.aggregation import aggregate_flat
+from moa.models import MockModel
+from moa.streaming import StreamingAnswerExtractor, stream_self_moa
+
+PROMPT = {"id": "p", "question": "q", "answer": "10", "distractors": ["5", "7"]}
+
+
+class StaggeredModel(MockModel):
+    async def astream(self, *, prompt, sample_index, temperature=0.7):
+        await asyncio.sleep(0.01 * sample_index)
+        async for chunk in super().astream(
+            prompt=prompt, sample_index=sample_index, temperature=temperature
+        ):
+            yield chunk
+
+
+def test_extractor_detects_answer_before_stream_ends():
+    extractor = StreamingAnswerExtractor()
+    chunks = ["Reasoning ", "here.\nFinal ", "Answer: ", "42", "\n", "Extra ", "chatter"]
+    seen = [extractor.feed(chunk) for chunk in chunks]
+    assert seen.index("42") == 4
+    assert extractor.finish() == "42"
+
+
+def test_extractor_settles_unterminated_answer_on_finish():
+    extractor = StreamingAnswerExtractor()
+    assert extractor.feed("Final Answer: 1") is None
+    assert extractor.finish() == "1"
+
+
+def test_extractor_keeps_multi_word_answers_split_across_chunks():
+    extractor = StreamingAnswerExtractor()
+    chunks = ["Final Answer: ", "$1,200 ", "per ", "month", "\n"]
+    assert [extractor.feed(chunk) for chunk in chunks] == [None] * 4 + ["$1,200 per month"]
+    unterminated = StreamingAnswerExtractor()
+    assert unterminated.feed("Final Answer: New ") is None
+    assert unterminated.feed("York") is None
+    assert unterminated.finish() == "New York"
+
+
+def test_mock_stream_reassembles_generated_text():
+    model = MockModel("Strong", strength=0.8)
+
+    async def collect():
+        return "".join([chunk async for chunk in model.astream(prompt=PROMPT, sample_index=3)])
+
+    assert asyncio.run(collect()) == model.generate(prompt=PROMPT, sample_index=3).text + "\n"
+
+
+def test_mock_streams_are_closed_once_the_answer_line_ends():
+    class TrackingModel(MockModel):
+        exhausted = 0
+
+        async def astream(self, **kwargs):
+            async for chunk in super().astream(**kwargs):
+                yield chunk
+            self.exhausted += 1
+
+    model = TrackingModel("Weak", strength=0.4)
+    candidates, result, report = asyncio.run(
+        stream_self_moa(model, PROMPT, samples=4, strategy_name="Self-MoA", early_stop=False)
+    )
+    assert report.completed == 4 and model.exhausted == 0
+    full = [model.generate(prompt=PROMPT, sample_index=i) for i in range(4)]
+    assert result == aggregate_flat(full, strategy_name="Self-MoA")
+
+
+def test_stream_self_moa_matches_full_vote_and_cancels_decided_streams():
+    model = StaggeredModel("Strong", strength=1.0, token_latency_s=0.001)
+    full = [model.generate(prompt=PROMPT, sample_index=i) for i in range(6)]
+    candidates, result, report = asyncio.run(
+        stream_self_moa(model, PROMPT, samples=6, strategy_name="Self-MoA")
+    )
+    assert result.final_answer == aggregate_flat(full, strategy_name="Self-MoA").final_answer
+    assert report.stop_reason == "decided"
+    assert report.cancelled > 0
+    assert report.completed + report.cancelled == 6
+    assert report.tokens_received < sum(len(c.text.split()) for c in full)
+    assert [c.final_answer for c in candidates] == ["10"] * report.completed
+
+
+def test_stream_self_moa_without_early_stop_completes_every_stream():
+    model = MockModel("Weak", strength=0.4)
+    candidates, result, report = asyncio.run(
+        stream_self_moa(model, PROMPT, samples=5, strategy_name="Self-MoA", early_stop=False)
+    )
+    full = [model.generate(prompt=PROMPT, sample_index=i) for i in range(5)]
+    assert [c.final_answer for c in candidates] == [c.final_answer for c in full]
+    assert result.vote_counts == aggregate_flat(full, strategy_name="Self-MoA").vote_counts
+    assert report.stop_reason == "complete" and report.cancelled == 0
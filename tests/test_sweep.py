@@ -0,0 +1,46 @@
+from moa.aggregation import aggregate_flat, aggregate_sequential
+from moa.eval import exact_match
+from moa.models import MockModel
+from moa.runner import SELF_MOA
+from moa.sweep import sweep_self_moa
+
+PROMPTS = [
+    {"id": f"p{i}", "question": "q", "answer": str(i), "distractors": [str(i + 1), str(i + 2)]}
+    for i in range(12)
+]
+
+
+def test_sweep_matches_independent_runs_per_grid_point():
+    model = MockModel("Strong", strength=0.55)
+    result = sweep_self_moa(PROMPTS, model, sample_grid=[1, 3, 6], window_grid=[2, 4])
+    assert result.calls_made == 6 * len(PROMPTS)
+    assert len(result.points) == 3 * 3
+    for point in result.points:
+        correct = 0
+        for prompt in PROMPTS:
+            cands = [model.generate(prompt=prompt, sample_index=i) for i in range(point.samples)]
+            if point.window is None:
+                agg = aggregate_flat(cands, strategy_name=SELF_MOA)
+            else:
+                agg = aggregate_sequential(cands, window_size=point.window, strategy_name="seq")
+            correct += exact_match(agg.final_answer, prompt["answer"])
+        assert point.correct == correct, point.label
+
+
+def test_pareto_frontier_is_monotone_in_cost_and_accuracy():
+    model = MockModel("Strong", strength=0.6)
+    result = sweep_self_moa(PROMPTS, model, sample_grid=[1, 2, 4, 8], window_grid=[2])
+    frontier = result.pareto_frontier()
+    assert frontier[0].samples == 1
+    assert all(a.cost < b.cost and a.accuracy < b.accuracy for a, b in zip(frontier, frontier[1:]))
+
+
+
+def test_calls_saved_charges_one_standalone_run_per_samples_and_window():
+    model = MockModel("Strong", strength=0.6)
+    result = sweep_self_moa(PROMPTS, model, sample_grid=[1, 2, 4, 8], window_grid=[2, 4])
+    assert result.calls_made == 8 * len(PROMPTS)
+    assert result.standalone_calls == 2 * (1 + 2 + 4 + 8) * len(PROMPTS)
+    flat_only = sweep_self_moa(PROMPTS, model, sample_grid=[1, 2, 4, 8], window_grid=[])
+    assert flat_only.standalone_calls == (1 + 2 + 4 + 8) * len(PROMPTS)
+    assert flat_only.calls_saved == 7 * len(PROMPTS)
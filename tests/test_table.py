@@ -0,0 +1,41 @@
+from moa.aggregation import aggregate_flat, aggregate_sequential
+from moa.models import MockModel
+from moa.table import CandidateTable
+
+PROMPT = {"id": "p", "question": "q", "answer": "10", "distractors": ["5", "7"]}
+
+
+def make_candidates():
+    model = MockModel("Demo", strength=0.5)
+    other = MockModel("Other", strength=0.3)
+    cands = [model.generate(prompt=PROMPT, sample_index=i) for i in range(9)]
+    cands += [other.generate(prompt=PROMPT, sample_index=i) for i in range(3)]
+    return cands
+
+
+def test_table_round_trips_candidates():
+    cands = make_candidates()
+    table = CandidateTable.from_candidates(cands, keep_text=True)
+    assert len(table) == len(cands)
+    assert table.to_candidates() == cands
+    assert len(table.model_values) == 2
+
+
+def test_lazy_text_uses_loader():
+    model = MockModel("Demo", strength=0.5)
+    cands = [model.generate(prompt=PROMPT, sample_index=i) for i in range(3)]
+    table = CandidateTable.from_candidates(
+        cands,
+        text_loader=lambda _pid, _name, index: model.generate(prompt=PROMPT, sample_index=index).text,
+    )
+    assert table[2].text == cands[2].text
+
+
+def test_aggregators_accept_tables_natively():
+    cands = make_candidates()
+    shuffled = cands[::-1]
+    table = CandidateTable.from_candidates(shuffled)
+    assert aggregate_flat(table, strategy_name="flat") == aggregate_flat(shuffled, strategy_name="flat")
+    assert aggregate_sequential(table, window_size=4, strategy_name="seq") == aggregate_sequential(
+        shuffled, window_size=4, strategy_name="seq"
+    )
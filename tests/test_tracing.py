@@ -0,0 +1,39 @@
+from moa import tracing
+from moa.aggregation import aggregate_flat
+from moa.models import MockModel
+from moa.tracing import JsonTraceRecorder, MetricsCollector
+
+PROMPT = {"id": "p", "question": "q", "answer": "10", "distractors": ["5", "7"]}
+
+
+def test_span_is_shared_noop_without_hooks():
+    assert not tracing.enabled()
+    assert tracing.span("a") is tracing.span("b")
+
+
+def test_collector_and_recorder_capture_pipeline_stages():
+    collector = MetricsCollector()
+    recorder = JsonTraceRecorder()
+    tracing.register_hook(collector)
+    tracing.register_hook(recorder)
+    try:
+        model = MockModel("Demo", strength=0.5, scripted_final_answers={"p": ["10", "10", "5"]})
+        cands = [model.generate(prompt=PROMPT, sample_index=i) for i in range(3)]
+        aggregate_flat(cands, strategy_name="flat")
+    finally:
+        tracing.unregister_hook(collector)
+        tracing.unregister_hook(recorder)
+
+    assert collector.counter("moa_samples_total", model="Demo") == 3
+    margin = collector.histogram("moa_vote_margin", strategy="flat")
+    assert margin is not None and margin.total == 1
+    generate = collector.histogram("moa_span_seconds", span="proposer.generate", model="Demo")
+    assert generate is not None and generate.samples == 3
+
+    text = collector.to_prometheus()
+    assert '# TYPE moa_samples_total counter' in text
+    assert 'moa_span_seconds_count{model="Demo",span="proposer.generate"} 3' in text
+
+    names = [event["name"] for event in recorder.to_json()["traceEvents"]]
+    assert names.count("proposer.generate") == 3
+    assert "aggregate" in names and "rationale" in names